@@ -0,0 +1,136 @@
+"""
+Compares the CPU inference backends on latency, memory and output agreement.
+
+Run from the repository root, optionally with text files to use as input:
+
+    python -m benchmarks.ai_backends [--backends pytorch int8 onnx] [notes.txt ...]
+
+Each backend runs in a fresh interpreter so its peak memory is measured on its own.
+Agreement is measured against the pytorch output: unigram F1 for summaries and
+Jaccard similarity for key point sets.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SAMPLE_TEXTS = [
+    "Photosynthesis is the process by which green plants and some other organisms use sunlight to "
+    "synthesize foods from carbon dioxide and water. It generally involves the green pigment chlorophyll "
+    "and generates oxygen as a by-product. The light-dependent reactions take place in the thylakoid "
+    "membranes, while the Calvin cycle runs in the stroma and fixes carbon into sugars.",
+    "The French Revolution was a period of political and societal change in France that began with the "
+    "Estates General of 1789 and ended with the coup of 18 Brumaire in November 1799. Many of its ideas "
+    "are considered fundamental principles of liberal democracy, while its values and institutions remain "
+    "central to modern French political discourse.",
+]
+
+_PROBE = r"""
+import json
+import resource
+import statistics
+import sys
+import time
+
+from services import model_backends
+from services.summarizer import SummarizerService
+from services.key_points_extractor import KeyPointsService
+
+backend, texts = sys.argv[1], json.loads(sys.stdin.read())
+model_backends.set_current(backend)
+
+start = time.perf_counter()
+SummarizerService.get_summarizer()
+KeyPointsService.get_extractor()
+load_seconds = time.perf_counter() - start
+
+summaries, key_points, latencies = [], [], []
+for text in texts:
+    start = time.perf_counter()
+    summaries.append(SummarizerService.summarize(text, "Medium"))
+    key_points.append(KeyPointsService.extract_key_points(text))
+    latencies.append(time.perf_counter() - start)
+
+print(json.dumps({
+    "load_seconds": load_seconds,
+    "mean_seconds": statistics.mean(latencies),
+    "median_seconds": statistics.median(latencies),
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "summaries": summaries,
+    "key_points": key_points,
+}))
+"""
+
+
+def run_backend(backend: str, texts: list[str]) -> dict:
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE, backend],
+        cwd=repo_root,
+        input=json.dumps(texts),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def unigram_f1(candidate: str, reference: str) -> float:
+    candidate_words, reference_words = candidate.lower().split(), reference.lower().split()
+    if not candidate_words or not reference_words:
+        return float(candidate_words == reference_words)
+    remaining = list(reference_words)
+    overlap = 0
+    for word in candidate_words:
+        if word in remaining:
+            remaining.remove(word)
+            overlap += 1
+    if overlap == 0:
+        return 0.0
+    precision, recall = overlap / len(candidate_words), overlap / len(reference_words)
+    return 2 * precision * recall / (precision + recall)
+
+
+def jaccard(candidate: str, reference: str) -> float:
+    candidate_set = {line.strip("- ").lower() for line in candidate.splitlines() if line.strip()}
+    reference_set = {line.strip("- ").lower() for line in reference.splitlines() if line.strip()}
+    if not candidate_set and not reference_set:
+        return 1.0
+    return len(candidate_set & reference_set) / len(candidate_set | reference_set)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "int8", "onnx"])
+    parser.add_argument("files", nargs="*")
+    args = parser.parse_args(argv)
+
+    texts = SAMPLE_TEXTS
+    if args.files:
+        texts = []
+        for path in args.files:
+            with open(path, "r", encoding="utf-8") as f:
+                texts.append(f.read())
+
+    results = {}
+    for backend in args.backends:
+        try:
+            results[backend] = run_backend(backend, texts)
+        except subprocess.CalledProcessError as e:
+            print(f"{backend}: failed ({e.stderr.strip().splitlines()[-1] if e.stderr.strip() else e})")
+
+    baseline = results.get("pytorch")
+    for backend, result in results.items():
+        line = (f"{backend:8s} load {result['load_seconds']:.2f}s, per document mean {result['mean_seconds']:.2f}s "
+                f"median {result['median_seconds']:.2f}s, peak RSS {result['peak_rss_mb']:.0f} MB")
+        if baseline is not None and backend != "pytorch":
+            summary_f1 = sum(unigram_f1(c, r) for c, r in zip(result["summaries"], baseline["summaries"])) / len(texts)
+            key_point_overlap = sum(jaccard(c, r) for c, r in zip(result["key_points"], baseline["key_points"])) / len(texts)
+            line += f", summary F1 vs pytorch {summary_f1:.2f}, key point Jaccard {key_point_overlap:.2f}"
+        print(line)
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Compares the copying and the pooled page rendering paths of the PDF viewer.
+
+Run from the repository root, optionally with a PDF to render:
+
+    python -m benchmarks.pdf_rendering [--zooms 1 2 4] [--pages 20] [document.pdf]
+
+The copying path is what the viewer did before: get_pixmap, then a QImage copy
+of the samples. The pooled path is PageRenderer.render, which draws into pooled
+pixmaps that the QImage reads in place. Both keep the last few pages alive, as
+the page cache would, so the pool can reuse buffers of pages that fall out.
+Without a document a generated text-only PDF is used.
+"""
+import argparse
+import collections
+import sys
+import time
+
+import fitz  # PyMuPDF
+from PyQt5.QtGui import QImage
+
+from view.pdf_render_worker import PageRenderer
+
+KEPT_PAGES = 3
+
+
+def sample_document(page_count: int = 20):
+    document = fitz.open()
+    for index in range(page_count):
+        page = document.new_page()
+        text = f"Page {index + 1}. " + "The quick brown fox jumps over the lazy dog. " * 40
+        page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50), text, fontsize=11)
+    return document
+
+
+def render_copying(document, page_index: int, zoom: float):
+    pix = document.load_page(page_index).get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+    image = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888).copy()
+    return image, 2 * pix.stride * pix.height  # The pixmap and the copy
+
+
+def measure(document, zoom: float, pages: int) -> dict:
+    kept = collections.deque(maxlen=KEPT_PAGES)
+    start = time.perf_counter()
+    copied_bytes = 0
+    for page_index in range(pages):
+        image, size = render_copying(document, page_index % document.page_count, zoom)
+        kept.append(image)
+        copied_bytes += size
+    copying_seconds = time.perf_counter() - start
+
+    kept.clear()
+    renderer = PageRenderer(document.name or "")
+    start = time.perf_counter()
+    for page_index in range(pages):
+        kept.append(renderer.render(document, (page_index % document.page_count, zoom)))
+    pooled_seconds = time.perf_counter() - start
+
+    return {
+        "copying_ms": 1000 * copying_seconds / pages,
+        "copying_mb": copied_bytes / 2**20,
+        "pooled_ms": 1000 * pooled_seconds / pages,
+        "pooled_mb": renderer.pool.allocated_bytes / 2**20,
+        "reuses": renderer.pool.reuses,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("document", nargs="?")
+    parser.add_argument("--zooms", nargs="+", type=float, default=[1.0, 2.0, 4.0])
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    document = fitz.open(args.document) if args.document else sample_document()
+    print(f"{'zoom':>6} {'copy ms/page':>13} {'copy MB':>9} {'pool ms/page':>13} {'pool MB':>9} {'reused':>7}")
+    for zoom in args.zooms:
+        result = measure(document, zoom, args.pages)
+        print(f"{zoom:>6.2f} {result['copying_ms']:>13.1f} {result['copying_mb']:>9.1f} "
+              f"{result['pooled_ms']:>13.1f} {result['pooled_mb']:>9.1f} {result['reuses']:>7}")
+    document.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
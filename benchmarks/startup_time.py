@@ -0,0 +1,69 @@
+"""
+Measures time-to-first-window for the application.
+
+Run from the repository root:
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.startup_time
+
+Each run happens in a fresh interpreter so module caches do not hide import cost.
+"""
+import json
+import os
+import subprocess
+import sys
+
+STARTUP_BUDGET_SECONDS = 2.0
+
+_PROBE = r"""
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
+from view.main_window import MainWindow
+
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+result = {}
+
+def on_first_event_loop_turn():
+    result["seconds"] = time.perf_counter() - start
+    result["heavy_modules"] = sorted(name for name in ("transformers", "torch") if name in sys.modules)
+    app.quit()
+
+QTimer.singleShot(0, on_first_event_loop_turn)
+app.exec_()
+print(json.dumps(result))
+"""
+
+
+def measure_time_to_first_window() -> dict:
+    """Start the main window in a subprocess and return its startup timing."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=repo_root,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(runs: int = 5):
+    timings = [measure_time_to_first_window() for _ in range(runs)]
+    seconds = sorted(t["seconds"] for t in timings)
+    median = seconds[len(seconds) // 2]
+    print(f"time-to-first-window: median {median:.3f}s, min {seconds[0]:.3f}s, max {seconds[-1]:.3f}s (budget {STARTUP_BUDGET_SECONDS:.1f}s)")
+    print(f"heavy modules imported before first window: {timings[0]['heavy_modules'] or 'none'}")
+    return 0 if median <= STARTUP_BUDGET_SECONDS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+import os
+
+
+def app_data_dir() -> str:
+    """Return the per-user StudyMate data directory, creating it if needed."""
+    from PyQt5.QtCore import QStandardPaths
+
+    base_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    # Fallback to home if path is empty
+    if not base_dir:
+        base_dir = os.path.join(os.path.expanduser("~"), ".studymate")
+    # Ensure app subdir exists
+    app_dir = os.path.join(base_dir, "StudyMate") if "StudyMate" not in base_dir else base_dir
+    os.makedirs(app_dir, exist_ok=True)
+    return app_dir
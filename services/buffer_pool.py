@@ -0,0 +1,54 @@
+import threading
+from collections import defaultdict
+
+
+class BufferPool:
+    """
+    Keeps released buffers for reuse by the next request of the same shape.
+
+    Buffers are grouped by a caller-chosen shape key (for rendered pages, the
+    pixel size and pixel format), so scrolling through pages or tiles of one
+    size allocates a handful of buffers instead of one per render. Idle buffers
+    are capped at max_idle_bytes; releases beyond that are dropped for the
+    garbage collector. Safe to use from several threads.
+    """
+    DEFAULT_MAX_IDLE_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_idle_bytes: int = DEFAULT_MAX_IDLE_BYTES):
+        self.max_idle_bytes = max_idle_bytes
+        self._idle = defaultdict(list)  # shape -> [buffer]
+        self._idle_bytes = 0
+        self._lock = threading.Lock()
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.reuses = 0
+
+    def acquire(self, shape, size: int, create):
+        """Return an idle buffer of this shape, or a new one from create()."""
+        with self._lock:
+            idle = self._idle.get(shape)
+            if idle:
+                self._idle_bytes -= size
+                self.reuses += 1
+                return idle.pop()
+            self.allocations += 1
+            self.allocated_bytes += size
+        return create()
+
+    def release(self, shape, buffer, size: int) -> None:
+        """Hand a buffer back once nothing reads from it anymore."""
+        with self._lock:
+            if self._idle_bytes + size > self.max_idle_bytes:
+                return
+            self._idle[shape].append(buffer)
+            self._idle_bytes += size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._idle.clear()
+            self._idle_bytes = 0
+
+    @property
+    def idle_bytes(self) -> int:
+        with self._lock:
+            return self._idle_bytes
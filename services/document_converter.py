@@ -0,0 +1,184 @@
+import hashlib
+import os
+import pathlib
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+
+class LibreOfficeProcess:
+    """
+    A headless LibreOffice instance kept running between conversions.
+
+    The instance is started on first use with a private user profile; nothing
+    talks to it over UNO. LibreOffice hands a later "--convert-to" call made
+    with the same profile to the running instance, which writes the file and
+    lets the call return, so only the first conversion pays the multi-second
+    cold start. That profile handoff is all this class relies on.
+    The executable can be any stand-in that behaves like that, which is how the
+    tests exercise this class without LibreOffice.
+    """
+    DEFAULT_EXECUTABLE = "libreoffice"
+    TIMEOUT_SECONDS = 120
+    READY_TIMEOUT_SECONDS = 30
+
+    def __init__(self, executable: str = DEFAULT_EXECUTABLE, profile_dir: str | None = None, timeout: float = TIMEOUT_SECONDS):
+        self.executable = executable
+        self.timeout = timeout
+        self._owns_profile = profile_dir is None
+        self.profile_dir = profile_dir  # A temporary profile is created on start when None
+        self._process = None
+        self._lock = threading.Lock()
+        self._convert_lock = threading.Lock()  # The instance converts one document at a time
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _profile_arg(self):
+        return f"-env:UserInstallation={pathlib.Path(self.profile_dir).resolve().as_uri()}"
+
+    def start(self) -> None:
+        """Start the instance if it is not running and wait until it holds its profile."""
+        with self._lock:
+            if self.is_running:
+                return
+            if self.profile_dir is None:
+                self.profile_dir = tempfile.mkdtemp(prefix="studymate-libreoffice-")
+            lock_path = os.path.join(self.profile_dir, ".lock")
+            self._process = subprocess.Popen(
+                [self.executable, self._profile_arg(), "--headless", "--invisible", "--nologo", "--norestore"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            # A conversion started before the profile is locked would launch a second instance.
+            deadline = time.monotonic() + self.READY_TIMEOUT_SECONDS
+            while not os.path.exists(lock_path) and self.is_running and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+    def convert(self, source_path: str, output_dir: str, target: str = "pdf") -> str | None:
+        """Convert source_path into output_dir; returns the converted file, or None if none was written."""
+        self.start()
+        with self._convert_lock:
+            subprocess.run(
+                [self.executable, self._profile_arg(), "--headless", "--convert-to", target, "--outdir", output_dir, source_path],
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+        base_name = os.path.splitext(os.path.basename(source_path))[0]
+        output_path = os.path.join(output_dir, f"{base_name}.{target}")
+        return output_path if os.path.exists(output_path) else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self.is_running:
+                self._process.terminate()
+                try:
+                    self._process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+            self._process = None
+            if self._owns_profile and self.profile_dir is not None:
+                shutil.rmtree(self.profile_dir, ignore_errors=True)
+                self.profile_dir = None
+
+
+class DocumentConverter:
+    """
+    Converts documents to PDF through a warm LibreOfficeProcess and caches the results on disk.
+
+    Each result lives in "<key>/<name>.pdf" under cache_dir, where the key is a
+    hash of the source file's content and modification time. Reopening an
+    unchanged document returns the cached PDF without running LibreOffice, and
+    an edited one is converted again. The cache is capped in bytes and drops
+    the least recently used conversions first. Cache hits never wait for a
+    conversion of another document; concurrent requests for the same one
+    share a single conversion. Conversions block, so call convert_to_pdf off
+    the GUI thread.
+    """
+    DEFAULT_MAX_DISK_BYTES = 500 * 1024 * 1024
+    HASH_CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, cache_dir: str, process: LibreOfficeProcess | None = None, max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.process = process or LibreOfficeProcess()
+        self.max_disk_bytes = max_disk_bytes
+        self._condition = threading.Condition()
+        self._converting = set()  # Keys being converted
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def source_key(cls, file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(cls.HASH_CHUNK_BYTES), b""):
+                digest.update(block)
+        digest.update(f"\0{os.stat(file_path).st_mtime_ns}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def cached_pdf(self, key: str) -> str | None:
+        directory = os.path.join(self.cache_dir, key)
+        try:
+            names = [name for name in os.listdir(directory) if name.endswith(".pdf")]
+        except OSError:
+            return None
+        if not names:
+            return None
+        os.utime(directory)  # Eviction follows recency of use
+        return os.path.join(directory, names[0])
+
+    def convert_to_pdf(self, source_path: str) -> str | None:
+        """Path of a PDF rendition of source_path, from the cache when possible; None if conversion failed."""
+        key = self.source_key(source_path)
+        with self._condition:
+            while key in self._converting:
+                self._condition.wait()
+            cached = self.cached_pdf(key)
+            if cached is not None:
+                return cached
+            self._converting.add(key)
+
+        try:
+            directory = os.path.join(self.cache_dir, key)
+            temp_dir = tempfile.mkdtemp(prefix=f"{key}.", dir=self.cache_dir)
+            try:
+                if self.process.convert(source_path, temp_dir) is None:
+                    return None
+                shutil.rmtree(directory, ignore_errors=True)  # A leftover without a PDF
+                os.replace(temp_dir, directory)
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        finally:
+            with self._condition:
+                self._converting.discard(key)
+                self._condition.notify_all()
+        with self._condition:
+            self._evict(keep=self._converting | {key})
+            return self.cached_pdf(key)
+
+    def close(self) -> None:
+        """Stop the warm LibreOffice instance; cached conversions stay on disk."""
+        self.process.close()
+
+    def _evict(self, keep: set):
+        # keep holds the keys in use; their temporary "<key>.*" directories are kept too.
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            directory = os.path.join(self.cache_dir, name)
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+                entries.append((os.stat(directory).st_mtime, name, size))
+            except OSError:
+                continue
+        total_size = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total_size <= self.max_disk_bytes:
+                break
+            if name in keep or name.split(".")[0] in keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            total_size -= size
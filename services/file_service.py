@@ -1,10 +1,56 @@
+import importlib.util
+import itertools
+import multiprocessing
 import os
 import subprocess
 import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+PDF_ENGINE_PYPDF = "pypdf"
+PDF_ENGINE_PYMUPDF = "pymupdf"
+
+
+def _pdf_page_count(file_path: str, engine: str) -> int:
+    if engine == PDF_ENGINE_PYMUPDF:
+        import fitz
+        with fitz.open(file_path) as document:
+            return document.page_count
+    import pypdf
+    return len(pypdf.PdfReader(file_path).pages)
+
+
+def _extract_pdf_pages(file_path: str, engine: str, start: int, stop: int) -> list[str]:
+    """Text of pages [start, stop); runs in worker processes, so it opens the file itself."""
+    if engine == PDF_ENGINE_PYMUPDF:
+        import fitz
+        with fitz.open(file_path) as document:
+            return [document.load_page(index).get_text() for index in range(start, stop)]
+    import pypdf
+    reader = pypdf.PdfReader(file_path)
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+class ReadCancelled(Exception):
+    """Raised from a read progress callback to stop reading the file."""
 
 
 class FileService:
-    """Encapsulates file I/O and conversion logic for the app."""
+    """Encapsulates file I/O and conversion logic for the app.
+
+    Readers accept an optional progress_callback(done, total), called as the
+    file is read (bytes, pages or paragraphs); raising ReadCancelled from it
+    stops the read.
+    """
+    TEXT_CHUNK_CHARS = 1024 * 1024
+    PROGRESS_EVERY_PARAGRAPHS = 256
+    PDF_PAGES_PER_TASK = 16
+    PDF_PARALLEL_MIN_PAGES = 48  # Below this, starting worker processes costs more than it saves
+    LARGE_TEXT_FILE_BYTES = 16 * 1024 * 1024  # Plain text above this opens in the memory-mapped large-file editor
+
+    def __init__(self, document_converter=None):
+        # A DocumentConverter keeps LibreOffice warm and caches conversions; without one, each converts from scratch.
+        self.document_converter = document_converter
 
     def _reader_registry(self) -> dict[str, callable]:
         return {
@@ -17,43 +63,119 @@ class FileService:
             '.pdf': self.read_pdf,
         }
 
-    def read_file(self, file_path: str) -> str:
+    def read_file(self, file_path: str, progress_callback=None) -> str:
         extension = os.path.splitext(file_path)[1].lower()
         reader = self._reader_registry().get(extension, self.read_text_file)
-        return reader(file_path)
+        return reader(file_path, progress_callback=progress_callback)
 
-    def read_text_file(self, file_path: str) -> str:
+    def read_text_file(self, file_path: str, progress_callback=None) -> str:
         with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+            if progress_callback is None:
+                return f.read()
+            total = os.fstat(f.fileno()).st_size
+            parts = []
+            for block in iter(lambda: f.read(self.TEXT_CHUNK_CHARS), ""):
+                parts.append(block)
+                progress_callback(min(f.buffer.tell(), total), total)
+            return "".join(parts)
 
-    def read_docx(self, file_path: str) -> str:
+    def read_docx(self, file_path: str, progress_callback=None) -> str:
         import docx
         doc = docx.Document(file_path)
-        return "\n".join(para.text for para in doc.paragraphs)
+        return self._join_paragraphs([para.text for para in doc.paragraphs], progress_callback)
 
-    def read_odt(self, file_path: str) -> str:
+    def read_odt(self, file_path: str, progress_callback=None) -> str:
         from odf import text, teletype
         from odf.opendocument import load as load_odt
 
         document = load_odt(file_path)
         all_paras = document.getElementsByType(text.P)
-        return "\n".join(teletype.extractText(p) for p in all_paras)
+        return self._join_paragraphs(all_paras, progress_callback, teletype.extractText)
 
-    def read_pdf(self, file_path: str) -> str:
-        import pypdf
+    def _join_paragraphs(self, paragraphs, progress_callback, extract=str) -> str:
+        total = len(paragraphs)
+        lines = []
+        for index, paragraph in enumerate(paragraphs):
+            if progress_callback is not None and index % self.PROGRESS_EVERY_PARAGRAPHS == 0:
+                progress_callback(index, total)
+            lines.append(extract(paragraph))
+        if progress_callback is not None:
+            progress_callback(total, total)
+        return "\n".join(lines)
 
-        content = []
-        with open(file_path, 'rb') as f:
-            reader = pypdf.PdfReader(f)
-            for page in reader.pages:
-                content.append(page.extract_text() or "")
-        return "\n".join(content)
+    def read_pdf(self, file_path: str, engine: str | None = None, workers: int | None = None, progress_callback=None) -> str:
+        if progress_callback is None:
+            return "\n".join(self.iter_pdf_pages(file_path, engine, workers))
+
+        engine = engine or self.default_pdf_engine()
+        total = _pdf_page_count(file_path, engine)
+        pages = []
+        page_iterator = self.iter_pdf_pages(file_path, engine, workers)
+        try:
+            for text in page_iterator:
+                pages.append(text)
+                progress_callback(len(pages), total)
+        finally:
+            page_iterator.close()
+        return "\n".join(pages)
+
+    @staticmethod
+    def default_pdf_engine() -> str:
+        """PyMuPDF when it is installed, as it extracts text much faster than pypdf."""
+        return PDF_ENGINE_PYMUPDF if importlib.util.find_spec("fitz") else PDF_ENGINE_PYPDF
+
+    @staticmethod
+    def pdf_page_ranges(page_count: int, pages_per_task: int) -> list[tuple[int, int]]:
+        return [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+
+    def iter_pdf_pages(self, file_path: str, engine: str | None = None, workers: int | None = None):
+        """
+        Yield the text of each page of a PDF, in order.
+
+        Large documents are split into page ranges extracted by a pool of worker
+        processes (workers defaults to the CPU count; 1 extracts in this
+        process). Only a few ranges run ahead of the consumer, so the text of a
+        long document is never held all at once. Closing the generator stops
+        the worker processes.
+        """
+        engine = engine or self.default_pdf_engine()
+        page_count = _pdf_page_count(file_path, engine)
+        ranges = self.pdf_page_ranges(page_count, self.PDF_PAGES_PER_TASK)
+        workers = min(workers or os.cpu_count() or 1, len(ranges))
+        if workers <= 1 or page_count < self.PDF_PARALLEL_MIN_PAGES:
+            for start, stop in ranges:
+                yield from _extract_pdf_pages(file_path, engine, start, stop)
+            return
+
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        remaining = iter(ranges)
+        try:
+            pending = deque(executor.submit(_extract_pdf_pages, file_path, engine, start, stop)
+                            for start, stop in itertools.islice(remaining, 2 * workers))
+            while pending:
+                pages = pending.popleft().result()
+                next_range = next(remaining, None)
+                if next_range is not None:
+                    pending.append(executor.submit(_extract_pdf_pages, file_path, engine, *next_range))
+                yield from pages
+        finally:
+            # Closed early, ranges may still be extracting; stop the processes rather than wait for them.
+            processes = list((getattr(executor, "_processes", None) or {}).values())
+            executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
 
     def save_text_file(self, file_path: str, content: str) -> None:
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(content)
 
     def convert_odt_to_pdf(self, odt_path: str) -> str | None:
+        if self.document_converter is not None:
+            return self.document_converter.convert_to_pdf(odt_path)
+
         temp_dir = tempfile.mkdtemp()
         subprocess.run(
             ['libreoffice', '--headless', '--convert-to', 'pdf', '--outdir', temp_dir, odt_path],
@@ -70,3 +192,10 @@ class FileService:
 
     def is_text_extension(self, file_path: str) -> bool:
         return os.path.splitext(file_path)[1].lower() in self.supported_text_extensions()
+
+    def is_large_text_file(self, file_path: str) -> bool:
+        """Whether file_path is plain text too big to load into a regular editor."""
+        extension = os.path.splitext(file_path)[1].lower()
+        if self._reader_registry().get(extension, self.read_text_file) != self.read_text_file:
+            return False  # Converted formats are read whole
+        return os.path.getsize(file_path) >= self.LARGE_TEXT_FILE_BYTES
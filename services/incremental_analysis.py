@@ -0,0 +1,174 @@
+import json
+import re
+
+from services import model_backends
+from services.key_points_extractor import KeyPointsService
+from services.summarizer import SummarizerService
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+_ENDS_WITH_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*\Z")
+
+
+class DocumentChunk:
+    """A run of whole paragraphs plus the analysis results computed for exactly this text."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.results = {}  # analysis key -> result
+
+
+class IncrementalDocument:
+    """
+    Keeps a document split into paragraph chunks and updates only the chunks an edit touches.
+
+    Chunks are consecutive paragraphs of up to MAX_CHUNK_CHARS characters and
+    their concatenation is always the full text, so chunk offsets follow from
+    their lengths. apply_change takes the arguments of
+    QTextDocument.contentsChange and re-splits only the affected range; the
+    other chunks keep their DocumentChunk objects and with them their results.
+    """
+    MAX_CHUNK_CHARS = 3000
+
+    def __init__(self, text: str = ""):
+        self.chunks = self.split(text)
+        self.revision = 0
+
+    @property
+    def length(self) -> int:
+        return sum(len(chunk.text) for chunk in self.chunks)
+
+    def text(self) -> str:
+        return "".join(chunk.text for chunk in self.chunks)
+
+    def reset(self, text: str) -> None:
+        """Re-split the whole text, keeping the results of chunks whose text is unchanged."""
+        previous = {chunk.text: chunk for chunk in self.chunks}
+        self.chunks = [previous.get(chunk.text, chunk) for chunk in self.split(text)]
+        self.revision += 1
+
+    def apply_change(self, position: int, chars_removed: int, chars_added: int, new_length: int, read_range) -> None:
+        """
+        Update the chunks after chars_removed characters at position were replaced by chars_added new ones.
+
+        read_range(start, end) must return the new document text in [start, end).
+        """
+        old_length = self.length
+        # QTextDocument counts its final paragraph separator in some reports; derive
+        # the sizes from the lengths instead of trusting them blindly.
+        chars_removed = min(chars_removed, old_length - position)
+        chars_added = new_length - old_length + chars_removed
+        if position < 0 or chars_removed < 0 or chars_added < 0 or not self.chunks:
+            self.reset(read_range(0, new_length))
+            return
+
+        # Find the chunks overlapping the edited range.
+        first, first_start, offset = None, 0, 0
+        last, last_end = len(self.chunks) - 1, old_length
+        for index, chunk in enumerate(self.chunks):
+            end = offset + len(chunk.text)
+            if first is None and (end > position or index == len(self.chunks) - 1):
+                first, first_start = index, offset
+            if first is not None and end >= position + chars_removed:
+                last, last_end = index, end
+                break
+            offset = end
+
+        # Extend until the re-read range ends on a paragraph break (or the document
+        # end), so an edit that joins two paragraphs never leaves half of one behind.
+        region_end = last_end - chars_removed + chars_added
+        region = read_range(first_start, region_end)
+        while last + 1 < len(self.chunks) and not self._ends_paragraph(region):
+            last += 1
+            region += self.chunks[last].text
+
+        self.chunks[first:last + 1] = self.split(region)
+        self.revision += 1
+
+    @classmethod
+    def split(cls, text: str) -> list[DocumentChunk]:
+        """Split text into chunks of whole paragraphs, keeping every character."""
+        paragraphs, start = [], 0
+        for match in _PARAGRAPH_BREAK.finditer(text):
+            paragraphs.append(text[start:match.end()])
+            start = match.end()
+        if start < len(text):
+            paragraphs.append(text[start:])
+
+        chunks, current = [], ""
+        for paragraph in paragraphs:
+            if current and len(current) + len(paragraph) > cls.MAX_CHUNK_CHARS:
+                chunks.append(DocumentChunk(current))
+                current = ""
+            current += paragraph
+        if current:
+            chunks.append(DocumentChunk(current))
+        return chunks
+
+    @staticmethod
+    def _ends_paragraph(text: str) -> bool:
+        return _ENDS_WITH_PARAGRAPH_BREAK.search(text[-256:]) is not None
+
+
+class IncrementalAnalyzer:
+    """
+    Key points and summaries of an IncrementalDocument that only send changed chunks to the model.
+
+    engine is anything with the SummarizerService/KeyPointsService methods used
+    here (an InferenceBackend or None for the in-process services). Results are
+    stored on the chunks, so call these with a snapshot of document.chunks taken
+    on the GUI thread. Chunk key phrases are also kept in the shared ResultCache,
+    so an unchanged note is not tagged again after it is reopened.
+    """
+
+    @staticmethod
+    def key_phrases_key():
+        return ("key_phrases", model_backends.cache_model_id(KeyPointsService.MODEL_NAME))
+
+    @staticmethod
+    def chunk_summary_key():
+        return ("summary", model_backends.cache_model_id(SummarizerService.MODEL_NAME))
+
+    @classmethod
+    def key_points(cls, chunks: list[DocumentChunk], engine=None) -> str:
+        key = cls.key_phrases_key()
+        cache = KeyPointsService.result_cache
+        dirty = []
+        for chunk in chunks:
+            if key in chunk.results:
+                continue
+            cached = cache.get(KeyPointsService.phrases_cache_key(chunk.text)) if cache is not None else None
+            if cached is None:
+                dirty.append(chunk)
+            else:
+                chunk.results[key] = json.loads(cached)
+        if dirty:
+            phrases = (engine or KeyPointsService).extract_phrases_many([chunk.text for chunk in dirty])
+            for chunk, chunk_phrases in zip(dirty, phrases):
+                chunk.results[key] = chunk_phrases
+                if cache is not None:
+                    cache.put(KeyPointsService.phrases_cache_key(chunk.text), json.dumps(chunk_phrases))
+        return KeyPointsService.format_key_points(KeyPointsService.merge_phrases([chunk.results[key] for chunk in chunks]))
+
+    @classmethod
+    def summary_input(cls, chunks: list[DocumentChunk], engine=None, batch_size: int | None = None) -> str:
+        """
+        Return the text the final summary pass should read.
+
+        Text that fits into one model input is summarized directly. Only
+        longer text is reduced: each chunk gets a short summary (only the
+        changed chunks are summarized again) and the joined chunk summaries
+        are returned for the final pass.
+        """
+        engine = engine or SummarizerService
+        content = [chunk for chunk in chunks if chunk.text.strip()]
+        text = "".join(chunk.text for chunk in content)
+        if len(content) <= 1 or engine.fits_single_pass(text):
+            return text
+
+        key = cls.chunk_summary_key()
+        dirty = [chunk for chunk in content if key not in chunk.results]
+        if dirty:
+            summaries = engine.summarize_many([chunk.text for chunk in dirty], "Short", batch_size)
+            for chunk, summary in zip(dirty, summaries):
+                chunk.results[key] = summary
+        return "\n\n".join(chunk.results[key] for chunk in content if chunk.results[key])
@@ -0,0 +1,252 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from services import model_backends
+from services.model_registry import registry
+from services.result_cache import ResultCache
+
+
+def handle_request(request: dict) -> dict:
+    """
+    Entry point executed inside a pool process.
+
+    A request is a dict with a "task" name plus task arguments; the response is
+    {"ok": True, "result": ...} or {"ok": False, "error": "..."}. Models are
+    loaded by the service singletons of the child process and stay warm there
+    between requests; an optional "model_backend" reloads them with that backend
+    and an optional "model_registry" dict sets the process's memory budget and
+    idle timeout.
+    """
+    from services.summarizer import SummarizerService
+    from services.key_points_extractor import KeyPointsService
+
+    task = request.get("task")
+    try:
+        if request.get("model_backend"):
+            model_backends.set_current(request["model_backend"])
+        if request.get("model_registry"):
+            registry.configure(**request["model_registry"])
+        if task == "summarize":
+            result = SummarizerService.summarize(request["text"], request.get("length_option", "Medium"))
+        elif task == "summarize_many":
+            result = SummarizerService.summarize_many(request["texts"], request.get("length_option", "Medium"), request.get("batch_size"))
+        elif task == "stream_summary":
+            # Pieces go back through a managed queue; None marks the end of the stream.
+            pieces, stop_event = request["queue"], request["stop_event"]
+            try:
+                result = SummarizerService.stream_summary(request["text"], request.get("length_option", "Medium"), on_text=pieces.put, should_stop=stop_event.is_set)
+            finally:
+                pieces.put(None)
+        elif task == "fits_single_pass":
+            result = SummarizerService.fits_single_pass(request["text"])
+        elif task == "key_points":
+            result = KeyPointsService.extract_key_points(request["text"])
+        elif task == "key_phrases_many":
+            result = KeyPointsService.extract_phrases_many(request["texts"])
+        elif task == "preload":
+            SummarizerService.get_summarizer()
+            KeyPointsService.get_extractor()
+            result = ""
+        elif task == "ping":
+            result = "pong"
+        else:
+            return {"ok": False, "error": f"Unknown task: {task}"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "result": result}
+
+
+class InferenceBackend:
+    """
+    Runs AI requests in a pool of local worker processes.
+
+    Inference then runs outside the GUI process: it doesn't contend for its GIL,
+    each worker holds its own copy of the models, and a crashed or stuck model
+    can be restarted without touching the editor. Results are looked up in and
+    stored to the GUI-side ResultCache, so cache hits never leave this process.
+    A request that gets no answer within its timeout restarts the pool, so a
+    hung worker never blocks later requests. Unless a request is given its own
+    timeout, it gets DEFAULT_TIMEOUT_SECONDS per WORK_UNIT_CHARS of text it
+    carries (see request_timeout); streams get one unit between two pieces.
+    """
+    DEFAULT_MAX_WORKERS = 2
+    # Per unit of work. Generous: the first request may have to download and load a model.
+    DEFAULT_TIMEOUT_SECONDS = 600
+    # About one model window of text; a long document is summarized window by window.
+    WORK_UNIT_CHARS = 4000
+
+    def __init__(self, max_workers: int | None = None, result_cache: ResultCache | None = None, timeout: float | None = None):
+        self.max_workers = max_workers or min(self.DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        self.result_cache = result_cache
+        self.timeout = timeout or self.DEFAULT_TIMEOUT_SECONDS
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+
+    def summarize(self, text: str, length_option: str = "Medium", timeout: float | None = None) -> str:
+        from services.summarizer import SummarizerService
+
+        request = {"task": "summarize", "text": text, "length_option": length_option}
+        return self._cached_submit(SummarizerService.cache_key(text, length_option), request, timeout)
+
+    def summarize_many(self, texts: list[str], length_option: str = "Medium", batch_size: int | None = None, timeout: float | None = None) -> list[str]:
+        """Summarize several documents in one request; cached summaries are not sent to the pool."""
+        from services.summarizer import SummarizerService
+
+        keys = [SummarizerService.cache_key(text, length_option) for text in texts]
+        summaries = [self.result_cache.get(key) if self.result_cache is not None else None for key in keys]
+        missing = [index for index, summary in enumerate(summaries) if summary is None]
+        if missing:
+            request = {"task": "summarize_many", "texts": [texts[i] for i in missing], "length_option": length_option, "batch_size": batch_size}
+            for index, summary in zip(missing, self.submit(request, timeout)):
+                summaries[index] = summary
+                if self.result_cache is not None and summary:
+                    self.result_cache.put(keys[index], summary)
+        return summaries
+
+    def stream_summary(self, text: str, length_option: str = "Medium", on_text=None, should_stop=None, timeout: float | None = None) -> str:
+        """Summarize text in a worker process, passing generated pieces to on_text as they arrive."""
+        from services.summarizer import SummarizerService
+
+        cache_key = SummarizerService.cache_key(text, length_option, SummarizerService.STREAM_DECODING)
+        cached = self.result_cache.get(cache_key) if self.result_cache is not None else None
+        if cached is not None:
+            if on_text is not None:
+                on_text(cached)
+            return cached
+
+        manager = self._get_manager()
+        pieces, stop_event = manager.Queue(), manager.Event()
+        executor = self._get_executor()
+        request = {"task": "stream_summary", "text": text, "length_option": length_option, "queue": pieces, "stop_event": stop_event}
+        future = executor.submit(handle_request, self._with_model_settings(request))
+        # Long text is reduced window by window before the first piece is generated.
+        deadline = time.monotonic() + (timeout or self.request_timeout(request))
+        timeout = timeout or self.timeout
+        while True:
+            if should_stop is not None and should_stop():
+                stop_event.set()
+            try:
+                piece = pieces.get(timeout=0.1)
+            except queue.Empty:
+                if future.done():
+                    break
+                if time.monotonic() > deadline:
+                    stop_event.set()
+                    self._restart_executor(executor)
+                    raise TimeoutError("The AI engine did not respond in time and was restarted.")
+                continue
+            if piece is None:
+                break
+            deadline = time.monotonic() + timeout
+            if on_text is not None:
+                on_text(piece)
+
+        summary = self._wait(executor, future, timeout)
+        if self.result_cache is not None and summary and not stop_event.is_set():
+            self.result_cache.put(cache_key, summary)
+        return summary
+
+    def fits_single_pass(self, text: str, timeout: float | None = None) -> bool:
+        return self.submit({"task": "fits_single_pass", "text": text}, timeout)
+
+    def extract_key_points(self, text: str, timeout: float | None = None) -> str:
+        from services.key_points_extractor import KeyPointsService
+
+        request = {"task": "key_points", "text": text}
+        return self._cached_submit(KeyPointsService.cache_key(text), request, timeout)
+
+    def extract_phrases_many(self, texts: list[str], timeout: float | None = None) -> list[dict]:
+        """Merged keyphrases of each text, see KeyPointsService.extract_phrases_many."""
+        return self.submit({"task": "key_phrases_many", "texts": texts}, timeout)
+
+    def preload(self) -> None:
+        """Ask every worker process to load its models."""
+        executor = self._get_executor()
+        for _ in range(self.max_workers):
+            executor.submit(handle_request, self._with_model_settings({"task": "preload"}))
+
+    def submit(self, request: dict, timeout: float | None = None):
+        """Send one request to the pool and block until its result arrives (or timeout, see request_timeout)."""
+        executor = self._get_executor()
+        return self._wait(executor, executor.submit(handle_request, self._with_model_settings(request)), timeout or self.request_timeout(request))
+
+    def request_timeout(self, request: dict) -> float:
+        """Seconds request may take: self.timeout for every started WORK_UNIT_CHARS of each of its texts."""
+        texts = request.get("texts") or [request.get("text") or ""]
+        units = sum(max(1, -(-len(text) // self.WORK_UNIT_CHARS)) for text in texts)
+        return self.timeout * units
+
+    def _wait(self, executor, future, timeout):
+        try:
+            response = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._restart_executor(executor)
+            raise TimeoutError("The AI engine did not respond in time and was restarted.")
+        except BrokenProcessPool:
+            self._restart_executor(executor)
+            raise RuntimeError("The AI engine stopped unexpectedly and was restarted.")
+        except CancelledError:
+            raise RuntimeError("The AI engine was restarted before this request finished.")
+
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "Unknown error"))
+        return response.get("result")
+
+    def restart(self) -> None:
+        """Kill the worker processes; a fresh pool is started on the next request."""
+        self._restart_executor(self._executor)
+
+    def shutdown(self) -> None:
+        self.restart()
+        with self._lock:
+            manager, self._manager = self._manager, None
+        if manager is not None:
+            manager.shutdown()
+
+    def _restart_executor(self, executor):
+        # Only restart the pool the failed request ran on; another thread may
+        # already have replaced it.
+        with self._lock:
+            if executor is None or self._executor is not executor:
+                return
+            self._executor = None
+        self._terminate(executor)
+
+    @staticmethod
+    def _with_model_settings(request):
+        # Worker processes don't share the GUI's module state, so each request carries the model settings.
+        return {**request, "model_backend": model_backends.current(), "model_registry": registry.settings()}
+
+    def _cached_submit(self, cache_key, request, timeout):
+        if self.result_cache is None:
+            return self.submit(request, timeout)
+        return self.result_cache.get_or_compute(cache_key, lambda: self.submit(request, timeout))
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Spawn rather than fork: the GUI process has Qt threads running.
+                context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    def _get_manager(self):
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager
+
+    @staticmethod
+    def _terminate(executor):
+        # ProcessPoolExecutor can't interrupt a running task, so stop the processes directly.
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
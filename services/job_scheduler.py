@@ -0,0 +1,180 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class JobPriority:
+    """Lower values run first."""
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+
+class Job:
+    """A unit of AI work tracked by the JobScheduler."""
+
+    def __init__(self, kind: str, document_id, request_key, func, priority: int):
+        self.kind = kind
+        self.document_id = document_id
+        self.request_key = request_key
+        self.func = func
+        self.priority = priority
+        self.state = "queued"
+        self.submitted_at = time.monotonic()
+        self._callbacks = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self.state == "cancelled"
+
+    def add_callbacks(self, on_finished=None, on_error=None, on_cancelled=None):
+        self._callbacks.append((on_finished, on_error, on_cancelled))
+
+
+class JobScheduler:
+    """
+    Prioritized queue for AI jobs, run on a small set of background threads.
+
+    Jobs are grouped by (kind, document_id). Submitting a request identical to a
+    queued or running job of the same group joins that job instead of starting
+    another; submitting a different request cancels the older one. Cancelled
+    jobs that are already running finish in the background, but their results
+    are dropped. Callbacks run on the scheduler's threads, so UI code should
+    route them through Qt signals.
+    """
+
+    def __init__(self, max_workers: int = 2, on_stats_changed=None):
+        self.max_workers = max_workers
+        self.on_stats_changed = on_stats_changed
+        self._condition = threading.Condition()
+        self._heap = []
+        self._sequence = itertools.count()
+        self._jobs = {}  # (kind, document_id) -> [Job]
+        self._queued = 0
+        self._running = 0
+        self._latencies = deque(maxlen=20)
+        self._threads = []
+        self._is_shut_down = False
+
+    def submit(self, kind: str, document_id, request_key, func, priority: int = JobPriority.INTERACTIVE, on_finished=None, on_error=None, on_cancelled=None) -> Job:
+        """Queue func() and return its Job, or the existing Job it was coalesced with."""
+        superseded = []
+        with self._condition:
+            group = self._jobs.setdefault((kind, document_id), [])
+            for job in list(group):
+                if job.request_key == request_key:
+                    job.add_callbacks(on_finished, on_error, on_cancelled)
+                    return job
+                superseded.append(job)
+                self._mark_cancelled(job)
+
+            job = Job(kind, document_id, request_key, func, priority)
+            job.add_callbacks(on_finished, on_error, on_cancelled)
+            group.append(job)
+            heapq.heappush(self._heap, (priority, next(self._sequence), job))
+            self._queued += 1
+            self._ensure_threads()
+            self._condition.notify()
+
+        self._fire_cancelled(superseded)
+        self._notify_stats()
+        return job
+
+    def cancel(self, matching=None) -> int:
+        """Cancel every queued or running job for which matching(job) is true (all jobs by default)."""
+        with self._condition:
+            jobs = [job for group in self._jobs.values() for job in group if matching is None or matching(job)]
+            for job in jobs:
+                self._mark_cancelled(job)
+
+        self._fire_cancelled(jobs)
+        if jobs:
+            self._notify_stats()
+        return len(jobs)
+
+    def stats(self) -> dict:
+        """Return queue depth, running count and the average latency of recent jobs in seconds."""
+        with self._condition:
+            average = sum(self._latencies) / len(self._latencies) if self._latencies else None
+            return {"queued": self._queued, "running": self._running, "average_latency": average}
+
+    def shutdown(self) -> None:
+        """Cancel all jobs and stop the worker threads once their current job returns."""
+        self.cancel()
+        with self._condition:
+            self._is_shut_down = True
+            self._condition.notify_all()
+
+    # ---------------- Internals ----------------
+    def _ensure_threads(self):
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._work, name="ai-job-scheduler", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _mark_cancelled(self, job):
+        # Caller holds the lock.
+        if job.state == "queued":
+            self._queued -= 1
+        elif job.state != "running":
+            return
+        job.state = "cancelled"
+        self._forget(job)
+
+    def _forget(self, job):
+        group = self._jobs.get((job.kind, job.document_id))
+        if group and job in group:
+            group.remove(job)
+            if not group:
+                del self._jobs[(job.kind, job.document_id)]
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._heap and not self._is_shut_down:
+                    self._condition.wait()
+                if self._is_shut_down:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                if job.state != "queued":
+                    continue
+                job.state = "running"
+                self._queued -= 1
+                self._running += 1
+            self._notify_stats()
+
+            result, error = None, None
+            try:
+                result = job.func()
+            except Exception as e:
+                error = e
+
+            with self._condition:
+                self._running -= 1
+                was_cancelled = job.cancelled
+                if not was_cancelled:
+                    job.state = "failed" if error is not None else "done"
+                    self._forget(job)
+                    self._latencies.append(time.monotonic() - job.submitted_at)
+                callbacks = list(job._callbacks)
+
+            if not was_cancelled:
+                for on_finished, on_error, _ in callbacks:
+                    if error is None and on_finished is not None:
+                        on_finished(result)
+                    elif error is not None and on_error is not None:
+                        on_error(str(error))
+            self._notify_stats()
+
+    @staticmethod
+    def _fire_cancelled(jobs):
+        for job in jobs:
+            for _, _, on_cancelled in job._callbacks:
+                if on_cancelled is not None:
+                    on_cancelled()
+
+    def _notify_stats(self):
+        if self.on_stats_changed is not None:
+            self.on_stats_changed(self.stats())
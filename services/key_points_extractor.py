@@ -1,26 +1,42 @@
+import re
+
+from services import model_backends
+from services.model_registry import registry
+from services.lazy_imports import pipeline
+from services.result_cache import ResultCache
+from services.summarizer import SummarizerService
 
-try:
-    from transformers import pipeline
-except ImportError:
-    pipeline = None
 
 class KeyPointsService:
     """
     A service to handle key points extraction using a pre-trained model.
     Loads the model lazily on the first request.
+
+    Text longer than the model's window is split into overlapping chunks that
+    are tagged in batches. Consecutive B-KEY/I-KEY tokens are joined into
+    phrases, repeated phrases are merged, and the TOP_K best are returned.
     """
-    _extractor = None
+    result_cache = None  # Optional ResultCache shared with the UI layer
+
+    MODEL_NAME = "ml6team/keyphrase-extraction-kbir-inspec"
+    CHUNK_OVERLAP_TOKENS = 32
+    BATCH_SIZE = 8
+    TOP_K = 15
+    SCORE_MODE = "max"  # How repeated phrases are ranked: "max" or "mean" of their scores
 
     @classmethod
     def get_extractor(cls):
         """Lazily loads and returns the token classification pipeline for keyword extraction."""
-        if cls._extractor is None:
-            if pipeline is None:
-                from transformers import pipeline as _pipeline
-            else:
-                _pipeline = pipeline
-            cls._extractor = _pipeline("token-classification", model="ml6team/keyphrase-extraction-kbir-inspec")
-        return cls._extractor
+        return registry.get("token-classification", cls.MODEL_NAME, pipeline)
+
+    @classmethod
+    def cache_key(cls, text: str) -> str:
+        return ResultCache.make_key(text, model_backends.cache_model_id(cls.MODEL_NAME), f"key_points:top{cls.TOP_K}:{cls.SCORE_MODE}")
+
+    @classmethod
+    def phrases_cache_key(cls, text: str) -> str:
+        """Key of the merged phrases of text (see extract_phrases), cached as JSON."""
+        return ResultCache.make_key(text, model_backends.cache_model_id(cls.MODEL_NAME), "key_phrases")
 
     @classmethod
     def extract_key_points(cls, text: str) -> str:
@@ -28,7 +44,147 @@ class KeyPointsService:
         if not text.strip():
             raise ValueError("Text is empty.")
 
-        extractor = cls.get_extractor()
-        key_points = extractor(text)
-        processed_points = [f"- {point['word']} (Score: {point['score']:.2f})" for point in key_points if point.get('entity') == 'B-KEY']
+        if cls.result_cache is None:
+            return cls._extract_uncached(text)
+        return cls.result_cache.get_or_compute(cls.cache_key(text), lambda: cls._extract_uncached(text))
+
+    @classmethod
+    def _extract_uncached(cls, text: str) -> str:
+        return cls.format_key_points(cls.extract_phrases(text))
+
+    @classmethod
+    def format_key_points(cls, phrases: dict) -> str:
+        """Format the TOP_K merged phrases as the bullet list shown in the AI panel."""
+        ranked = cls.rank_phrases(phrases)[:cls.TOP_K]
+        processed_points = [f"- {phrase['text']} (Score: {phrase[cls.SCORE_MODE]:.2f})" for phrase in ranked]
         return "\n".join(processed_points) if processed_points else "No key points found."
+
+    @classmethod
+    def extract_phrases(cls, text: str) -> dict:
+        """Tag text chunk by chunk and return merged phrases keyed by their normalized form."""
+        return cls.extract_phrases_many([text])[0]
+
+    @classmethod
+    def extract_phrases_many(cls, texts: list[str]) -> list[dict]:
+        """Like extract_phrases for several texts, tagging all of their chunks in one batched call."""
+        extractor = cls.get_extractor()
+        tokenizer = extractor.tokenizer
+        max_tokens = SummarizerService.get_token_budget(tokenizer)
+        chunks, owners = [], []
+        for index, text in enumerate(texts):
+            if not text.strip():
+                continue
+            for chunk in SummarizerService.chunk_text(text, tokenizer, max_tokens, cls.CHUNK_OVERLAP_TOKENS):
+                chunks.append(chunk)
+                owners.append(index)
+        if not chunks:
+            return [{} for _ in texts]
+
+        results = extractor(chunks, batch_size=cls.BATCH_SIZE)
+        if results and isinstance(results[0], dict):
+            # A single input may come back as a flat token list.
+            results = [results]
+
+        spans = [[] for _ in texts]
+        for owner, chunk, tokens in zip(owners, chunks, results):
+            spans[owner].extend(cls.aggregate_spans(chunk, tokens))
+        return [cls.merge_phrases([cls._phrases_from_spans(text_spans)]) for text_spans in spans]
+
+    @classmethod
+    def merge_phrases(cls, phrase_dicts: list[dict]) -> dict:
+        """Merge phrase dicts (e.g. from separate chunks of one document), combining scores of repeated phrases."""
+        merged = {}
+        for phrases in phrase_dicts:
+            for key, entry in phrases.items():
+                target = merged.get(key)
+                if target is None:
+                    merged[key] = dict(entry)
+                    continue
+                target["max"] = max(target["max"], entry["max"])
+                target["total"] += entry["total"]
+                target["count"] += entry["count"]
+        for entry in merged.values():
+            entry["mean"] = entry["total"] / entry["count"]
+        return merged
+
+    @classmethod
+    def _phrases_from_spans(cls, spans: list[tuple[str, float]]) -> dict:
+        phrases = {}
+        for phrase_text, score in spans:
+            key = cls.normalize_phrase(phrase_text)
+            if not key:
+                continue
+            entry = phrases.setdefault(key, {"text": phrase_text, "max": 0.0, "total": 0.0, "count": 0})
+            entry["max"] = max(entry["max"], score)
+            entry["total"] += score
+            entry["count"] += 1
+        return phrases
+
+    @classmethod
+    def rank_phrases(cls, phrases: dict) -> list[dict]:
+        """Order merged phrases by score (SCORE_MODE), then by how often they occur."""
+        return sorted(phrases.values(), key=lambda entry: (entry[cls.SCORE_MODE], entry["count"]), reverse=True)
+
+    @classmethod
+    def aggregate_spans(cls, chunk: str, tokens: list[dict]) -> list[tuple[str, float]]:
+        """
+        Join consecutive B-KEY/I-KEY tokens into (phrase, mean token score) pairs.
+
+        The pipeline leaves out "O" tokens, so a gap in the token indices ends
+        the current phrase: "B-KEY x, O y, I-KEY z" gives "x" and "z", not "x y z".
+        """
+        spans, current = [], None
+        for token in tokens:
+            label = token.get("entity", "O")
+            if current is not None and not cls._follows(current[-1], token):
+                current = None
+            if label == "B-KEY" and current is not None and cls._same_word(current[-1], token):
+                # A sub-word piece tagged B- still belongs to the word being read.
+                label = "I-KEY"
+            if label == "B-KEY" or (label == "I-KEY" and current is None):
+                current = [token]
+                spans.append(current)
+            elif label == "I-KEY":
+                current.append(token)
+            else:
+                current = None
+
+        return [(cls._span_text(chunk, span), float(sum(t["score"] for t in span) / len(span))) for span in spans]
+
+    @staticmethod
+    def normalize_phrase(phrase: str) -> str:
+        return " ".join(re.sub(r"[^\w\s-]", " ", phrase.casefold()).split()).strip("-")
+
+    @staticmethod
+    def _follows(previous: dict, token: dict) -> bool:
+        """Whether token comes right after previous; tokens without an index are assumed to."""
+        if previous.get("index") is None or token.get("index") is None:
+            return True
+        return token["index"] == previous["index"] + 1
+
+    @staticmethod
+    def _same_word(previous: dict, token: dict) -> bool:
+        return previous.get("end") is not None and previous.get("end") == token.get("start")
+
+    @staticmethod
+    def _span_text(chunk: str, span: list[dict]) -> str:
+        start, end = span[0].get("start"), span[-1].get("end")
+        if start is not None and end is not None:
+            # Widen to whole words in case the model only tagged part of one.
+            while start > 0 and chunk[start - 1].isalnum():
+                start -= 1
+            while end < len(chunk) and chunk[end].isalnum():
+                end += 1
+            return chunk[start:end].strip()
+
+        # Slow tokenizers don't report offsets; rebuild the phrase from the word pieces.
+        text = ""
+        for token in span:
+            word = token["word"]
+            if word.startswith("##"):
+                text += word[2:]
+            elif word[:1] in ("Ġ", "▁"):
+                text += " " + word[1:]
+            else:
+                text += (" " if text else "") + word
+        return text.strip()
@@ -0,0 +1,41 @@
+import importlib
+import importlib.util
+import threading
+
+
+class LazyModule:
+    """
+    A stand-in for a heavy module that performs the real import on first attribute access.
+    Keeps transformers/torch out of the GUI import chain until a worker actually needs them.
+    """
+
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Import (once) and return the underlying module."""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._module_name)
+        return self._module
+
+    def is_available(self) -> bool:
+        """Check whether the module can be imported, without importing it."""
+        return self._module is not None or importlib.util.find_spec(self._module_name) is not None
+
+    def __getattr__(self, name):
+        # Introspection (mock, inspect, copy) probes private attributes; don't import for those.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+
+transformers = LazyModule("transformers")
+
+
+def pipeline(*args, **kwargs):
+    """Build a transformers pipeline, importing transformers on first use."""
+    return transformers.pipeline(*args, **kwargs)
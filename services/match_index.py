@@ -0,0 +1,152 @@
+import bisect
+
+from services.search_service import SearchService, SearchTimeout, as_search_query
+
+
+def _utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+class MatchIndex:
+    """
+    Sorted spans of every match of a SearchQuery in a document, updated per edit.
+
+    Positions are QTextDocument positions (UTF-16 code units). build() scans a
+    text snapshot once, off the GUI thread. apply_change takes
+    the arguments of QTextDocument.contentsChange and rescans only around the
+    edit, from the query length before it. That rescan runs on the GUI thread,
+    so it is only done for literal queries, which are matched in linear time;
+    regex and multiline indexes report themselves stale instead and are
+    rebuilt in the background.
+    Next/previous and the matches in a visible range are binary searches over
+    the spans.
+
+    Matches don't overlap, as for Replace All ("aba" matches once in "ababa"),
+    so a match after the edit may start or end where another one used to. The
+    rescan of a literal query goes on past the edit until it reaches a
+    position that is outside both the old and the new matches; from there the
+    scan continues as it did before the edit.
+    """
+    # How far past the edit a literal rescan reads at first; it reads further until the matches line up again.
+    SYNC_SCAN_CHARS = 256
+
+    def __init__(self, search, spans=()):
+        self.search = as_search_query(search)
+        self.starts = [start for start, _ in spans]
+        self.ends = [end for _, end in spans]
+        self.revision = 0
+
+    @classmethod
+    def build(cls, text: str, search, should_stop=None) -> "MatchIndex | None":
+        """
+        Index the matches in text; returns None if should_stop() turned true during the scan.
+
+        Raises SearchTimeout and re.error like SearchService.scan.
+        """
+        search = as_search_query(search)
+        spans = SearchService.scan(text, search, should_stop=should_stop)
+        if spans is None:
+            return None
+        return cls(search, SearchService.document_spans(text, spans))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def span(self, number: int) -> tuple[int, int]:
+        return self.starts[number], self.ends[number]
+
+    def apply_change(self, position: int, chars_removed: int, chars_added: int, new_length: int, read_range) -> bool:
+        """
+        Update the matches after chars_removed characters at position were replaced by chars_added new ones.
+
+        read_range(start, end) must return the new document text in [start, end).
+        Returns False, leaving the index stale, for regex and multiline
+        queries and when the rescan takes longer than
+        SearchService.EDIT_SCAN_TIMEOUT_SECONDS.
+        """
+        if self.search.regex or self.search.multiline:
+            return False
+
+        delta = chars_added - chars_removed
+        # How far a match can extend past the edit, plus the characters a whole-word check looks at.
+        context = 1 if self.search.whole_word else 0
+        reach = _utf16_length(self.search.text) - 1 + context
+        low = max(0, position - reach)
+        # Matches starting here on see the same text as before the edit.
+        sync = position + chars_added + context
+        region_end = min(new_length, sync + reach + self.SYNC_SCAN_CHARS)
+        first = bisect.bisect_right(self.ends, low)
+        if first < len(self.starts):
+            # A match overlapping the edit is dropped and the scan starts over where it began.
+            low = min(low, self.starts[first])
+
+        while True:
+            try:
+                found = self._scan_region(low, region_end, new_length, context, read_range) if low < region_end else []
+            except SearchTimeout:
+                return False
+            resume = self._resume_position(found, sync, delta)
+            # A match cut off by the end of the region starts after region_end - reach.
+            if region_end == new_length or resume <= region_end - reach:
+                break
+            region_end = min(new_length, region_end + 4 * (region_end - low))
+
+        found = [span for span in found if span[1] <= resume]
+        last = bisect.bisect_left(self.starts, resume - delta)
+        self.starts[first:] = [start for start, _ in found] + [start + delta for start in self.starts[last:]]
+        self.ends[first:] = [end for _, end in found] + [end + delta for end in self.ends[last:]]
+        self.revision += 1
+        return True
+
+    def _resume_position(self, found, position, delta):
+        """
+        First position from position on that lies inside neither a rescanned match nor an old one.
+
+        Scanning from there finds the same matches as before the edit, so the
+        old matches after it are kept.
+        """
+        found_starts = [start for start, _ in found]
+        while True:
+            number = bisect.bisect_left(found_starts, position) - 1
+            if number >= 0 and found[number][1] > position:
+                position = found[number][1]
+                continue
+            number = bisect.bisect_left(self.starts, position - delta) - 1
+            if number >= 0 and self.ends[number] > position - delta:
+                position = self.ends[number] + delta
+                continue
+            return position
+
+    def _scan_region(self, low, region_end, length, context, read_range):
+        """Matches lying within [low, region_end), with context characters around it visible to lookarounds."""
+        before = read_range(max(0, low - context), low)
+        text = read_range(low, region_end)
+        after = read_range(region_end, min(length, region_end + context))
+        matches = SearchService.scan(before + text + after, self.search, pos=len(before),
+                                     timeout=SearchService.EDIT_SCAN_TIMEOUT_SECONDS)
+        spans = [(start - len(before), end - len(before)) for start, end in matches if end <= len(before) + len(text)]
+        return [(start + low, end + low) for start, end in SearchService.document_spans(text, spans)]
+
+    def next_match(self, position: int) -> int | None:
+        """Number of the first match starting at or after position, wrapping to the first; None without matches."""
+        if not self.starts:
+            return None
+        number = bisect.bisect_left(self.starts, position)
+        return number if number < len(self.starts) else 0
+
+    def previous_match(self, position: int) -> int | None:
+        """Number of the last match starting before position, wrapping to the last; None without matches."""
+        if not self.starts:
+            return None
+        return (bisect.bisect_left(self.starts, position) - 1) % len(self.starts)
+
+    def match_at(self, start: int, end: int) -> int | None:
+        """Number of the match spanning exactly [start, end), if there is one."""
+        number = bisect.bisect_left(self.starts, start)
+        if number < len(self.starts) and self.starts[number] == start and self.ends[number] == end:
+            return number
+        return None
+
+    def matches_between(self, start: int, end: int) -> range:
+        """Numbers of the matches overlapping [start, end)."""
+        return range(bisect.bisect_right(self.ends, start), bisect.bisect_left(self.starts, end))
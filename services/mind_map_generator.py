@@ -1,5 +1,7 @@
-from transformers import pipeline, Pipeline
 from PyQt5.QtCore import QObject, pyqtSignal, QRunnable
+from services.model_registry import registry
+from services.summarizer import SummarizerService
+from services.lazy_imports import pipeline
 
 
 class MindMapService(QObject):
@@ -7,16 +9,13 @@ class MindMapService(QObject):
     A service to handle mind map generation using a pre-trained model.
     Loads the model lazily on the first request.
     """
-    _generator: Pipeline = None
 
     @classmethod
-    def get_generator(cls) -> Pipeline:
+    def get_generator(cls):
         """Lazily loads and returns the text generation pipeline."""
-        if cls._generator is None:
-            # Using a text generation model to structure the output.
-            # This is a small, fast model suitable for this task.
-            cls._generator = pipeline("text2text-generation", model="sshleifer/distilbart-cnn-6-6")
-        return cls._generator
+        # Using a text generation model to structure the output. It is the
+        # summarizer's model, so the registry shares the loaded weights.
+        return registry.get("text2text-generation", SummarizerService.MODEL_NAME, pipeline)
 
 
 class MindMapWorker(QRunnable):
@@ -0,0 +1,113 @@
+"""
+Selects how the AI services run their models on the CPU.
+
+- "pytorch": the default full-precision transformers pipeline.
+- "int8": the same pipeline with its Linear layers dynamically quantized to int8.
+- "onnx": the model exported to ONNX and run by ONNX Runtime through optimum
+  (optional dependency: ``pip install optimum[onnxruntime]``).
+"""
+import os
+import shutil
+import tempfile
+import threading
+
+PYTORCH = "pytorch"
+INT8 = "int8"
+ONNX = "onnx"
+
+BACKEND_LABELS = {
+    PYTORCH: "PyTorch (full precision)",
+    INT8: "PyTorch int8 (quantized)",
+    ONNX: "ONNX Runtime",
+}
+
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "studymate", "onnx")
+
+_ORT_MODEL_CLASSES = {
+    "summarization": "ORTModelForSeq2SeqLM",
+    "text2text-generation": "ORTModelForSeq2SeqLM",
+    "token-classification": "ORTModelForTokenClassification",
+}
+
+_current = PYTORCH
+_lock = threading.Lock()
+
+
+def current() -> str:
+    return _current
+
+
+def set_current(backend: str) -> bool:
+    """Switch the backend used for newly loaded models. Returns True if it changed.
+
+    Models loaded with the previous backend are unloaded; the next request loads
+    them with the new one.
+    """
+    global _current
+    if backend not in BACKEND_LABELS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+    with _lock:
+        if backend == _current:
+            return False
+        _current = backend
+    from services.model_registry import registry
+
+    registry.clear()
+    return True
+
+
+def cache_model_id(model_name: str, backend: str | None = None) -> str:
+    """Model id used in result cache keys; outputs differ slightly between backends."""
+    backend = backend or _current
+    return model_name if backend == PYTORCH else f"{model_name}@{backend}"
+
+
+def pipeline_kwargs(task: str, model_name: str, backend: str | None = None) -> dict:
+    """Return the model/tokenizer arguments for transformers.pipeline under the given backend."""
+    backend = backend or _current
+    if backend != ONNX:
+        return {"model": model_name}
+
+    try:
+        import optimum.onnxruntime as ort
+    except ImportError as e:
+        raise RuntimeError("The ONNX Runtime backend needs the optional 'optimum[onnxruntime]' package.") from e
+    from transformers import AutoTokenizer
+
+    model_class = getattr(ort, _ORT_MODEL_CLASSES[task])
+    export_dir = os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        model = model_class.from_pretrained(export_dir)
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        model = model_class.from_pretrained(model_name, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        # Exporting takes a while; keep the graph for the next start.
+        _save_export(export_dir, model, tokenizer)
+    return {"model": model, "tokenizer": tokenizer}
+
+
+def _save_export(export_dir: str, model, tokenizer) -> None:
+    """Save into a temporary directory that is renamed into place, so an interrupted save is never reused."""
+    os.makedirs(ONNX_CACHE_DIR, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(export_dir)}.", dir=ONNX_CACHE_DIR)
+    try:
+        model.save_pretrained(temp_dir)
+        tokenizer.save_pretrained(temp_dir)
+        try:
+            os.replace(temp_dir, export_dir)
+        except OSError:
+            pass  # Another process saved the same export first
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def optimize(pipe, backend: str | None = None):
+    """Apply backend-specific post-processing to a freshly built pipeline."""
+    backend = backend or _current
+    if backend == INT8:
+        import torch
+
+        pipe.model = torch.quantization.quantize_dynamic(pipe.model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipe
+
@@ -0,0 +1,167 @@
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from services import model_backends
+
+
+class _LoadedModel:
+    def __init__(self, model, tokenizer, size_bytes: int):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.size_bytes = size_bytes
+        self.pipelines = {}  # task -> pipeline built on this model
+        self.last_used = time.monotonic()
+
+
+class ModelRegistry:
+    """
+    Loads models once per process and shares them between the AI services.
+
+    Models are keyed by (model name, inference backend). A service asking for a
+    task on a model that is already loaded for another task gets a pipeline
+    built on the same model and tokenizer instances, so the summarizer and the
+    mind map generator share one copy of distilbart. The estimated size of all
+    loaded models is kept under max_bytes by unloading the least recently used
+    ones, and models not used for idle_timeout seconds are unloaded by a
+    background thread. The model being loaded is always kept, even if it alone
+    exceeds the budget.
+    """
+    DEFAULT_MAX_BYTES = 2048 * 1024 * 1024
+    DEFAULT_IDLE_TIMEOUT = 10 * 60
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT):
+        self.max_bytes = max_bytes
+        self.idle_timeout = idle_timeout
+        self._lock = threading.RLock()
+        self._models = OrderedDict()  # (model name, backend) -> _LoadedModel, least recently used first
+        self._sweeper = None
+        self._wake = threading.Event()
+
+    def get(self, task: str, model_name: str, build_pipeline):
+        """
+        Return a pipeline for task on model_name, loading the model if needed.
+
+        build_pipeline is called like transformers.pipeline(task, **kwargs).
+        """
+        key = (model_name, model_backends.current())
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                kwargs = model_backends.pipeline_kwargs(task, model_name, key[1])
+                pipe = model_backends.optimize(build_pipeline(task, **kwargs), key[1])
+                entry = _LoadedModel(pipe.model, pipe.tokenizer, self._estimate_bytes(pipe.model))
+                entry.pipelines[task] = pipe
+                self._models[key] = entry
+                self._evict_over_budget(keep=key)
+                self._ensure_sweeper()
+            elif task not in entry.pipelines:
+                entry.pipelines[task] = build_pipeline(task, model=entry.model, tokenizer=entry.tokenizer)
+
+            entry.last_used = time.monotonic()
+            self._models.move_to_end(key)
+            return entry.pipelines[task]
+
+    def configure(self, max_bytes: int | None = None, idle_timeout: float | None = None) -> None:
+        """Change the budget (bytes) and idle timeout (seconds, 0 disables it); applied immediately."""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if idle_timeout is not None:
+                self.idle_timeout = idle_timeout or None
+            self._evict_over_budget()
+        self._wake.set()
+
+    def settings(self) -> dict:
+        return {"max_bytes": self.max_bytes, "idle_timeout": self.idle_timeout or 0}
+
+    def loaded(self) -> dict:
+        """Return {(model name, backend): estimated bytes} for the loaded models."""
+        with self._lock:
+            return {key: entry.size_bytes for key, entry in self._models.items()}
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._models.values())
+
+    def unload_idle(self, now: float | None = None) -> int:
+        """Unload models unused for longer than idle_timeout; returns how many were unloaded."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self.idle_timeout:
+                return 0
+            idle = [key for key, entry in self._models.items() if now - entry.last_used >= self.idle_timeout]
+            self._unload(idle)
+        return len(idle)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._unload(list(self._models))
+
+    # ---------------- Internals ----------------
+    def _evict_over_budget(self, keep=None):
+        # Caller holds the lock. Iterates least recently used first.
+        evicted = []
+        total = sum(entry.size_bytes for entry in self._models.values())
+        for key, entry in self._models.items():
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                evicted.append(key)
+                total -= entry.size_bytes
+        self._unload(evicted)
+
+    def _unload(self, keys):
+        # Caller holds the lock. Pipelines still held by a running job stay alive until it returns.
+        for key in keys:
+            del self._models[key]
+        if keys:
+            gc.collect()
+
+    def _ensure_sweeper(self):
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = threading.Thread(target=self._sweep, name="model-registry-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep(self):
+        while True:
+            with self._lock:
+                if not self._models:
+                    self._sweeper = None
+                    return
+                interval = min(self.idle_timeout / 2, 60) if self.idle_timeout else 60
+            self._wake.wait(interval)
+            self._wake.clear()
+            self.unload_idle()
+
+    @staticmethod
+    def _estimate_bytes(model) -> int:
+        """Best-effort size of a model's weights in bytes."""
+        footprint = getattr(model, "get_memory_footprint", None)
+        if callable(footprint):
+            try:
+                size = footprint()
+                if isinstance(size, int):
+                    return size
+            except Exception:
+                pass
+
+        parameters = getattr(model, "parameters", None)
+        if callable(parameters):
+            try:
+                size = sum(p.numel() * p.element_size() for p in parameters())
+                if isinstance(size, int) and size:
+                    return size
+            except Exception:
+                pass
+
+        # ONNX Runtime models: use the size of the exported graph on disk.
+        save_dir = getattr(model, "model_save_dir", None)
+        if isinstance(save_dir, (str, os.PathLike)) and os.path.isdir(save_dir):
+            return sum(entry.stat().st_size for entry in os.scandir(save_dir) if entry.is_file())
+        return 0
+
+
+registry = ModelRegistry()
@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+
+
+class PageCache:
+    """
+    Size-capped LRU cache for rendered pages.
+
+    Keys are usually (page index, zoom) tuples and values rendered images; the
+    caller passes each value's size in bytes, and the least recently used
+    entries are dropped once the total exceeds max_bytes. Safe to share between
+    the GUI thread and render threads.
+    """
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size: int) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def discard(self, matching) -> int:
+        """Drop every entry whose key satisfies matching(key); returns how many were dropped."""
+        with self._lock:
+            keys = [key for key in self._entries if matching(key)]
+            for key in keys:
+                self._total_bytes -= self._entries.pop(key)[1]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes
@@ -0,0 +1,85 @@
+import bisect
+
+
+class PageLayout:
+    """
+    Vertical layout of document pages for continuous scrolling.
+
+    Pages are stacked top to bottom, each scaled by the zoom factor and
+    separated by gap pixels. Only page sizes are needed, so the layout of a
+    large document is known before any page is rendered, and lookups by
+    position are binary searches over the page offsets.
+    """
+
+    def __init__(self, page_sizes: list[tuple[float, float]], gap: int = 12):
+        self.page_sizes = page_sizes  # (width, height) in points
+        self.gap = gap
+        self.zoom = None
+        self._tops = []
+        self._heights = []
+        self.set_zoom(1.0)
+
+    def set_zoom(self, zoom: float) -> None:
+        if zoom == self.zoom:
+            return
+        self.zoom = zoom
+        self._tops, self._heights = [], []
+        top = self.gap
+        for _, height in self.page_sizes:
+            scaled = max(1, round(height * zoom))
+            self._tops.append(top)
+            self._heights.append(scaled)
+            top += scaled + self.gap
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_sizes)
+
+    @property
+    def total_height(self) -> int:
+        if not self._tops:
+            return self.gap
+        return self._tops[-1] + self._heights[-1] + self.gap
+
+    @property
+    def max_width(self) -> int:
+        return max((self.page_width(index) for index in range(self.page_count)), default=0)
+
+    def page_top(self, index: int) -> int:
+        return self._tops[index]
+
+    def page_height(self, index: int) -> int:
+        return self._heights[index]
+
+    def page_width(self, index: int) -> int:
+        return max(1, round(self.page_sizes[index][0] * self.zoom))
+
+    def page_at(self, y: float) -> int:
+        """Index of the page at vertical position y (the nearest one above it when y is in a gap)."""
+        if not self._tops:
+            return 0
+        return max(0, bisect.bisect_right(self._tops, y) - 1)
+
+    def pages_between(self, top: float, bottom: float) -> range:
+        """Indexes of the pages that intersect the vertical range [top, bottom)."""
+        if not self._tops or bottom <= top:
+            return range(0)
+        first = self.page_at(top)
+        if self._tops[first] + self._heights[first] <= top:
+            first += 1  # top falls in the gap below that page
+        last = bisect.bisect_left(self._tops, bottom) - 1
+        return range(first, max(first, last + 1))
+
+
+def tiles_in_rect(width: int, height: int, left: float, top: float, right: float, bottom: float, tile_size: int) -> list[tuple[int, int]]:
+    """
+    (column, row) of the tile_size tiles of a width x height page image that
+    intersect the rectangle [left, right) x [top, bottom), in page pixels.
+    """
+    left, top = max(0, left), max(0, top)
+    right, bottom = min(width, right), min(height, bottom)
+    if right <= left or bottom <= top:
+        return []
+    columns = range(int(left // tile_size), int((right - 1) // tile_size) + 1)
+    rows = range(int(top // tile_size), int((bottom - 1) // tile_size) + 1)
+    return [(column, row) for row in rows for column in columns]
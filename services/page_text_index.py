@@ -0,0 +1,136 @@
+import bisect
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+_WORD = re.compile(r"\w+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class PageTextIndex:
+    """
+    In-memory inverted index from words to the pages of a document they occur on.
+
+    Pages are added one at a time, typically from a background thread while the
+    text is being extracted, and can be queried at any point; results cover the
+    pages indexed so far. A query narrows the pages down through the word
+    postings and then checks the remaining pages for the whole phrase, so
+    searching never rescans every page. The query's first and last words may be
+    partial ("synth" finds "photosynthesis"). Matching ignores case and treats
+    any run of whitespace, including line breaks, as a single space. Recent
+    query results are cached until another page is added.
+
+    Partial words are looked up without going through the whole vocabulary:
+    prefixes by bisecting the sorted words, other pieces of at least
+    TRIGRAM_LENGTH characters through the words sharing their trigrams.
+    """
+    MAX_CACHED_QUERIES = 64
+    TRIGRAM_LENGTH = 3
+
+    def __init__(self):
+        self._texts = {}  # page -> normalized text
+        self._postings = defaultdict(set)  # word -> pages
+        self._sorted_words = []  # The words in _postings, sorted on the next prefix lookup after new ones arrive
+        self._words_sorted = True
+        self._trigrams = defaultdict(set)  # three-character piece -> words containing it
+        self._queries = OrderedDict()  # normalized query -> sorted pages
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return _WHITESPACE.sub(" ", text).strip().lower()
+
+    def add_page(self, page: int, text: str) -> None:
+        normalized = self.normalize(text)
+        with self._lock:
+            self._texts[page] = normalized
+            for word in set(_WORD.findall(normalized)):
+                if word not in self._postings:
+                    self._add_word(word)
+                self._postings[word].add(page)
+            self._queries.clear()
+
+    def _add_word(self, word):
+        self._sorted_words.append(word)
+        self._words_sorted = False
+        for start in range(len(word) - self.TRIGRAM_LENGTH + 1):
+            self._trigrams[word[start:start + self.TRIGRAM_LENGTH]].add(word)
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages indexed so far."""
+        with self._lock:
+            return len(self._texts)
+
+    def pages_for(self, query: str) -> list[int]:
+        """Sorted indexes of the indexed pages that contain query."""
+        query = self.normalize(query)
+        if not query:
+            return []
+        with self._lock:
+            pages = self._queries.get(query)
+            if pages is None:
+                pages = self._search(query)
+                self._queries[query] = pages
+                while len(self._queries) > self.MAX_CACHED_QUERIES:
+                    self._queries.popitem(last=False)
+            else:
+                self._queries.move_to_end(query)
+            return pages
+
+    def occurrences(self, page: int, query: str) -> int:
+        """How often query occurs on an indexed page (without overlaps); 0 for a page not indexed yet."""
+        query = self.normalize(query)
+        with self._lock:
+            text = self._texts.get(page)
+        return text.count(query) if text and query else 0
+
+    def _search(self, query):
+        words = list(_WORD.finditer(query))
+        candidates = None if words else set(self._texts)
+        for index, match in enumerate(words):
+            open_left = index == 0 and match.start() == 0
+            open_right = index == len(words) - 1 and match.end() == len(query)
+            pages = self._pages_with_word(match.group(), open_left, open_right)
+            candidates = pages if candidates is None else candidates & pages
+            if not candidates:
+                return []
+        return sorted(page for page in candidates if query in self._texts[page])
+
+    def _pages_with_word(self, word, open_left, open_right):
+        """Pages with word itself or, when the query may cut a word on that side, a word extending it."""
+        if not open_left and not open_right:
+            return set(self._postings.get(word, ()))
+        if not open_left:
+            candidates = self._words_starting_with(word)
+        else:
+            candidates = self._words_containing(word)
+            if not open_right:
+                candidates = [candidate for candidate in candidates if candidate.endswith(word)]
+        pages = set()
+        for candidate in candidates:
+            pages |= self._postings[candidate]
+        return pages
+
+    def _words_starting_with(self, prefix):
+        if not self._words_sorted:
+            self._sorted_words.sort()
+            self._words_sorted = True
+        words = []
+        index = bisect.bisect_left(self._sorted_words, prefix)
+        while index < len(self._sorted_words) and self._sorted_words[index].startswith(prefix):
+            words.append(self._sorted_words[index])
+            index += 1
+        return words
+
+    def _words_containing(self, piece):
+        if len(piece) < self.TRIGRAM_LENGTH:
+            return [word for word in self._postings if piece in word]
+        trigrams = {piece[start:start + self.TRIGRAM_LENGTH] for start in range(len(piece) - self.TRIGRAM_LENGTH + 1)}
+        candidates = None
+        for trigram in sorted(trigrams, key=lambda trigram: len(self._trigrams.get(trigram, ()))):
+            words = self._trigrams.get(trigram, set())
+            candidates = set(words) if candidates is None else candidates & words
+            if not candidates:
+                return []
+        return [word for word in candidates if piece in word]
@@ -0,0 +1,194 @@
+import bisect
+import difflib
+import mmap
+import os
+import shutil
+import tempfile
+
+
+class LineIndex:
+    """
+    Sparse newline index over a read-only byte buffer.
+
+    Only the number of newlines before each BLOCK_BYTES block is stored, which
+    takes one pass of C-speed counting to build and a few kilobytes for a
+    file of hundreds of megabytes. Finding a line binary-searches the blocks
+    and then scans within one block.
+    """
+    BLOCK_BYTES = 64 * 1024
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self._newlines_before = []  # Newlines before the start of each block
+        count = 0
+        for start in range(0, len(buffer), self.BLOCK_BYTES):
+            self._newlines_before.append(count)
+            count += buffer[start:start + self.BLOCK_BYTES].count(b"\n")
+        self.line_count = count + 1  # A trailing newline starts an empty last line
+
+    def line_offset(self, line: int) -> int:
+        """Byte offset where line starts; line_count gives the end of the buffer."""
+        if line <= 0:
+            return 0
+        if line >= self.line_count:
+            return len(self.buffer)
+        # The newline ending line - 1 is the line-th newline (1-based).
+        block = bisect.bisect_left(self._newlines_before, line) - 1
+        position = block * self.BLOCK_BYTES
+        for _ in range(line - self._newlines_before[block]):
+            position = self.buffer.find(b"\n", position) + 1
+        return position
+
+
+class PieceTable:
+    """
+    Line-based piece table over a read-only original buffer.
+
+    The document is a list of pieces, each either a range of lines of the
+    original buffer or a list of added lines, so editing never copies the
+    original text and reading a few lines decodes only those bytes. Lines are
+    joined with the file's newline, detected from its first line. Bytes that
+    don't decode are shown as U+FFFD; they are written back unchanged as long
+    as their line isn't edited, see update_lines.
+    """
+
+    def __init__(self, original=b"", encoding: str = "utf-8"):
+        self.original = original
+        self.encoding = encoding
+        self.index = LineIndex(original)
+        first_line_end = self.index.line_offset(1)
+        self.newline = "\r\n" if original[max(0, first_line_end - 2):first_line_end] == b"\r\n" else "\n"
+        self.pieces = [("original", 0, self.index.line_count)]
+        self.modified = False
+
+    @property
+    def line_count(self) -> int:
+        return sum(self._piece_length(piece) for piece in self.pieces)
+
+    @staticmethod
+    def _piece_length(piece):
+        return piece[2] - piece[1] if piece[0] == "original" else len(piece[1])
+
+    def lines(self, start: int, stop: int) -> list[str]:
+        """Lines [start, stop) without their line endings."""
+        result = []
+        piece_start = 0
+        for piece in self.pieces:
+            length = self._piece_length(piece)
+            first, last = max(start, piece_start), min(stop, piece_start + length)
+            if first < last:
+                if piece[0] == "original":
+                    result += self._original_lines(piece[1] + first - piece_start, piece[1] + last - piece_start)
+                else:
+                    result += piece[1][first - piece_start:last - piece_start]
+            piece_start += length
+            if piece_start >= stop:
+                break
+        return result
+
+    def _original_lines(self, start, stop):
+        text = self.original[self.index.line_offset(start):self.index.line_offset(stop)].decode(self.encoding, errors="replace")
+        lines = text.split("\n")
+        if len(lines) > stop - start:
+            lines.pop()  # The empty string after the last line's newline
+        return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+    def replace_lines(self, start: int, stop: int, new_lines: list[str]) -> None:
+        """Replace lines [start, stop) with new_lines."""
+        before, after = [], []
+        piece_start = 0
+        for piece in self.pieces:
+            length = self._piece_length(piece)
+            if piece_start < start:
+                before.append(self._slice(piece, 0, min(length, start - piece_start)))
+            if piece_start + length > stop:
+                after.append(self._slice(piece, max(0, stop - piece_start), length))
+            piece_start += length
+        middle = [("added", list(new_lines))] if new_lines else []
+        self.pieces = [piece for piece in before + middle + after if self._piece_length(piece)] or [("added", [""])]
+        self.modified = True
+
+    def update_lines(self, start: int, old_lines: list[str], new_lines: list[str]) -> None:
+        """
+        Replace the lines from start, which read as old_lines, with new_lines, touching only the lines that differ.
+
+        Unchanged lines stay pieces of the original buffer, so their bytes are
+        saved as they were even if they didn't decode cleanly.
+        """
+        opcodes = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes()
+        # From the last change back, so the line numbers of earlier ones stay valid.
+        for tag, old_start, old_stop, new_start, new_stop in reversed(opcodes):
+            if tag != "equal":
+                self.replace_lines(start + old_start, start + old_stop, new_lines[new_start:new_stop])
+
+    @staticmethod
+    def _slice(piece, start, stop):
+        if piece[0] == "original":
+            return ("original", piece[1] + start, piece[1] + stop)
+        return ("added", piece[1][start:stop])
+
+    def chunks(self, chunk_bytes: int = 1024 * 1024):
+        """The encoded document in chunks, for writing it out without building it in memory."""
+        newline = self.newline.encode(self.encoding)
+        for number, piece in enumerate(self.pieces):
+            if number:
+                yield newline
+            if piece[0] == "added":
+                yield newline.join(line.encode(self.encoding) for line in piece[1])
+                continue
+            start, end = self.index.line_offset(piece[1]), self.index.line_offset(piece[2])
+            if piece[2] < self.index.line_count:
+                end -= len(newline)  # The newline ending the piece's last line
+            for offset in range(start, end, chunk_bytes):
+                yield self.original[offset:min(offset + chunk_bytes, end)]
+
+
+class LargeTextFile:
+    """
+    A text file opened through a memory map and edited through a PieceTable.
+
+    The file's pages are read by the OS only when lines on them are requested,
+    so opening is a single newline count and memory stays a small fraction of
+    the file size. save() streams the pieces to a temporary file, replaces the
+    original with it and maps the new file.
+    """
+
+    def __init__(self, file_path: str, encoding: str = "utf-8"):
+        self.file_path = file_path
+        self.encoding = encoding
+        self._file = None
+        self._map = None
+        self.open()
+
+    def open(self) -> None:
+        self._file = open(self.file_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # Empty files can't be mapped.
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.table = PieceTable(self._map if self._map is not None else b"", self.encoding)
+
+    def save(self, file_path: str | None = None) -> None:
+        file_path = file_path or self.file_path
+        handle, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp",
+                                             dir=os.path.dirname(os.path.abspath(file_path)))
+        try:
+            with os.fdopen(handle, "wb") as f:
+                for chunk in self.table.chunks():
+                    f.write(chunk)
+            if os.path.exists(file_path):
+                shutil.copymode(file_path, temp_path)  # mkstemp creates the file readable by its owner only
+        except OSError:
+            os.remove(temp_path)
+            raise
+        self.close()
+        os.replace(temp_path, file_path)
+        self.file_path = file_path
+        self.open()
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Content-addressed cache for AI results.
+
+    Entries are keyed by a hash of (text, model id, option). Recent entries live
+    in an in-memory LRU; when a cache directory is given, every entry is also
+    written to disk so results survive restarts. The disk layer is capped in
+    bytes and evicts the least recently used files first.
+    """
+
+    def __init__(self, cache_dir: str | None = None, max_memory_entries: int = 128, max_disk_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, model_id: str, option: str = "") -> str:
+        """Build a cache key from the text content, the model and the request option."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{model_id}\0{option}\0{text_hash}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        value = self._read_disk(key)
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """Store value under key in memory and, if enabled, on disk."""
+        self._remember(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(self, key: str, compute) -> str:
+        """Return the cached value for key, computing and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached entry from memory and disk."""
+        with self._lock:
+            self._memory.clear()
+            for path, _, _ in self._disk_entries():
+                self._remove(path)
+
+    # ---------------- Memory layer ----------------
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    # ---------------- Disk layer ----------------
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+            # Touch the file so disk eviction follows recency of use.
+            os.utime(path)
+            return value
+        except OSError:
+            return None
+
+    def _write_disk(self, key, value):
+        if not self.cache_dir:
+            return
+        path = self._entry_path(key)
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(temp_path, path)
+        except OSError:
+            self._remove(temp_path)
+            return
+        with self._lock:
+            self._evict_disk()
+
+    def _disk_entries(self):
+        if not self.cache_dir:
+            return []
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        for name in names:
+            if not name.endswith(".txt"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        total_size = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total_size <= self.max_disk_bytes:
+                break
+            self._remove(path)
+            total_size -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
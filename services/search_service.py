@@ -1,13 +1,216 @@
+import bisect
+import multiprocessing
 import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 
+_ASTRAL_CHARACTER = re.compile("[\U00010000-\U0010FFFF]")
+_PATTERN_CACHE = OrderedDict()  # (pattern, flags) -> compiled pattern, least recently used first
+_PATTERN_CACHE_LOCK = threading.Lock()
+MAX_CACHED_PATTERNS = 32
 
-class SearchService:
-    """Logic for text search and replace operations in editor widgets."""
+
+class SearchTimeout(TimeoutError):
+    """A scan ran past its deadline, typically because of a pathological regex."""
+
+
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """re.compile through a small LRU, so retyping a query or toggling an option back reuses the pattern."""
+    key = (pattern, flags)
+    with _PATTERN_CACHE_LOCK:
+        if key in _PATTERN_CACHE:
+            _PATTERN_CACHE.move_to_end(key)
+            return _PATTERN_CACHE[key]
+    compiled = re.compile(pattern, flags)  # Raises re.error for an invalid pattern, which is not cached
+    with _PATTERN_CACHE_LOCK:
+        _PATTERN_CACHE[key] = compiled
+        while len(_PATTERN_CACHE) > MAX_CACHED_PATTERNS:
+            _PATTERN_CACHE.popitem(last=False)
+    return compiled
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """
+    What to search for and how.
+
+    Without regex the text is matched literally. whole_word rejects matches
+    with a word character right before or after them. Without multiline a
+    match never spans a line break, which lets scans and incremental updates
+    work line by line; with it, "." also matches line breaks. "^" and "$"
+    always match at line boundaries. With regex, replacements may refer to
+    groups ("\\1", "\\g<name>").
+    """
+    text: str
+    case_sensitive: bool = False
+    regex: bool = False
+    whole_word: bool = False
+    multiline: bool = False
+
+    @property
+    def is_plain(self) -> bool:
+        """Whether QTextDocument.find can search for this query directly."""
+        return not (self.regex or self.whole_word or self.multiline)
+
+    def pattern(self) -> re.Pattern:
+        """The compiled pattern; raises re.error for an invalid regex."""
+        source = self.text if self.regex else re.escape(self.text)
+        if self.whole_word:
+            source = rf"(?<!\w)(?:{source})(?!\w)"
+        flags = re.MULTILINE
+        if not self.case_sensitive:
+            flags |= re.IGNORECASE
+        if self.multiline:
+            flags |= re.DOTALL
+        return compile_pattern(source, flags)
+
+    def replacement(self, match: re.Match, replace_text: str) -> str:
+        return match.expand(replace_text) if self.regex else replace_text
+
+
+def as_search_query(query, case_sensitive=False) -> SearchQuery:
+    return query if isinstance(query, SearchQuery) else SearchQuery(query or "", case_sensitive)
+
+
+def _serve_scans(connection):
+    """Entry point of a scan process: answers requests from ScanProcessPool.run until the connection closes."""
+    connection.send("ready")
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        try:
+            if request[0] == "fullmatch":
+                _, text, search, replace_text = request
+                result = SearchService.fullmatch_replacement(text, search, replace_text, in_process=True)
+            else:
+                _, text, search, pos, endpos, replace_text = request
+                result = SearchService.collect_matches(text, search, pos, endpos, replace_text)
+        except (re.error, IndexError) as e:  # An invalid pattern, or a replacement naming a missing group
+            connection.send((False, str(e)))
+        else:
+            connection.send((True, result))
+
+
+class ScanProcessPool:
+    """
+    Child processes that run regex scans for the GUI process.
+
+    Python's regex engine holds the GIL and can't be interrupted, so a pattern
+    that backtracks catastrophically ("(a+)+$") would freeze the GUI even when
+    run on a worker thread. In a child process it only blocks that process,
+    which is killed when the scan passes its timeout or should_stop() turns
+    true; the caller meanwhile just waits on a pipe. Processes are started on
+    first use and kept for the next scans.
+    """
+    MAX_IDLE_PROCESSES = 2
+    POLL_SECONDS = 0.05
+    READY_TIMEOUT_SECONDS = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = []  # (process, connection)
+
+    def run(self, request: tuple, timeout: float, should_stop=None):
+        """
+        Send a request to a scan process and return its result, or None if should_stop() turned true first.
+
+        Raises SearchTimeout after timeout seconds and re.error for an invalid
+        pattern or replacement.
+        """
+        worker = self._acquire()
+        connection = worker[1]
+        deadline = time.monotonic() + timeout
+        try:
+            connection.send(request)
+            while not connection.poll(self.POLL_SECONDS):
+                if (should_stop is not None and should_stop()) or time.monotonic() > deadline:
+                    break
+            else:
+                ok, result = connection.recv()
+                self._release(worker)
+                if not ok:
+                    raise re.error(result)
+                return result
+        except (EOFError, BrokenPipeError) as e:
+            self._kill(worker)
+            raise RuntimeError(f"The search process stopped unexpectedly: {e}")
+        self._kill(worker)
+        if should_stop is not None and should_stop():
+            return None
+        raise SearchTimeout(f"Searching for '{request[2].text}' took too long")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._kill(worker)
+
+    def _acquire(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker[0].is_alive():
+                    return worker
+                worker[1].close()
+        # Spawn rather than fork: the GUI process has Qt threads running.
+        context = multiprocessing.get_context("spawn")
+        connection, child_connection = context.Pipe()
+        process = context.Process(target=_serve_scans, args=(child_connection,), daemon=True)
+        process.start()
+        child_connection.close()
+        worker = (process, connection)
+        try:
+            ready = connection.poll(self.READY_TIMEOUT_SECONDS) and connection.recv() == "ready"
+        except EOFError:
+            ready = False
+        if not ready:
+            self._kill(worker)
+            raise RuntimeError("The search process did not start")
+        return worker
+
+    def _release(self, worker):
+        with self._lock:
+            if len(self._idle) < self.MAX_IDLE_PROCESSES:
+                self._idle.append(worker)
+                return
+        self._kill(worker)
 
     @staticmethod
-    def find_next(editor, query, case_sensitive=False):
-        if not query or not query.strip():
+    def _kill(worker):
+        process, connection = worker
+        if process.is_alive():
+            process.kill()
+        process.join(1)
+        connection.close()
+
+
+scan_processes = ScanProcessPool()
+
+
+class SearchService:
+    """Logic for text search and replace operations in editor widgets.
+
+    Queries are plain strings (matched literally, with case_sensitive) or
+    SearchQuery objects carrying the regex, whole-word and multiline options.
+    """
+    PROGRESS_EVERY_REPLACEMENTS = 1000
+    SCAN_SLICE_CHARS = 64 * 1024
+    SCAN_TIMEOUT_SECONDS = 5
+    # Budget of the literal scans the GUI thread waits for: rescanning around an edit and matching a selection.
+    EDIT_SCAN_TIMEOUT_SECONDS = 0.25
+
+    @classmethod
+    def find_next(cls, editor, query, case_sensitive=False):
+        search = as_search_query(query, case_sensitive)
+        if not search.text.strip():
             return False
+        if not search.is_plain:
+            return cls.find_in_editor(editor, search)
+        query, case_sensitive = search.text, search.case_sensitive
 
         from PyQt5.QtGui import QTextDocument, QTextCursor
 
@@ -21,10 +224,14 @@ class SearchService:
             found = editor.find(query, flags)
         return found
 
-    @staticmethod
-    def find_previous(editor, query, case_sensitive=False):
-        if not query or not query.strip():
+    @classmethod
+    def find_previous(cls, editor, query, case_sensitive=False):
+        search = as_search_query(query, case_sensitive)
+        if not search.text.strip():
             return False
+        if not search.is_plain:
+            return cls.find_in_editor(editor, search, backward=True)
+        query, case_sensitive = search.text, search.case_sensitive
 
         from PyQt5.QtGui import QTextDocument, QTextCursor
 
@@ -38,26 +245,212 @@ class SearchService:
             found = editor.find(query, flags)
         return found
 
-    @staticmethod
-    def replace_current(editor, query, replace_text, case_sensitive=False):
-        if not query or not query.strip():
+    @classmethod
+    def find_in_editor(cls, editor, query, backward=False):
+        """Select the next (or previous) match after the selection by scanning the text; wraps around."""
+        from PyQt5.QtGui import QTextCursor
+
+        text = editor.toPlainText()
+        spans = cls.document_spans(text, cls.scan(text, query))
+        if not spans:
+            return False
+
+        cursor = editor.textCursor()
+        starts = [start for start, _ in spans]
+        if backward:
+            number = bisect.bisect_left(starts, cursor.selectionStart()) - 1
+        else:
+            number = bisect.bisect_left(starts, cursor.selectionEnd())
+        start, end = spans[number % len(spans)]
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
+        return True
+
+    @classmethod
+    def replace_current(cls, editor, query, replace_text, case_sensitive=False):
+        search = as_search_query(query, case_sensitive)
+        if not search.text.strip():
             return False
 
         cursor = editor.textCursor()
         if cursor.hasSelection():
-            selected_text = cursor.selectedText()
-            matches = selected_text == query if case_sensitive else selected_text.lower() == query.lower()
-            if matches:
-                cursor.insertText(replace_text)
+            selected_text = cursor.selectedText().replace("\u2029", "\n")
+            replacement = cls.fullmatch_replacement(selected_text, search, replace_text)
+            if replacement is not None:
+                cursor.insertText(replacement)
                 return True
 
-        return SearchService.find_next(editor, query, case_sensitive) and SearchService.replace_current(editor, query, replace_text, case_sensitive)
+        # Without a matching selection only plain queries, which QTextDocument finds quickly, move on to the next match.
+        return search.is_plain and cls.find_next(editor, search) and cls.replace_current(editor, search, replace_text)
+
+    @classmethod
+    def fullmatch_replacement(cls, text, query, replace_text, timeout=None, in_process=False):
+        """
+        The replacement for text if all of it matches query, else None.
+
+        Regexes are matched in a scan process, within EDIT_SCAN_TIMEOUT_SECONDS
+        unless another timeout is given; starting that process takes a while,
+        so the GUI thread leaves regexes to a SelectionReplaceWorker.
+        """
+        search = as_search_query(query)
+        if search.regex and not in_process:
+            return scan_processes.run(("fullmatch", text, search, replace_text), timeout or cls.EDIT_SCAN_TIMEOUT_SECONDS)
+        match = search.pattern().fullmatch(text)
+        return search.replacement(match, replace_text) if match else None
+
+    @classmethod
+    def replace_all(cls, text, query, replace_text, case_sensitive=False):
+        search = as_search_query(query, case_sensitive)
+        parts, position, count = [], 0, 0
+        for start, end, match in cls.iter_matches(text, search):
+            parts += [text[position:start], search.replacement(match, replace_text)]
+            position = end
+            count += 1
+        return "".join(parts) + text[position:], count
+
+    @classmethod
+    def scan(cls, text, query, pos=0, endpos=None, replace_text=None, timeout=None, should_stop=None):
+        """
+        The matches of query in text[pos:endpos] as collect_matches returns them, or None if should_stop() turned true.
+
+        Literal queries take linear time and are scanned in this process,
+        checking should_stop() and the timeout between slices. Regexes are
+        scanned in a ScanProcessPool process, which is killed when it runs
+        too long, since a regex call can't be interrupted. Raises
+        SearchTimeout after timeout seconds (SCAN_TIMEOUT_SECONDS by default)
+        and re.error for an invalid regex or replacement.
+        """
+        search = as_search_query(query)
+        timeout = timeout or cls.SCAN_TIMEOUT_SECONDS
+        if search.regex:
+            return scan_processes.run(("scan", text, search, pos, endpos, replace_text), timeout, should_stop)
+        matches = cls.collect_matches(text, search, pos, endpos, replace_text, time.monotonic() + timeout, should_stop)
+        return None if should_stop is not None and should_stop() else matches
+
+    @classmethod
+    def collect_matches(cls, text, query, pos=0, endpos=None, replace_text=None, deadline=None, should_stop=None):
+        """(start, end) of each match, or (start, end, replacement) when replace_text is given; scanned in this process."""
+        search = as_search_query(query)
+        iterator = cls.iter_matches(text, search, pos, endpos, deadline, should_stop)
+        if replace_text is None:
+            return [(start, end) for start, end, _ in iterator]
+        return [(start, end, search.replacement(match, replace_text)) for start, end, match in iterator]
+
+    @classmethod
+    def iter_matches(cls, text, query, pos=0, endpos=None, deadline=None, should_stop=None):
+        """
+        Yield (start, end, match) for the matches of query in text[pos:endpos], in order.
+
+        Unless the query is multiline, the text is scanned in slices of about
+        SCAN_SLICE_CHARS that end at line breaks, and a match that would run
+        past a line break is searched for again within its line. deadline (a
+        time.monotonic() value) is checked before every slice and after every
+        regex call; passing it raises SearchTimeout. Iteration ends early once
+        should_stop() is true. Empty matches are skipped. A single regex call
+        can't be interrupted, so untrusted regexes belong in scan().
+        """
+        search = as_search_query(query)
+        if not search.text:
+            return
+        pattern = search.pattern()
+        endpos = len(text) if endpos is None else endpos
+        while pos < endpos:
+            if deadline is not None and time.monotonic() > deadline:
+                raise SearchTimeout(f"Searching for '{search.text}' took too long")
+            if should_stop is not None and should_stop():
+                return
+            slice_end = endpos
+            if not search.multiline and pos + cls.SCAN_SLICE_CHARS < endpos:
+                line_break = text.find("\n", pos + cls.SCAN_SLICE_CHARS, endpos)
+                slice_end = endpos if line_break == -1 else line_break
+            limit = slice_end
+            while pos < slice_end:
+                match = pattern.search(text, pos, limit)
+                if deadline is not None and time.monotonic() > deadline:
+                    raise SearchTimeout(f"Searching for '{search.text}' took too long")
+                if match is None:
+                    if limit == slice_end:
+                        break
+                    pos, limit = limit + 1, slice_end  # Nothing more on that line
+                    continue
+                start, end = match.span()
+                if not search.multiline:
+                    line_break = text.find("\n", start, end)
+                    if line_break != -1:
+                        limit = line_break
+                        continue
+                limit = slice_end
+                if end > start:
+                    yield start, end, match
+                pos = match.end() if match.end() > match.start() else match.start() + 1
+            pos = max(pos, slice_end)
+
+    @classmethod
+    def find_all(cls, text, query, case_sensitive=False, deadline=None):
+        """(start, end) of every non-overlapping match of query in text."""
+        search = as_search_query(query, case_sensitive)
+        return [(start, end) for start, end, _ in cls.iter_matches(text, search, deadline=deadline)]
 
     @staticmethod
-    def replace_all(text, query, replace_text, case_sensitive=False):
-        if not query:
-            return text, 0
+    def document_spans(text, spans):
+        """Convert spans in text to QTextDocument positions, which count characters outside the BMP twice."""
+        astral = [match.start() for match in _ASTRAL_CHARACTER.finditer(text)]
+        if not astral:
+            return spans
+        return [(start + bisect.bisect_left(astral, start), end + bisect.bisect_left(astral, end)) for start, end in spans]
+
+    @classmethod
+    def replace_all_in_editor(cls, editor, query, replace_text, case_sensitive=False, progress_callback=None):
+        """
+        Replace every match in the editor's document in place and return the number replaced.
+
+        Raises re.error for an invalid regex or replacement and SearchTimeout
+        when finding the matches takes longer than SCAN_TIMEOUT_SECONDS; the
+        document is unchanged in both cases. The search blocks the caller;
+        the main window runs find_replacements on a worker instead.
+        """
+        spans, replacements = cls.find_replacements(editor.toPlainText(), as_search_query(query, case_sensitive), replace_text)
+        return cls.apply_replacements(editor, spans, replacements, progress_callback)
+
+    @classmethod
+    def find_replacements(cls, text, query, replace_text, should_stop=None):
+        """
+        Document spans of the matches in text and their replacements, as two lists; None if should_stop() turned true.
+
+        Raises re.error and SearchTimeout like scan().
+        """
+        matches = cls.scan(text, query, replace_text=replace_text, should_stop=should_stop)
+        if matches is None:
+            return None
+        spans = cls.document_spans(text, [(start, end) for start, end, _ in matches])
+        return spans, [replacement for _, _, replacement in matches]
+
+    @classmethod
+    def apply_replacements(cls, editor, spans, replacements, progress_callback=None):
+        """
+        Replace the document spans with the replacements in place and return how many were replaced.
+
+        The spans are replaced from the last to the first, so earlier
+        positions stay valid, inside a single edit block: the document is laid
+        out once, the cursor stays where it was, and one undo restores the
+        text. progress_callback(done, total) is called every
+        PROGRESS_EVERY_REPLACEMENTS replacements.
+        """
+        from PyQt5.QtGui import QTextCursor
+
+        if not spans:
+            return 0
 
-        flags = 0 if case_sensitive else re.IGNORECASE
-        new_text, count = re.subn(re.escape(query), replace_text, text, flags=flags)
-        return new_text, count
+        cursor = QTextCursor(editor.document())
+        cursor.beginEditBlock()
+        try:
+            for done, ((start, end), replacement) in enumerate(zip(reversed(spans), reversed(replacements)), 1):
+                cursor.setPosition(start)
+                cursor.setPosition(end, QTextCursor.KeepAnchor)
+                cursor.insertText(replacement)
+                if progress_callback is not None and done % cls.PROGRESS_EVERY_REPLACEMENTS == 0:
+                    progress_callback(done, len(spans))
+        finally:
+            cursor.endEditBlock()
+        return len(spans)
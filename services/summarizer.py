@@ -1,26 +1,40 @@
+import threading
+
+from services import model_backends
+from services.model_registry import registry
+from services.lazy_imports import pipeline, transformers
+from services.result_cache import ResultCache
 
-try:
-    from transformers import pipeline
-except ImportError:
-    pipeline = None
 
 class SummarizerService:
     """
     A service to handle text summarization using a pre-trained model.
     Loads the model lazily on the first summarization request.
+
+    Long texts are summarized map-reduce style: the text is split into
+    overlapping windows that fit the model's token limit, the windows are
+    summarized as one batch, and the partial summaries are summarized again
+    until a single pass fits.
     """
-    _summarizer = None
+    result_cache = None  # Optional ResultCache shared with the UI layer
+
+    MODEL_NAME = "sshleifer/distilbart-cnn-6-6"
+    DEFAULT_MAX_INPUT_TOKENS = 1024
+    CHUNK_OVERLAP_TOKENS = 64
+    BATCH_SIZE = 4
+    MAX_REDUCE_ROUNDS = 4
+    # Streaming decodes greedily; its summaries differ from the beam-search ones and are cached apart.
+    STREAM_DECODING = "greedy"
 
     @classmethod
     def get_summarizer(cls):
-        """Lazily loads and returns the summarization pipeline."""
-        if cls._summarizer is None:
-            if pipeline is None:
-                from transformers import pipeline as _pipeline
-            else:
-                _pipeline = pipeline
-            cls._summarizer = _pipeline("summarization", model="sshleifer/distilbart-cnn-6-6")
-        return cls._summarizer
+        """Lazily loads and returns the summarization pipeline (shared through the model registry)."""
+        return registry.get("summarization", cls.MODEL_NAME, pipeline)
+
+    @classmethod
+    def cache_key(cls, text: str, length_option: str, decoding: str | None = None) -> str:
+        option = length_option if decoding is None else f"{length_option}\0{decoding}"
+        return ResultCache.make_key(text, model_backends.cache_model_id(cls.MODEL_NAME), option)
 
     @classmethod
     def summarize(cls, text: str, length_option: str = "Medium") -> str:
@@ -28,15 +42,223 @@ class SummarizerService:
         if not text.strip():
             raise ValueError("Text is empty.")
 
+        if cls.result_cache is None:
+            return cls._summarize_uncached(text, length_option)
+        cache_key = cls.cache_key(text, length_option)
+        return cls.result_cache.get_or_compute(cache_key, lambda: cls._summarize_uncached(text, length_option))
+
+    @classmethod
+    def _summarize_uncached(cls, text: str, length_option: str) -> str:
+        summarizer = cls.get_summarizer()
+        tokenizer = summarizer.tokenizer
+        max_tokens = cls.get_token_budget(tokenizer)
+
+        text = cls._reduce_to_single_window(summarizer, tokenizer, text, max_tokens)
+        # Reduce: the final pass uses the requested length option.
+        return cls._summarize_batch(summarizer, tokenizer, [text], length_option, max_tokens)[0]
+
+    @classmethod
+    def stream_summary(cls, text: str, length_option: str = "Medium", on_text=None, should_stop=None) -> str:
+        """
+        Summarize text, handing each newly generated piece of text to on_text as it is produced.
+
+        Generation ends early once should_stop() returns True; the summary generated
+        so far is returned but not cached. Long documents go through the usual
+        batched map passes first and only the final pass is streamed. Streaming
+        decodes greedily, since the streamer can't follow several beams.
+        """
+        if not text.strip():
+            raise ValueError("Text is empty.")
+
+        cache_key = cls.cache_key(text, length_option, cls.STREAM_DECODING)
+        cached = cls.result_cache.get(cache_key) if cls.result_cache is not None else None
+        if cached is not None:
+            if on_text is not None:
+                on_text(cached)
+            return cached
+
+        summarizer = cls.get_summarizer()
+        tokenizer = summarizer.tokenizer
+        max_tokens = cls.get_token_budget(tokenizer)
+        reduced_text = cls._reduce_to_single_window(summarizer, tokenizer, text, max_tokens)
+        min_len, max_len = cls._generation_lengths(tokenizer, [reduced_text], length_option, max_tokens)
+
+        streamer = transformers.TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        inputs = tokenizer(reduced_text, return_tensors="pt", truncation=True, max_length=max_tokens)
+        stopping_criteria = transformers.StoppingCriteriaList([lambda input_ids, scores, **kwargs: bool(should_stop and should_stop())])
+        errors = []
+
+        def generate():
+            try:
+                summarizer.model.generate(
+                    **inputs,
+                    streamer=streamer,
+                    max_length=max_len,
+                    min_length=min_len,
+                    num_beams=1,
+                    do_sample=False,
+                    stopping_criteria=stopping_criteria,
+                )
+            except Exception as e:
+                errors.append(e)
+                # Unblock the consuming loop below.
+                streamer.end()
+
+        generation = threading.Thread(target=generate, daemon=True)
+        generation.start()
+
+        pieces = []
+        for piece in streamer:
+            if not piece:
+                continue
+            pieces.append(piece)
+            if on_text is not None:
+                on_text(piece)
+        generation.join()
+        if errors:
+            raise errors[0]
+
+        summary = "".join(pieces).strip()
+        if cls.result_cache is not None and summary and not (should_stop and should_stop()):
+            cls.result_cache.put(cache_key, summary)
+        return summary
+
+    @classmethod
+    def _reduce_to_single_window(cls, summarizer, tokenizer, text: str, max_tokens: int) -> str:
+        """Map step: summarize each window, then feed the joined partial summaries back in until they fit into one window."""
+        for _ in range(cls.MAX_REDUCE_ROUNDS):
+            chunks = cls.chunk_text(text, tokenizer, max_tokens)
+            if len(chunks) <= 1:
+                break
+            partial_summaries = cls._summarize_batch(summarizer, tokenizer, chunks, "Short", max_tokens)
+            text = "\n".join(partial_summaries)
+        return text
+
+    @classmethod
+    def summarize_many(cls, texts: list[str], length_option: str = "Medium", batch_size: int | None = None, progress_callback=None) -> list[str]:
+        """
+        Summarize several documents and return their summaries in input order.
+
+        Documents that fit into one model window are sorted by length and run in
+        padded batches of batch_size; longer ones go through the map-reduce path
+        one by one. Blank documents get an empty summary. progress_callback, if
+        given, is called with (done, total) as documents complete.
+        """
+        batch_size = batch_size or cls.BATCH_SIZE
+        total = len(texts)
+        summaries = [""] * total
+        pending = []
+        for index, text in enumerate(texts):
+            if not text.strip():
+                continue
+            cached = cls.result_cache.get(cls.cache_key(text, length_option)) if cls.result_cache is not None else None
+            if cached is not None:
+                summaries[index] = cached
+            else:
+                pending.append(index)
+
+        done = total - len(pending)
+        if progress_callback is not None:
+            progress_callback(done, total)
+        if not pending:
+            return summaries
+
         summarizer = cls.get_summarizer()
-        text_word_count = len(text.split())
-        min_len, max_len = cls.get_summary_lengths(text_word_count)[length_option]
-        summary = summarizer(text, max_length=max_len, min_length=min_len, do_sample=False)
-        return summary[0]['summary_text']
+        tokenizer = summarizer.tokenizer
+        max_tokens = cls.get_token_budget(tokenizer)
+
+        single_window, multi_window = [], []
+        for index in pending:
+            token_count = len(tokenizer.encode(texts[index], add_special_tokens=False))
+            (single_window if token_count <= max_tokens else multi_window).append((token_count, index))
+        # Similar lengths in one batch keep padding small.
+        single_window.sort()
+
+        def store(index, summary):
+            summaries[index] = summary
+            if cls.result_cache is not None:
+                cls.result_cache.put(cls.cache_key(texts[index], length_option), summary)
+
+        for start in range(0, len(single_window), batch_size):
+            group = [index for _, index in single_window[start:start + batch_size]]
+            results = cls._summarize_batch(summarizer, tokenizer, [texts[i] for i in group], length_option, max_tokens, batch_size)
+            for index, summary in zip(group, results):
+                store(index, summary)
+            done += len(group)
+            if progress_callback is not None:
+                progress_callback(done, total)
+
+        for _, index in multi_window:
+            store(index, cls._summarize_uncached(texts[index], length_option))
+            done += 1
+            if progress_callback is not None:
+                progress_callback(done, total)
+
+        return summaries
+
+    @classmethod
+    def fits_single_pass(cls, text: str) -> bool:
+        """Whether text fits into one model input, so summarizing it needs no map-reduce rounds."""
+        tokenizer = cls.get_summarizer().tokenizer
+        return len(tokenizer.encode(text, add_special_tokens=False)) <= cls.get_token_budget(tokenizer)
+
+    @classmethod
+    def get_token_budget(cls, tokenizer) -> int:
+        """Return how many content tokens fit into one model input."""
+        max_length = getattr(tokenizer, "model_max_length", None)
+        # Tokenizers without a configured limit report a huge sentinel value.
+        if not isinstance(max_length, int) or max_length > 100_000:
+            max_length = cls.DEFAULT_MAX_INPUT_TOKENS
+        special_tokens = tokenizer.num_special_tokens_to_add() if hasattr(tokenizer, "num_special_tokens_to_add") else 2
+        return max(1, max_length - special_tokens)
+
+    @classmethod
+    def chunk_text(cls, text: str, tokenizer, max_tokens: int, overlap: int | None = None) -> list[str]:
+        """Split text into windows of at most max_tokens tokens that overlap by `overlap` tokens."""
+        if overlap is None:
+            overlap = cls.CHUNK_OVERLAP_TOKENS
+        overlap = min(overlap, max_tokens // 2)
+
+        token_ids = tokenizer.encode(text, add_special_tokens=False)
+        if len(token_ids) <= max_tokens:
+            return [text]
+
+        stride = max_tokens - overlap
+        chunks = []
+        for start in range(0, len(token_ids), stride):
+            window = token_ids[start:start + max_tokens]
+            chunks.append(tokenizer.decode(window, skip_special_tokens=True))
+            if start + max_tokens >= len(token_ids):
+                break
+        return chunks
+
+    @classmethod
+    def _summarize_batch(cls, summarizer, tokenizer, texts: list[str], length_option: str, max_tokens: int, batch_size: int | None = None) -> list[str]:
+        """Run one batched pipeline call over texts using lengths derived from their token counts."""
+        min_len, max_len = cls._generation_lengths(tokenizer, texts, length_option, max_tokens)
+        results = summarizer(
+            texts,
+            max_length=max_len,
+            min_length=min_len,
+            do_sample=False,
+            truncation=True,
+            batch_size=batch_size or cls.BATCH_SIZE,
+        )
+        return [result['summary_text'] for result in results]
+
+    @classmethod
+    def _generation_lengths(cls, tokenizer, texts: list[str], length_option: str, max_tokens: int) -> tuple[int, int]:
+        """Return (min_length, max_length) for generating summaries of texts."""
+        token_counts = [len(tokenizer.encode(t, add_special_tokens=False)) for t in texts]
+        min_len = cls.get_summary_lengths(min(token_counts))[length_option][0]
+        max_len = cls.get_summary_lengths(max(token_counts))[length_option][1]
+        max_len = min(max_len, max_tokens)
+        min_len = min(min_len, max_len - 1)
+        return min_len, max_len
 
     @staticmethod
     def get_summary_lengths(text_length: int) -> dict:
-        """Calculate min/max lengths for summary based on text length."""
+        """Calculate min/max lengths for summary based on text length (in tokens)."""
         return {
             "Short": (max(10, int(text_length * 0.1)), max(25, int(text_length * 0.2))),
             "Medium": (max(25, int(text_length * 0.2)), max(75, int(text_length * 0.5))),
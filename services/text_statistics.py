@@ -0,0 +1,46 @@
+class TextStatistics:
+    """
+    Word, character and line counts of a document, kept per block (line) and updated per edit.
+
+    replace_blocks takes the blocks an edit touched, so each keystroke costs
+    the length of the edited lines instead of a pass over the whole text.
+    Word counts match str.split() on the full text, since line breaks always
+    separate words. Characters exclude line breaks.
+    """
+    WORDS_PER_MINUTE = 200
+
+    def __init__(self, text: str = ""):
+        self.revision = 0
+        self.reset(text.split("\n"))
+
+    @property
+    def block_count(self) -> int:
+        return len(self._block_words)
+
+    def reset(self, blocks: list[str]) -> None:
+        """Recount every block, e.g. after the whole document was replaced."""
+        blocks = blocks or [""]
+        self._block_words = [len(block.split()) for block in blocks]
+        self._block_chars = [len(block) for block in blocks]
+        self.words = sum(self._block_words)
+        self.characters = sum(self._block_chars)
+        self.revision += 1
+
+    def replace_blocks(self, first: int, old_count: int, blocks: list[str]) -> None:
+        """Replace old_count blocks from first with the new text of the edited blocks."""
+        stop = first + old_count
+        if first < 0 or old_count < 0 or stop > self.block_count:
+            raise ValueError(f"Blocks {first}-{stop} are outside a document of {self.block_count} blocks")
+        words = [len(block.split()) for block in blocks]
+        chars = [len(block) for block in blocks]
+        self.words += sum(words) - sum(self._block_words[first:stop])
+        self.characters += sum(chars) - sum(self._block_chars[first:stop])
+        self._block_words[first:stop] = words
+        self._block_chars[first:stop] = chars
+        if not self._block_words:
+            self.reset([""])
+        self.revision += 1
+
+    def reading_minutes(self) -> int:
+        """Estimated reading time, rounded up to whole minutes."""
+        return -(-self.words // self.WORDS_PER_MINUTE)
@@ -0,0 +1,98 @@
+import hashlib
+import os
+import shutil
+
+
+class ThumbnailCache:
+    """
+    On-disk cache of encoded page thumbnails.
+
+    Each document gets a directory named by document_key(), a hash of the file
+    content, its modification time and the thumbnail width, holding one
+    "<page>.png" file per page. Editing or replacing a PDF therefore starts a
+    fresh set instead of showing stale pages. The whole cache is capped in
+    bytes; cached_pages() trims it by dropping the least recently opened
+    documents first.
+    """
+    DEFAULT_MAX_DISK_BYTES = 200 * 1024 * 1024
+    HASH_CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, cache_dir: str, max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def document_key(cls, file_path: str, width: int) -> str:
+        """Key for the thumbnails of a file at a thumbnail width; reads the whole file."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(cls.HASH_CHUNK_BYTES), b""):
+                digest.update(block)
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        digest.update(f"\0{mtime_ns}\0{width}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def cached_pages(self, document_key: str) -> list[int]:
+        """Pages with a cached thumbnail; also marks the document as recently used and trims the cache."""
+        directory = self._document_dir(document_key)
+        try:
+            names = os.listdir(directory)
+            os.utime(directory)
+        except OSError:
+            names = []
+        self._evict(keep=document_key)
+        return sorted(int(name[:-4]) for name in names if name.endswith(".png") and name[:-4].isdigit())
+
+    def get(self, document_key: str, page: int) -> bytes | None:
+        try:
+            with open(self._page_path(document_key, page), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, document_key: str, page: int, data: bytes) -> None:
+        path = self._page_path(document_key, page)
+        temp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            self._remove(temp_path)
+
+    def clear(self) -> None:
+        for name in os.listdir(self.cache_dir):
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+    def _document_dir(self, document_key):
+        return os.path.join(self.cache_dir, document_key)
+
+    def _page_path(self, document_key, page):
+        return os.path.join(self._document_dir(document_key), f"{page}.png")
+
+    def _evict(self, keep):
+        documents = []
+        for name in os.listdir(self.cache_dir):
+            directory = os.path.join(self.cache_dir, name)
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+                documents.append((os.stat(directory).st_mtime, name, size))
+            except OSError:
+                continue
+        total_size = sum(size for _, _, size in documents)
+        for _, name, size in sorted(documents):
+            if total_size <= self.max_disk_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            total_size -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,37 @@
+import unittest
+
+from services.buffer_pool import BufferPool
+
+
+class TestBufferPool(unittest.TestCase):
+    def test_released_buffers_are_reused_for_the_same_shape(self):
+        pool = BufferPool(max_idle_bytes=100)
+        first = pool.acquire((2, 2), 12, lambda: bytearray(12))
+        pool.release((2, 2), first, 12)
+
+        self.assertIs(pool.acquire((2, 2), 12, lambda: bytearray(12)), first)
+        self.assertEqual((pool.allocations, pool.reuses), (1, 1))
+        self.assertEqual(pool.idle_bytes, 0)
+
+    def test_other_shapes_get_new_buffers(self):
+        pool = BufferPool(max_idle_bytes=100)
+        pool.release((2, 2), bytearray(12), 12)
+
+        buffer = pool.acquire((4, 4), 48, lambda: bytearray(48))
+
+        self.assertEqual(len(buffer), 48)
+        self.assertEqual(pool.allocated_bytes, 48)
+        self.assertEqual(pool.idle_bytes, 12)
+
+    def test_idle_buffers_beyond_the_cap_are_dropped(self):
+        pool = BufferPool(max_idle_bytes=20)
+        pool.release("shape", bytearray(12), 12)
+        pool.release("shape", bytearray(12), 12)
+
+        self.assertEqual(pool.idle_bytes, 12)
+        pool.clear()
+        self.assertEqual(pool.idle_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
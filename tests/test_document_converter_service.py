@@ -0,0 +1,118 @@
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+
+from services.document_converter import DocumentConverter, LibreOfficeProcess
+
+# Stands in for LibreOffice: without --convert-to it is the listener, which locks
+# its profile and waits; with it, it writes "<name>.pdf" and logs the call.
+FAKE_LIBREOFFICE = textwrap.dedent(f"""\
+    #!{sys.executable}
+    import os, sys, time, urllib.parse, urllib.request
+    args = sys.argv[1:]
+    profile = urllib.request.url2pathname(urllib.parse.urlparse(args[0].split("=", 1)[1]).path)
+    if "--convert-to" not in args:
+        os.makedirs(profile, exist_ok=True)
+        open(os.path.join(profile, ".lock"), "w").close()
+        time.sleep(60)
+        sys.exit(0)
+    output_dir, source = args[args.index("--outdir") + 1], args[-1]
+    time.sleep(float(os.environ.get("FAKE_LIBREOFFICE_DELAY", "0")))
+    with open(os.environ["FAKE_LIBREOFFICE_LOG"], "a") as log:
+        log.write(source + "\\n")
+    name = os.path.splitext(os.path.basename(source))[0]
+    with open(os.path.join(output_dir, name + ".pdf"), "w") as f:
+        f.write("%PDF-1.4 " + open(source).read())
+""")
+
+
+@unittest.skipIf(os.name == "nt", "The LibreOffice stand-in is a shebang script.")
+class TestDocumentConverter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.executable = os.path.join(root, "fake-libreoffice")
+        with open(self.executable, "w") as f:
+            f.write(FAKE_LIBREOFFICE)
+        os.chmod(self.executable, os.stat(self.executable).st_mode | stat.S_IXUSR)
+        self.log_path = os.path.join(root, "conversions.log")
+        os.environ["FAKE_LIBREOFFICE_LOG"] = self.log_path
+        self.addCleanup(os.environ.pop, "FAKE_LIBREOFFICE_LOG", None)
+
+        self.source_path = os.path.join(root, "notes.odt")
+        with open(self.source_path, "w") as f:
+            f.write("first draft")
+        self.process = LibreOfficeProcess(self.executable)
+        self.converter = DocumentConverter(os.path.join(root, "cache"), self.process)
+
+    def tearDown(self):
+        self.converter.close()
+        self.temp_dir.cleanup()
+
+    def conversions(self):
+        if not os.path.exists(self.log_path):
+            return 0
+        with open(self.log_path) as f:
+            return len(f.readlines())
+
+    def test_converts_through_one_warm_process(self):
+        pdf_path = self.converter.convert_to_pdf(self.source_path)
+
+        self.assertEqual(os.path.basename(pdf_path), "notes.pdf")
+        with open(pdf_path) as f:
+            self.assertEqual(f.read(), "%PDF-1.4 first draft")
+        self.assertTrue(self.process.is_running)
+        listener = self.process._process
+        other_source = os.path.join(self.temp_dir.name, "other.odt")
+        with open(other_source, "w") as f:
+            f.write("other")
+        self.converter.convert_to_pdf(other_source)
+        self.assertIs(self.process._process, listener)
+
+    def test_unchanged_source_is_served_from_the_cache(self):
+        first = self.converter.convert_to_pdf(self.source_path)
+        second = DocumentConverter(self.converter.cache_dir, self.process).convert_to_pdf(self.source_path)
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.conversions(), 1)
+
+    def test_edited_source_is_converted_again(self):
+        self.converter.convert_to_pdf(self.source_path)
+        with open(self.source_path, "w") as f:
+            f.write("second draft")
+
+        with open(self.converter.convert_to_pdf(self.source_path)) as f:
+            self.assertEqual(f.read(), "%PDF-1.4 second draft")
+        self.assertEqual(self.conversions(), 2)
+
+    def test_cache_hits_do_not_wait_for_other_conversions(self):
+        cached = self.converter.convert_to_pdf(self.source_path)
+        other_path = os.path.join(self.temp_dir.name, "slides.odt")
+        with open(other_path, "w") as f:
+            f.write("slides")
+        os.environ["FAKE_LIBREOFFICE_DELAY"] = "1"
+        self.addCleanup(os.environ.pop, "FAKE_LIBREOFFICE_DELAY", None)
+        conversion = threading.Thread(target=self.converter.convert_to_pdf, args=(other_path,))
+        conversion.start()
+        time.sleep(0.2)
+
+        started = time.monotonic()
+        self.assertEqual(self.converter.convert_to_pdf(self.source_path), cached)
+        self.assertLess(time.monotonic() - started, 0.5)
+        conversion.join()
+        self.assertEqual(self.conversions(), 2)
+
+    def test_close_stops_the_process(self):
+        self.converter.convert_to_pdf(self.source_path)
+        self.converter.close()
+
+        self.assertFalse(self.process.is_running)
+
+
+if __name__ == "__main__":
+    unittest.main()
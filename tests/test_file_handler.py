@@ -88,3 +88,59 @@ class TestFileHandler(unittest.TestCase):
         handler.new_file(is_initial_tab=True)
 
         handler.create_new_tab.assert_not_called()
+
+    def test_finished_conversion_opens_converted_pdf_once(self):
+        dummy_tab = DummyTabWidget([])
+        main_window = DummyMainWindow(dummy_tab)
+        handler = FileHandler(main_window, file_service=MagicMock())
+        handler.create_new_pdf_tab = MagicMock()
+        handler.pending_conversions["/tmp/notes.odt"] = MagicMock()
+
+        handler.on_conversion_finished("/tmp/notes.odt", "/cache/key/notes.pdf")
+
+        handler.create_new_pdf_tab.assert_called_once_with("/cache/key/notes.pdf", is_temporary=True)
+        self.assertEqual(handler.pending_conversions, {})
+
+    def test_finished_load_fills_placeholder_tab(self):
+        dummy_tab = DummyTabWidget([])
+        main_window = DummyMainWindow(dummy_tab)
+        handler = FileHandler(main_window, file_service=MagicMock())
+        editor = MagicMock()
+        worker = MagicMock()
+        handler.pending_loads[worker] = editor
+
+        handler.on_load_finished(worker, "/tmp/big.log", "content")
+
+        editor.setText.assert_called_once_with("content")
+        editor.setReadOnly.assert_called_once_with(False)
+        editor.document().setModified.assert_called_once_with(False)
+        main_window.status_bar.hide_file_progress.assert_called_once()
+        self.assertEqual(handler.pending_loads, {})
+
+    def test_stale_cancelled_load_keeps_the_reopened_tab(self):
+        dummy_tab = DummyTabWidget([])
+        main_window = DummyMainWindow(dummy_tab)
+        handler = FileHandler(main_window, file_service=MagicMock())
+        handler.close_tab = MagicMock()
+        reopened = MagicMock()
+        handler.pending_loads[reopened] = DummyEditor("/tmp/big.log")
+
+        handler.on_load_cancelled(MagicMock(), "/tmp/big.log")  # The load stopped when the first tab closed
+
+        handler.close_tab.assert_not_called()
+        self.assertIn(reopened, handler.pending_loads)
+
+    def test_saving_a_loading_tab_is_refused(self):
+        editor = DummyEditor("/tmp/big.log")
+        dummy_tab = DummyTabWidget([editor])
+        dummy_tab.currentIndex = lambda: 0
+        main_window = DummyMainWindow(dummy_tab)
+        file_service = MagicMock()
+        handler = FileHandler(main_window, file_service=file_service)
+        handler.pending_loads[MagicMock()] = editor
+
+        self.assertFalse(handler.save_file(0))
+        self.assertFalse(handler.save_file_as(0))
+
+        file_service.save_text_file.assert_not_called()
+        main_window.status_bar.showMessage.assert_called_with("Wait for big.log to finish loading before saving.", 5000)
@@ -1,8 +1,16 @@
+import multiprocessing
 import os
 import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
 
-from services.file_service import FileService
+from services.file_service import FileService, ReadCancelled, PDF_ENGINE_PYPDF
+
+
+def fake_extract_pdf_pages(file_path, engine, start, stop):
+    # Module level, so the spawned worker processes can unpickle it; they don't see patches.
+    return [f"page {index}" for index in range(start, stop)]
 
 
 class TestFileService(unittest.TestCase):
@@ -32,3 +40,84 @@ class TestFileService(unittest.TestCase):
         extensions = self.service.supported_text_extensions()
         self.assertIn(".txt", extensions)
         self.assertIn(".md", extensions)
+
+    def test_pdf_page_ranges_cover_every_page(self):
+        self.assertEqual(FileService.pdf_page_ranges(40, 16), [(0, 16), (16, 32), (32, 40)])
+        self.assertEqual(FileService.pdf_page_ranges(0, 16), [])
+
+    def test_iter_pdf_pages_extracts_ranges_lazily_in_order(self):
+        extracted = []
+
+        def fake_extract(file_path, engine, start, stop):
+            extracted.append((start, stop))
+            return [f"page {index}" for index in range(start, stop)]
+
+        with patch("services.file_service._pdf_page_count", return_value=20), \
+                patch("services.file_service._extract_pdf_pages", side_effect=fake_extract):
+            pages = self.service.iter_pdf_pages("book.pdf", PDF_ENGINE_PYPDF, workers=1)
+            self.assertEqual(next(pages), "page 0")
+            self.assertEqual(extracted, [(0, 16)])
+            self.assertEqual(list(pages)[-1], "page 19")
+            self.assertEqual(extracted, [(0, 16), (16, 20)])
+
+            self.assertEqual(self.service.read_pdf("book.pdf", PDF_ENGINE_PYPDF).count("\n"), 19)
+
+    def test_iter_pdf_pages_extracts_long_documents_in_worker_processes(self):
+        page_count = 10 * FileService.PDF_PAGES_PER_TASK
+        self.assertGreater(page_count, FileService.PDF_PARALLEL_MIN_PAGES)
+        submitted = []
+        submit = ProcessPoolExecutor.submit
+
+        def record_submit(executor, fn, *args):
+            submitted.append(args[2:])
+            return submit(executor, fn, *args)
+
+        with patch("services.file_service._pdf_page_count", return_value=page_count), \
+                patch("services.file_service._extract_pdf_pages", fake_extract_pdf_pages), \
+                patch.object(ProcessPoolExecutor, "submit", record_submit):
+            before = set(multiprocessing.active_children())
+            self.assertEqual(list(self.service.iter_pdf_pages("book.pdf", PDF_ENGINE_PYPDF, workers=2)),
+                             [f"page {index}" for index in range(page_count)])
+            self.assertEqual(submitted, FileService.pdf_page_ranges(page_count, FileService.PDF_PAGES_PER_TASK))
+
+            submitted.clear()
+            pages = self.service.iter_pdf_pages("book.pdf", PDF_ENGINE_PYPDF, workers=2)
+            self.assertEqual(next(pages), "page 0")
+            self.assertEqual(len(submitted), 2 * 2 + 1)  # Read-ahead of two ranges per worker, topped up once
+            self.assertTrue(set(multiprocessing.active_children()) - before)
+            pages.close()
+
+            self.assertEqual(set(multiprocessing.active_children()) - before, set())
+
+    def test_read_text_file_reports_progress_and_can_be_cancelled(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "big.log")
+            self.service.save_text_file(file_path, "line\n" * 100)
+            self.service.TEXT_CHUNK_CHARS = 128
+            progress = []
+
+            content = self.service.read_file(file_path, progress_callback=lambda done, total: progress.append((done, total)))
+
+            self.assertEqual(content, "line\n" * 100)
+            self.assertEqual(progress[-1], (500, 500))
+            self.assertEqual(len(progress), 4)
+
+            def cancel(done, total):
+                raise ReadCancelled()
+
+            with self.assertRaises(ReadCancelled):
+                self.service.read_file(file_path, progress_callback=cancel)
+
+    def test_only_big_plain_text_files_are_large(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.service.LARGE_TEXT_FILE_BYTES = 100
+            log_path = os.path.join(temp_dir, "server.log")
+            notes_path = os.path.join(temp_dir, "notes.md")
+            document_path = os.path.join(temp_dir, "book.docx")
+            self.service.save_text_file(log_path, "x" * 100)
+            self.service.save_text_file(notes_path, "x" * 99)
+            self.service.save_text_file(document_path, "x" * 100)
+
+            self.assertTrue(self.service.is_large_text_file(log_path))
+            self.assertFalse(self.service.is_large_text_file(notes_path))
+            self.assertFalse(self.service.is_large_text_file(document_path))
@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from services.incremental_analysis import IncrementalAnalyzer, IncrementalDocument
+from services.key_points_extractor import KeyPointsService
+from services.result_cache import ResultCache
+
+
+class EditableText:
+    """Plays the role of the QTextDocument an IncrementalDocument follows."""
+
+    def __init__(self, text=""):
+        self.text = text
+
+    def replace(self, document, position, removed, inserted):
+        self.text = self.text[:position] + inserted + self.text[position + removed:]
+        document.apply_change(position, removed, len(inserted), len(self.text), lambda start, end: self.text[start:end])
+
+
+def paragraphs(count, size=40):
+    return "".join(f"Paragraph {i} " + "x" * size + "\n\n" for i in range(count))
+
+
+class TestIncrementalDocument(unittest.TestCase):
+    def setUp(self):
+        self.max_chars = IncrementalDocument.MAX_CHUNK_CHARS
+        IncrementalDocument.MAX_CHUNK_CHARS = 120
+
+    def tearDown(self):
+        IncrementalDocument.MAX_CHUNK_CHARS = self.max_chars
+
+    def test_split_groups_whole_paragraphs_and_keeps_text(self):
+        text = paragraphs(6)
+        chunks = IncrementalDocument.split(text)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunk.text for chunk in chunks), text)
+        self.assertTrue(all(chunk.text.endswith("\n\n") for chunk in chunks))
+
+    def test_edit_replaces_only_the_touched_chunk(self):
+        source = EditableText(paragraphs(6))
+        document = IncrementalDocument(source.text)
+        before = list(document.chunks)
+
+        source.replace(document, source.text.index("Paragraph 3") + 10, 1, "three")
+
+        self.assertEqual(document.text(), source.text)
+        changed = [chunk for chunk in document.chunks if chunk not in before]
+        self.assertEqual(len(changed), 1)
+        self.assertIn("Paragraph three", changed[0].text)
+        self.assertEqual(document.revision, 1)
+
+    def test_joining_paragraphs_across_chunks_stays_consistent(self):
+        source = EditableText(paragraphs(6))
+        document = IncrementalDocument(source.text)
+        boundary = len(document.chunks[0].text)
+
+        source.replace(document, boundary - 2, 2, " ")
+
+        self.assertEqual(document.text(), source.text)
+        self.assertTrue(all(chunk.text.endswith("\n\n") for chunk in document.chunks[:-1]))
+
+    def test_inconsistent_report_is_clamped_to_document_length(self):
+        source = EditableText("")
+        document = IncrementalDocument()
+
+        # QTextDocument reports one extra character when text is set on an empty document.
+        source.text = paragraphs(3)
+        document.apply_change(0, 1, len(source.text) + 1, len(source.text), lambda start, end: source.text[start:end])
+
+        self.assertEqual(document.text(), source.text)
+
+
+class TestIncrementalAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.max_chars = IncrementalDocument.MAX_CHUNK_CHARS
+        IncrementalDocument.MAX_CHUNK_CHARS = 120
+
+    def tearDown(self):
+        IncrementalDocument.MAX_CHUNK_CHARS = self.max_chars
+
+    def test_key_points_only_analyzes_changed_chunks(self):
+        source = EditableText(paragraphs(6))
+        document = IncrementalDocument(source.text)
+        engine = MagicMock()
+        engine.extract_phrases_many.side_effect = lambda texts: [
+            {text.split()[1]: {"text": text.split()[1], "max": 0.5, "total": 0.5, "count": 1}} for text in texts
+        ]
+
+        IncrementalAnalyzer.key_points(list(document.chunks), engine)
+        source.replace(document, source.text.index("Paragraph 4"), 0, "New ")
+        result = IncrementalAnalyzer.key_points(list(document.chunks), engine)
+
+        first_call, second_call = engine.extract_phrases_many.call_args_list
+        self.assertEqual(len(first_call.args[0]), len(document.chunks))
+        self.assertEqual(len(second_call.args[0]), 1)
+        self.assertIn("New Paragraph 4", second_call.args[0][0])
+        self.assertIn("- 0 (Score: 0.50)", result)
+
+    def test_key_points_of_a_reopened_note_come_from_the_result_cache(self):
+        text = paragraphs(6)
+        engine = MagicMock()
+        engine.extract_phrases_many.side_effect = lambda texts: [
+            {text.split()[1]: {"text": text.split()[1], "max": 0.5, "total": 0.5, "count": 1}} for text in texts
+        ]
+        KeyPointsService.result_cache = ResultCache()
+        self.addCleanup(setattr, KeyPointsService, "result_cache", None)
+
+        first = IncrementalAnalyzer.key_points(list(IncrementalDocument(text).chunks), engine)
+        second = IncrementalAnalyzer.key_points(list(IncrementalDocument(text).chunks), engine)
+
+        engine.extract_phrases_many.assert_called_once()
+        self.assertEqual(first, second)
+
+    @patch("services.incremental_analysis.SummarizerService")
+    def test_summary_input_joins_chunk_summaries(self, mock_service):
+        document = IncrementalDocument(paragraphs(6))
+        mock_service.fits_single_pass.return_value = False
+        mock_service.summarize_many.side_effect = lambda texts, length_option, batch_size: [f"s{i}" for i in range(len(texts))]
+
+        summary_input = IncrementalAnalyzer.summary_input(list(document.chunks))
+        again = IncrementalAnalyzer.summary_input(list(document.chunks))
+
+        self.assertEqual(summary_input, again)
+        mock_service.summarize_many.assert_called_once()
+        self.assertEqual(mock_service.summarize_many.call_args.args[1], "Short")
+
+    def test_text_within_the_token_budget_is_summarized_directly(self):
+        document = IncrementalDocument(paragraphs(6))
+        engine = MagicMock()
+        engine.fits_single_pass.return_value = True
+
+        self.assertEqual(IncrementalAnalyzer.summary_input(list(document.chunks), engine), document.text())
+        engine.fits_single_pass.assert_called_once_with(document.text())
+        engine.summarize_many.assert_not_called()
+
+    def test_single_chunk_is_summarized_directly(self):
+        document = IncrementalDocument("One short paragraph.")
+
+        self.assertEqual(IncrementalAnalyzer.summary_input(list(document.chunks)), "One short paragraph.")
+
+
+if __name__ == "__main__":
+    unittest.main()
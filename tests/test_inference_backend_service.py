@@ -0,0 +1,103 @@
+from concurrent.futures import Future
+import queue
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from services.inference_backend import InferenceBackend, handle_request
+from services.result_cache import ResultCache
+
+
+class TestHandleRequest(unittest.TestCase):
+    def test_ping_returns_pong(self):
+        self.assertEqual(handle_request({"task": "ping"}), {"ok": True, "result": "pong"})
+
+    def test_unknown_task_returns_error(self):
+        response = handle_request({"task": "translate"})
+
+        self.assertFalse(response["ok"])
+        self.assertIn("translate", response["error"])
+
+    @patch("services.summarizer.SummarizerService.summarize", return_value="summary")
+    def test_summarize_dispatches_to_service(self, summarize):
+        response = handle_request({"task": "summarize", "text": "text", "length_option": "Long"})
+
+        self.assertEqual(response, {"ok": True, "result": "summary"})
+        summarize.assert_called_once_with("text", "Long")
+
+    @patch("services.key_points_extractor.KeyPointsService.extract_key_points", side_effect=ValueError("Text is empty."))
+    def test_service_errors_are_returned_not_raised(self, _):
+        response = handle_request({"task": "key_points", "text": " "})
+
+        self.assertEqual(response, {"ok": False, "error": "Text is empty."})
+
+    def test_stream_summary_forwards_pieces_and_terminates_queue(self):
+        def fake_stream(text, length_option, on_text, should_stop):
+            on_text("Hello")
+            on_text(" world")
+            return "Hello world"
+
+        pieces = queue.Queue()
+        with patch("services.summarizer.SummarizerService.stream_summary", side_effect=fake_stream):
+            response = handle_request({"task": "stream_summary", "text": "text", "queue": pieces, "stop_event": threading.Event()})
+
+        self.assertEqual(response, {"ok": True, "result": "Hello world"})
+        self.assertEqual([pieces.get_nowait() for _ in range(3)], ["Hello", " world", None])
+
+
+class TestInferenceBackend(unittest.TestCase):
+    def test_cache_hit_does_not_dispatch(self):
+        backend = InferenceBackend(max_workers=1, result_cache=ResultCache())
+        backend.submit = MagicMock(return_value="summary")
+
+        first = backend.summarize("text", "Short")
+        second = backend.summarize("text", "Short")
+
+        self.assertEqual(first, second)
+        backend.submit.assert_called_once()
+
+    def test_requests_round_trip_through_worker_process(self):
+        backend = InferenceBackend(max_workers=1)
+        self.addCleanup(backend.shutdown)
+
+        self.assertEqual(backend.submit({"task": "ping"}, timeout=60), "pong")
+        with self.assertRaises(RuntimeError):
+            backend.submit({"task": "translate"}, timeout=60)
+
+    def test_unanswered_request_times_out_and_restarts_the_pool(self):
+        backend = InferenceBackend(max_workers=1, timeout=0.1)
+        executor = MagicMock()
+        executor.submit.return_value = Future()  # Never completes, like a hung worker
+        backend._executor = executor
+
+        with self.assertRaises(TimeoutError):
+            backend.summarize("text", "Short")
+
+        executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        self.assertIsNone(backend._executor)
+
+    def test_large_batch_gets_time_for_every_text(self):
+        backend = InferenceBackend(max_workers=1, timeout=0.05)
+        executor = MagicMock()
+        future = Future()
+        executor.submit.return_value = future
+        backend._executor = executor
+        texts = [f"Document {i} " + "x" * InferenceBackend.WORK_UNIT_CHARS for i in range(20)]
+        timer = threading.Timer(0.3, future.set_result, [{"ok": True, "result": ["summary"] * len(texts)}])
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        summaries = backend.summarize_many(texts, "Short")
+
+        self.assertEqual(summaries, ["summary"] * len(texts))
+        executor.shutdown.assert_not_called()
+        self.assertEqual(backend.request_timeout({"texts": texts}), 0.05 * 2 * len(texts))
+
+    def test_restart_replaces_worker_pool(self):
+        backend = InferenceBackend(max_workers=1)
+        self.addCleanup(backend.shutdown)
+        backend.submit({"task": "ping"}, timeout=60)
+
+        backend.restart()
+
+        self.assertEqual(backend.submit({"task": "ping"}, timeout=60), "pong")
@@ -0,0 +1,97 @@
+import threading
+import unittest
+
+from services.job_scheduler import JobPriority, JobScheduler
+
+
+class TestJobScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = JobScheduler(max_workers=1)
+        self.addCleanup(self.scheduler.shutdown)
+
+    def block_worker(self):
+        """Occupy the single worker thread until the returned event is set."""
+        started, release = threading.Event(), threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait(5)
+
+        self.scheduler.submit("block", None, None, blocker)
+        started.wait(5)
+        return release
+
+    def test_finished_callback_receives_result(self):
+        done = threading.Event()
+        results = []
+
+        self.scheduler.submit("summarize", 1, "a", lambda: "summary", on_finished=lambda r: (results.append(r), done.set()))
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(results, ["summary"])
+
+    def test_error_callback_receives_message(self):
+        done = threading.Event()
+        errors = []
+
+        def fail():
+            raise ValueError("boom")
+
+        self.scheduler.submit("summarize", 1, "a", fail, on_error=lambda e: (errors.append(e), done.set()))
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(errors, ["boom"])
+
+    def test_duplicate_requests_are_coalesced(self):
+        release = self.block_worker()
+        calls = []
+        done = threading.Event()
+        results = []
+
+        first = self.scheduler.submit("summarize", 1, "same", lambda: calls.append(1) or "r", on_finished=results.append)
+        second = self.scheduler.submit("summarize", 1, "same", lambda: calls.append(2) or "r", on_finished=lambda r: (results.append(r), done.set()))
+        release.set()
+
+        self.assertIs(first, second)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ["r", "r"])
+
+    def test_new_request_supersedes_older_one_for_same_document(self):
+        release = self.block_worker()
+        cancelled = []
+        done = threading.Event()
+
+        old = self.scheduler.submit("summarize", 1, "old", lambda: "old", on_finished=lambda r: self.fail("superseded job ran"), on_cancelled=lambda: cancelled.append("old"))
+        self.scheduler.submit("summarize", 1, "new", lambda: "new", on_finished=lambda r: done.set())
+        release.set()
+
+        self.assertTrue(old.cancelled)
+        self.assertEqual(cancelled, ["old"])
+        self.assertTrue(done.wait(5))
+
+    def test_interactive_jobs_run_before_background_jobs(self):
+        release = self.block_worker()
+        order = []
+        done = threading.Event()
+
+        self.scheduler.submit("preload", None, None, lambda: order.append("background"), JobPriority.BACKGROUND, on_finished=lambda r: done.set())
+        self.scheduler.submit("summarize", 1, "a", lambda: order.append("interactive"), JobPriority.INTERACTIVE)
+        release.set()
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(order, ["interactive", "background"])
+
+    def test_cancel_matching_and_stats(self):
+        release = self.block_worker()
+        self.scheduler.submit("summarize", 1, "a", lambda: "a")
+        self.scheduler.submit("summarize", 2, "b", lambda: "b")
+
+        self.assertEqual(self.scheduler.stats()["queued"], 2)
+        self.assertEqual(self.scheduler.stats()["running"], 1)
+
+        cancelled = self.scheduler.cancel(lambda job: job.document_id == 1)
+
+        self.assertEqual(cancelled, 1)
+        self.assertEqual(self.scheduler.stats()["queued"], 1)
+        release.set()
@@ -2,24 +2,39 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 from services.key_points_extractor import KeyPointsService
+from services.model_registry import registry
+from services.result_cache import ResultCache
+from tests.test_summarizer_service import FakeTokenizer
+
+
+def tag(text, phrase, scores):
+    """Token-classification output tagging each word of phrase inside text."""
+    tokens, offset = [], text.index(phrase)
+    for position, (word, score) in enumerate(zip(phrase.split(), scores)):
+        start = text.index(word, offset)
+        offset = start + len(word)
+        tokens.append({"word": word, "score": score, "entity": "I-KEY" if position else "B-KEY", "start": start, "end": offset})
+    return tokens
 
 
 class TestKeyPointsService(unittest.TestCase):
     def tearDown(self):
-        KeyPointsService._extractor = None
+        registry.clear()
+        KeyPointsService.result_cache = None
 
     @patch("services.key_points_extractor.pipeline")
     def test_extract_key_points_returns_formatted_list(self, mock_pipeline):
         fake_extractor = MagicMock()
+        fake_extractor.tokenizer = FakeTokenizer()
         fake_extractor.return_value = [
-            {"word": "important", "score": 0.95, "entity": "B-KEY"},
-            {"word": "other", "score": 0.50, "entity": "I-KEY"},
+            {"word": "important", "score": 0.90, "entity": "B-KEY"},
+            {"word": "other", "score": 0.70, "entity": "I-KEY"},
         ]
         mock_pipeline.return_value = fake_extractor
 
         result = KeyPointsService.extract_key_points("Some text with a key point.")
 
-        self.assertEqual(result, "- important (Score: 0.95)")
+        self.assertEqual(result, "- important other (Score: 0.80)")
         mock_pipeline.assert_called_once_with("token-classification", model="ml6team/keyphrase-extraction-kbir-inspec")
 
     def test_extract_key_points_empty_text_raises_value_error(self):
@@ -29,6 +44,7 @@ class TestKeyPointsService(unittest.TestCase):
     @patch("services.key_points_extractor.pipeline")
     def test_extract_key_points_returns_no_points_message(self, mock_pipeline):
         fake_extractor = MagicMock()
+        fake_extractor.tokenizer = FakeTokenizer()
         fake_extractor.return_value = [
             {"word": "nothing", "score": 0.1, "entity": "O"}
         ]
@@ -37,3 +53,73 @@ class TestKeyPointsService(unittest.TestCase):
         result = KeyPointsService.extract_key_points("This is a sample sentence.")
 
         self.assertEqual(result, "No key points found.")
+
+    @patch("services.key_points_extractor.pipeline")
+    def test_extract_key_points_uses_result_cache(self, mock_pipeline):
+        fake_extractor = MagicMock()
+        fake_extractor.tokenizer = FakeTokenizer()
+        fake_extractor.return_value = [{"word": "cache", "score": 0.9, "entity": "B-KEY"}]
+        mock_pipeline.return_value = fake_extractor
+        KeyPointsService.result_cache = ResultCache()
+
+        first = KeyPointsService.extract_key_points("Text about a cache.")
+        second = KeyPointsService.extract_key_points("Text about a cache.")
+
+        self.assertEqual(first, second)
+        fake_extractor.assert_called_once()
+
+    @patch("services.key_points_extractor.pipeline")
+    def test_long_text_is_chunked_batched_and_deduplicated(self, mock_pipeline):
+        text = "neural networks learn features and neural networks generalize well"
+        fake_extractor = MagicMock()
+        fake_extractor.tokenizer = FakeTokenizer(model_max_length=7)
+        fake_extractor.side_effect = lambda chunks, **kwargs: [
+            (tag(chunk, "neural networks", [0.9, 0.7]) if "neural networks" in chunk else [])
+            + (tag(chunk, "features", [0.6]) if "features" in chunk else [])
+            for chunk in chunks
+        ]
+        mock_pipeline.return_value = fake_extractor
+
+        result = KeyPointsService.extract_key_points(text)
+
+        chunks = fake_extractor.call_args.args[0]
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(fake_extractor.call_count, 1)
+        self.assertEqual(fake_extractor.call_args.kwargs["batch_size"], KeyPointsService.BATCH_SIZE)
+        self.assertEqual(result, "- neural networks (Score: 0.80)\n- features (Score: 0.60)")
+
+    def test_aggregate_spans_widens_partial_words_and_joins_subwords(self):
+        chunk = "deep reinforcement learning"
+        tokens = [
+            {"word": "Ġdeep", "score": 0.8, "entity": "B-KEY", "start": 0, "end": 4},
+            {"word": "Ġreinfor", "score": 0.6, "entity": "I-KEY", "start": 5, "end": 12},
+            {"word": "cement", "score": 0.4, "entity": "B-KEY", "start": 12, "end": 18},
+            {"word": "Ġlearning", "score": 0.1, "entity": "O", "start": 19, "end": 27},
+        ]
+
+        spans = KeyPointsService.aggregate_spans(chunk, tokens)
+
+        self.assertEqual([text for text, _ in spans], ["deep reinforcement"])
+        self.assertAlmostEqual(spans[0][1], 0.6)
+
+    def test_aggregate_spans_splits_phrases_at_dropped_tokens(self):
+        chunk = "neural and networks"
+        # The "O" token for "and" (index 2) was dropped by the pipeline.
+        tokens = [
+            {"word": "Ġneural", "score": 0.8, "entity": "B-KEY", "index": 1, "start": 0, "end": 6},
+            {"word": "Ġnetworks", "score": 0.6, "entity": "I-KEY", "index": 3, "start": 11, "end": 19},
+        ]
+
+        spans = KeyPointsService.aggregate_spans(chunk, tokens)
+
+        self.assertEqual(spans, [("neural", 0.8), ("networks", 0.6)])
+
+    def test_rank_phrases_limits_and_orders_by_score_mode(self):
+        phrases = {
+            "a": {"text": "a", "max": 0.9, "mean": 0.5, "count": 3},
+            "b": {"text": "b", "max": 0.8, "mean": 0.8, "count": 1},
+        }
+
+        self.assertEqual([p["text"] for p in KeyPointsService.rank_phrases(phrases)], ["a", "b"])
+        with patch.object(KeyPointsService, "SCORE_MODE", "mean"):
+            self.assertEqual([p["text"] for p in KeyPointsService.rank_phrases(phrases)], ["b", "a"])
@@ -1,9 +1,18 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
 try:
     from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QTextCursor
     from view.main_window import MainWindow
+    from view.editor_area import EditorArea
+    from view.large_file_editor import LargeFileEditor
+    from view.ai_workers import BatchSummarizationWorker
+    from services.job_scheduler import Job, JobPriority
+    from services.match_index import MatchIndex
+    from services.search_service import SearchQuery
     PYQT_AVAILABLE = True
 except ImportError:
     MainWindow = None
@@ -45,6 +54,45 @@ class TestMainWindow(unittest.TestCase):
         event.ignore.assert_called_once()
         event.accept.assert_not_called()
 
+    def test_models_are_not_preloaded_without_transformers(self):
+        self.window.job_scheduler = MagicMock()
+        patch.stopall()  # Restores the preload_models that setUp patched out
+
+        with patch("view.main_window.transformers.is_available", return_value=False):
+            self.window.preload_models()
+
+        self.window.job_scheduler.submit.assert_not_called()
+
+    def test_switching_tabs_keeps_a_queued_batch_summarization(self):
+        scheduler = MagicMock()
+        self.window.job_scheduler = scheduler
+        self.window.run_batch_summarization([("a.txt", "a.txt", "Cells divide."), ("b.md", "b.md", "Atoms bond.")])
+        kind, document_id, request_key, func, priority = scheduler.submit.call_args.args
+        batch_job = Job(kind, document_id, request_key, func, priority)
+
+        self.window.on_tab_changed(0)
+
+        should_cancel = scheduler.cancel.call_args.args[0]
+        self.assertFalse(should_cancel(batch_job))
+        self.assertTrue(should_cancel(Job("summarize", object(), None, None, JobPriority.INTERACTIVE)))
+
+    def test_batch_summaries_keep_the_source_extension(self):
+        self.assertEqual(BatchSummarizationWorker.summary_path_for("notes/a.md"), "notes/a.md.summary.txt")
+        self.assertNotEqual(BatchSummarizationWorker.summary_path_for("a.txt"), BatchSummarizationWorker.summary_path_for("a.md"))
+
+    def test_font_size_applies_to_large_file_tabs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "server.log")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write("line\n" * 10)
+            editor = LargeFileEditor(file_path)
+            self.window.tab_widget.addTab(editor, "server.log")
+
+            self.window.apply_editor_font_size(19)
+
+            self.assertEqual(editor.view.font().pointSize(), 19)
+            editor.close_file()
+
     def test_find_next_delegates_to_search_service(self):
         editor = MagicMock()
         self.window.current_editor = MagicMock(return_value=editor)
@@ -54,19 +102,119 @@ class TestMainWindow(unittest.TestCase):
         with patch("view.main_window.SearchService.find_next", return_value=True) as find_next:
             self.window.find_next()
 
-        find_next.assert_called_once_with(editor, "test", False)
+        find_next.assert_called_once_with(editor, SearchQuery("test"))
 
-    def test_replace_all_updates_editor_text_when_matches_found(self):
-        editor = MagicMock()
-        editor.toPlainText.return_value = "hello hello"
+    def test_find_next_moves_through_the_match_index(self):
+        editor = EditorArea()
+        editor.setPlainText("cell wall, cell membrane, cell nucleus")
+        self.window.current_editor = MagicMock(return_value=editor)
+        self.window.find_bar.isVisible = MagicMock(return_value=True)
+        self.window.find_input.setText("cell")
+        editor.set_match_index(MatchIndex.build(editor.toPlainText(), "cell"))
+
+        with patch("view.main_window.SearchService.find_next") as find_next:
+            self.window.find_next()
+            self.window.find_next()
+
+        find_next.assert_not_called()
+        self.assertEqual(editor.textCursor().selectionStart(), 11)
+        self.assertEqual(self.window.find_count_label.text(), "2 of 3")
+        self.window.find_previous()
+        self.window.find_previous()
+        self.assertEqual(self.window.find_count_label.text(), "3 of 3")
+
+    def test_invalid_regex_is_reported_instead_of_scanned(self):
+        editor = EditorArea()
+        self.window.current_editor = MagicMock(return_value=editor)
+        self.window.find_bar.isVisible = MagicMock(return_value=True)
+        self.window.find_regex_checkbox.setChecked(True)
+        self.window.find_input.setText("(unclosed")
+        self.window.thread_pool = MagicMock()
+
+        self.window.rebuild_match_index()
+
+        self.window.thread_pool.start.assert_not_called()
+        self.assertTrue(self.window.find_count_label.text().startswith("Invalid pattern"))
+
+    def test_find_next_searches_pdf_viewer_tab(self):
+        viewer = MagicMock(is_pdf_viewer=True, search_hit=(4, 0))
+        viewer.find_text.return_value = True
+        self.window.tab_widget.currentWidget = MagicMock(return_value=viewer)
+        self.window.find_input.setText("photosynthesis")
+
+        with patch("view.main_window.SearchService.find_next") as find_next:
+            self.window.find_next()
+
+        viewer.find_text.assert_called_once_with("photosynthesis", False)
+        find_next.assert_not_called()
+
+    def test_replace_all_edits_in_place_once_the_matches_are_found(self):
+        editor = EditorArea()
+        editor.setPlainText("hello world, Hello")
         self.window.current_editor = MagicMock(return_value=editor)
+        self.window.tab_widget.indexOf = MagicMock(return_value=0)
         self.window.find_input.setText("hello")
         self.window.replace_input.setText("hi")
-        self.window.find_case_sensitive_checkbox.isChecked = MagicMock(return_value=False)
+        self.window.thread_pool = MagicMock()
+
+        self.window.replace_all()
+        worker = self.window.thread_pool.start.call_args.args[0]
+        self.assertEqual(editor.toPlainText(), "hello world, Hello")  # Nothing is scanned on the GUI thread
+        worker.run()
+
+        self.assertEqual(editor.toPlainText(), "hi world, hi")
+        editor.undo()
+        self.assertEqual(editor.toPlainText(), "hello world, Hello")
+
+    def test_replace_all_is_dropped_when_the_text_changed_while_searching(self):
+        editor = EditorArea()
+        editor.setPlainText("hello")
+        self.window.current_editor = MagicMock(return_value=editor)
+        self.window.tab_widget.indexOf = MagicMock(return_value=0)
+        self.window.find_input.setText("hello")
+        self.window.thread_pool = MagicMock()
+
+        self.window.replace_all()
+        editor.insertPlainText("!")
+        self.window.thread_pool.start.call_args.args[0].run()
+
+        self.assertEqual(editor.toPlainText(), "hello!")
+
+    def test_regex_replace_is_computed_off_the_gui_thread(self):
+        editor = EditorArea()
+        editor.setPlainText("cell wall")
+        self.window.current_editor = MagicMock(return_value=editor)
+        self.window.tab_widget.indexOf = MagicMock(return_value=0)
+        self.window.find_regex_checkbox.setChecked(True)
+        self.window.find_input.setText(r"(c)ell")
+        self.window.replace_input.setText(r"\1ELL")
+        self.window.thread_pool = MagicMock()
+        editor.set_match_index(MatchIndex.build(editor.toPlainText(), self.window.current_search()))
+        cursor = editor.textCursor()
+        cursor.setPosition(0)
+        cursor.setPosition(4, QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
 
-        with patch("view.main_window.SearchService.replace_all", return_value=("hi hi", 2)) as replace_all:
-            self.window.replace_all()
+        self.window.replace_current()
+        self.assertEqual(editor.toPlainText(), "cell wall")
+        self.window.thread_pool.start.call_args.args[0].run()
+
+        self.assertEqual(editor.toPlainText(), "cELL wall")
+
+    def test_find_next_waits_for_the_index_of_a_regex(self):
+        editor = EditorArea()
+        editor.setPlainText("cell wall, cell membrane")
+        self.window.current_editor = MagicMock(return_value=editor)
+        self.window.find_bar.isVisible = MagicMock(return_value=True)
+        self.window.find_regex_checkbox.setChecked(True)
+        self.window.find_input.setText(r"c\w+")
+        self.window.thread_pool = MagicMock()
+
+        with patch("view.main_window.SearchService.find_next") as find_next:
+            self.window.find_next()
+        find_next.assert_not_called()
+        self.assertEqual(editor.textCursor().selectedText(), "")
+        self.window.thread_pool.start.call_args.args[0].run()
 
-        replace_all.assert_called_once_with("hello hello", "hello", "hi", False)
-        editor.setPlainText.assert_called_once_with("hi hi")
-        editor.document().setModified.assert_called_once_with(True)
+        self.assertEqual(editor.textCursor().selectedText(), "cell")
+        self.assertEqual(self.window.find_count_label.text(), "1 of 2")
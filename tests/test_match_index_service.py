@@ -0,0 +1,99 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from services.match_index import MatchIndex
+from services.search_service import SearchQuery, SearchService, SearchTimeout
+
+
+class TestMatchIndex(unittest.TestCase):
+    def edit(self, index, text, position, removed, inserted):
+        text = text[:position] + inserted + text[position + removed:]
+        self.assertTrue(index.apply_change(position, removed, len(inserted), len(text), lambda start, end: text[start:end]))
+        return text
+
+    def spans(self, index):
+        return list(zip(index.starts, index.ends))
+
+    def test_build_finds_every_match(self):
+        index = MatchIndex.build("Cell cell CELL", "cell")
+
+        self.assertEqual(self.spans(index), [(0, 4), (5, 9), (10, 14)])
+        self.assertEqual(len(MatchIndex.build("Cell cell CELL", SearchQuery("cell", case_sensitive=True))), 1)
+        self.assertEqual(self.spans(MatchIndex.build("ababa", "aba")), [(0, 3)])
+
+    def test_match_count_is_what_replace_all_replaces(self):
+        for text, query in (("ababa", "aba"), ("aaaa", "aa"), ("aaaaa", "aa"), ("ab ab", SearchQuery("a|b", regex=True))):
+            self.assertEqual(len(MatchIndex.build(text, query)), SearchService.replace_all(text, query, "x")[1], query)
+
+    def test_edits_create_break_and_shift_matches(self):
+        text = "ab ab ab"
+        index = MatchIndex.build(text, "ab")
+
+        text = self.edit(index, text, 0, 0, "xx")  # Shifts every match
+        self.assertEqual(self.spans(index), [(2, 4), (5, 7), (8, 10)])
+        text = self.edit(index, text, 6, 0, "-")  # Breaks the middle match
+        self.assertEqual(self.spans(index), [(2, 4), (9, 11)])
+        text = self.edit(index, text, 6, 1, "")  # Restores it
+        self.assertEqual(self.spans(index), [(2, 4), (5, 7), (8, 10)])
+        self.assertEqual(text, "xxab ab ab")
+
+    def test_edit_shifts_the_pairing_of_later_matches(self):
+        text = "a" * 1000
+        index = MatchIndex.build(text, "aa")
+
+        text = self.edit(index, text, 0, 1, "")  # Every later match now pairs the characters differently
+        self.assertEqual(self.spans(index), self.spans(MatchIndex.build(text, "aa")))
+        text = self.edit(index, text, 0, 0, "b")
+        self.assertEqual(self.spans(index), self.spans(MatchIndex.build(text, "aa")))
+
+    def test_incremental_updates_match_a_rebuild(self):
+        for search in (SearchQuery("aba"), SearchQuery("aa"), SearchQuery("ab", whole_word=True), SearchQuery("A b", case_sensitive=True)):
+            generator = random.Random(7)
+            text = "".join(generator.choice("aab \n") for _ in range(300))
+            index = MatchIndex.build(text, search)
+            for _ in range(300):
+                position = generator.randrange(len(text) + 1)
+                removed = generator.randrange(min(6, len(text) - position) + 1)
+                inserted = "".join(generator.choice("ab \n") for _ in range(generator.randrange(5)))
+                text = self.edit(index, text, position, removed, inserted)
+                self.assertEqual(self.spans(index), self.spans(MatchIndex.build(text, search)), search)
+
+    def test_regex_and_multiline_searches_are_rebuilt_after_edits(self):
+        text = "begin\nend"
+        for search in (SearchQuery("begin.*end", regex=True, multiline=True), SearchQuery(r"b\w+", regex=True)):
+            index = MatchIndex.build(text, search)
+
+            self.assertEqual(len(index), 1)
+            self.assertFalse(index.apply_change(0, 0, 1, 10, lambda start, end: ("x" + text)[start:end]))
+
+    def test_slow_rescans_leave_the_index_stale(self):
+        text = "ab ab"
+        index = MatchIndex.build(text, "ab")
+
+        with patch("services.match_index.SearchService.scan", side_effect=SearchTimeout("too long")):
+            self.assertFalse(index.apply_change(0, 0, 1, 6, lambda start, end: ("x" + text)[start:end]))
+
+    def test_stopped_build_returns_none(self):
+        self.assertIsNone(MatchIndex.build("ab ab", "ab", should_stop=lambda: True))
+
+    def test_navigation_wraps_around(self):
+        index = MatchIndex.build("x ab ab ab", "ab")
+
+        self.assertEqual(index.next_match(0), 0)
+        self.assertEqual(index.next_match(3), 1)
+        self.assertEqual(index.next_match(9), 0)
+        self.assertEqual(index.previous_match(2), 2)
+        self.assertEqual(index.previous_match(6), 1)
+        self.assertIsNone(MatchIndex.build("text", "ab").next_match(0))
+
+    def test_match_lookup_and_visible_range(self):
+        index = MatchIndex.build("ab ab ab ab", "ab")
+
+        self.assertEqual(index.match_at(3, 5), 1)
+        self.assertIsNone(index.match_at(3, 4))
+        self.assertEqual(list(index.matches_between(4, 7)), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
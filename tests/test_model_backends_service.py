@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from services import model_backends
+from services.summarizer import SummarizerService
+from services.model_registry import registry
+
+
+class TestModelBackends(unittest.TestCase):
+    def tearDown(self):
+        model_backends.set_current(model_backends.PYTORCH)
+        registry.clear()
+
+    def test_cache_model_id_only_tags_non_default_backends(self):
+        self.assertEqual(model_backends.cache_model_id("model", model_backends.PYTORCH), "model")
+        self.assertEqual(model_backends.cache_model_id("model", model_backends.INT8), "model@int8")
+        self.assertEqual(model_backends.cache_model_id("model", model_backends.ONNX), "model@onnx")
+
+    @patch("services.summarizer.pipeline")
+    def test_set_current_drops_loaded_models(self, mock_pipeline):
+        SummarizerService.get_summarizer()
+
+        self.assertTrue(model_backends.set_current(model_backends.INT8))
+        self.assertFalse(model_backends.set_current(model_backends.INT8))
+
+        self.assertEqual(registry.loaded(), {})
+
+    def test_set_current_rejects_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            model_backends.set_current("tpu")
+        self.assertEqual(model_backends.current(), model_backends.PYTORCH)
+
+    def test_pytorch_backend_passes_model_name(self):
+        self.assertEqual(model_backends.pipeline_kwargs("summarization", "model", model_backends.PYTORCH), {"model": "model"})
+
+    def test_summary_cache_key_depends_on_backend(self):
+        pytorch_key = SummarizerService.cache_key("text", "Short")
+        model_backends.set_current(model_backends.INT8)
+
+        self.assertNotEqual(SummarizerService.cache_key("text", "Short"), pytorch_key)
+
+    @patch("services.summarizer.pipeline")
+    def test_int8_backend_quantizes_loaded_pipeline(self, mock_pipeline):
+        torch = MagicMock()
+        model = mock_pipeline.return_value.model
+        model_backends.set_current(model_backends.INT8)
+        with patch.dict(sys.modules, {"torch": torch}):
+            summarizer = SummarizerService.get_summarizer()
+
+        mock_pipeline.assert_called_once_with("summarization", model=SummarizerService.MODEL_NAME)
+        torch.quantization.quantize_dynamic.assert_called_once_with(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.assertIs(summarizer, mock_pipeline.return_value)
+        self.assertIs(summarizer.model, torch.quantization.quantize_dynamic.return_value)
+
+    def test_interrupted_onnx_export_is_not_reused(self):
+        ort, transformers = MagicMock(), MagicMock()
+        model = ort.ORTModelForSeq2SeqLM.from_pretrained.return_value
+        model.save_pretrained.side_effect = OSError("disk full")
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                patch.object(model_backends, "ONNX_CACHE_DIR", cache_dir), \
+                patch.dict(sys.modules, {"optimum": MagicMock(onnxruntime=ort), "optimum.onnxruntime": ort, "transformers": transformers}):
+            with self.assertRaises(OSError):
+                model_backends.pipeline_kwargs("summarization", "org/model", model_backends.ONNX)
+            self.assertEqual(os.listdir(cache_dir), [])
+
+            model.save_pretrained.side_effect = lambda directory: open(os.path.join(directory, "model.onnx"), "w").close()
+            model_backends.pipeline_kwargs("summarization", "org/model", model_backends.ONNX)
+            self.assertEqual(os.listdir(os.path.join(cache_dir, "org--model")), ["model.onnx"])
+
+
+if __name__ == "__main__":
+    unittest.main()
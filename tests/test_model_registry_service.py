@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import MagicMock
+
+from services.model_registry import ModelRegistry
+
+
+def fake_build_pipeline(task, model=None, tokenizer=None):
+    pipe = MagicMock(name=f"{task} pipeline")
+    pipe.task = task
+    pipe.model = model if not isinstance(model, str) else MagicMock(name=model)
+    pipe.tokenizer = tokenizer or MagicMock(name="tokenizer")
+    return pipe
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = ModelRegistry(idle_timeout=None)
+        self.registry._estimate_bytes = lambda model: 100
+
+    def tearDown(self):
+        self.registry.clear()
+
+    def test_same_model_is_shared_across_tasks(self):
+        summarizer = self.registry.get("summarization", "distilbart", fake_build_pipeline)
+        generator = self.registry.get("text2text-generation", "distilbart", fake_build_pipeline)
+
+        self.assertIsNot(summarizer, generator)
+        self.assertIs(generator.model, summarizer.model)
+        self.assertIs(generator.tokenizer, summarizer.tokenizer)
+        self.assertEqual(len(self.registry.loaded()), 1)
+        self.assertIs(self.registry.get("summarization", "distilbart", fake_build_pipeline), summarizer)
+
+    def test_budget_evicts_least_recently_used_model(self):
+        self.registry.configure(max_bytes=200)
+        self.registry.get("summarization", "a", fake_build_pipeline)
+        self.registry.get("summarization", "b", fake_build_pipeline)
+        self.registry.get("summarization", "a", fake_build_pipeline)
+        self.registry.get("summarization", "c", fake_build_pipeline)
+
+        self.assertEqual(sorted(name for name, _ in self.registry.loaded()), ["a", "c"])
+        self.assertEqual(self.registry.total_bytes(), 200)
+
+    def test_model_larger_than_budget_is_still_loaded(self):
+        self.registry.configure(max_bytes=50)
+        self.registry.get("summarization", "a", fake_build_pipeline)
+        self.registry.get("summarization", "b", fake_build_pipeline)
+
+        self.assertEqual([name for name, _ in self.registry.loaded()], ["b"])
+
+    def test_unload_idle_drops_models_past_timeout(self):
+        self.registry.get("summarization", "a", fake_build_pipeline)
+        last_used = self.registry._models[next(iter(self.registry._models))].last_used
+
+        self.assertEqual(self.registry.unload_idle(now=last_used + 3600), 0)  # disabled
+        self.registry.configure(idle_timeout=60)
+        self.assertEqual(self.registry.unload_idle(now=last_used + 30), 0)
+        self.assertEqual(self.registry.unload_idle(now=last_used + 61), 1)
+        self.assertEqual(self.registry.loaded(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
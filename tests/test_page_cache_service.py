@@ -0,0 +1,46 @@
+import unittest
+
+from services.page_cache import PageCache
+
+
+class TestPageCache(unittest.TestCase):
+    def test_evicts_least_recently_used_beyond_byte_cap(self):
+        cache = PageCache(max_bytes=10)
+        cache.put((0, 1.0), "page 0", 4)
+        cache.put((1, 1.0), "page 1", 4)
+        cache.get((0, 1.0))
+        cache.put((2, 1.0), "page 2", 4)
+
+        self.assertEqual(cache.get((0, 1.0)), "page 0")
+        self.assertIsNone(cache.get((1, 1.0)))
+        self.assertIn((2, 1.0), cache)
+        self.assertEqual(cache.total_bytes, 8)
+
+    def test_replacing_an_entry_updates_its_size(self):
+        cache = PageCache(max_bytes=10)
+        cache.put("page", "small", 2)
+        cache.put("page", "large", 7)
+
+        self.assertEqual(cache.get("page"), "large")
+        self.assertEqual(cache.total_bytes, 7)
+
+    def test_values_larger_than_the_cap_are_not_kept(self):
+        cache = PageCache(max_bytes=10)
+        cache.put("page", "huge", 11)
+
+        self.assertNotIn("page", cache)
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_discard_drops_matching_keys(self):
+        cache = PageCache(max_bytes=100)
+        for page in range(3):
+            cache.put((page, 1.0), page, 1)
+            cache.put((page, 2.0), page, 1)
+
+        self.assertEqual(cache.discard(lambda key: key[1] == 2.0), 3)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.total_bytes, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from services.page_layout import PageLayout, tiles_in_rect
+
+
+class TestPageLayout(unittest.TestCase):
+    def setUp(self):
+        # Three 100x200 pages with a 10 px gap: tops at 10, 220 and 430.
+        self.layout = PageLayout([(100, 200)] * 3, gap=10)
+
+    def test_pages_are_stacked_with_gaps(self):
+        self.assertEqual([self.layout.page_top(i) for i in range(3)], [10, 220, 430])
+        self.assertEqual(self.layout.total_height, 640)
+        self.assertEqual(self.layout.max_width, 100)
+
+    def test_zoom_scales_offsets(self):
+        self.layout.set_zoom(2.0)
+
+        self.assertEqual(self.layout.page_top(1), 420)
+        self.assertEqual(self.layout.page_height(1), 400)
+        self.assertEqual(self.layout.page_width(1), 200)
+
+    def test_pages_between_returns_only_intersecting_pages(self):
+        self.assertEqual(list(self.layout.pages_between(0, 100)), [0])
+        self.assertEqual(list(self.layout.pages_between(150, 300)), [0, 1])
+        self.assertEqual(list(self.layout.pages_between(211, 219)), [])  # Only the gap
+        self.assertEqual(list(self.layout.pages_between(-500, 5000)), [0, 1, 2])
+
+    def test_page_at_finds_page_under_position(self):
+        self.assertEqual(self.layout.page_at(0), 0)
+        self.assertEqual(self.layout.page_at(300), 1)
+        self.assertEqual(self.layout.page_at(10_000), 2)
+
+    def test_large_documents_use_binary_search_bounds(self):
+        layout = PageLayout([(600, 800)] * 5000, gap=0)
+
+        self.assertEqual(list(layout.pages_between(800 * 2500 + 1, 800 * 2501 + 1)), [2500, 2501])
+
+
+class TestTilesInRect(unittest.TestCase):
+    def test_returns_tiles_intersecting_rect(self):
+        self.assertEqual(tiles_in_rect(1200, 1200, 0, 0, 100, 100, 512), [(0, 0)])
+        self.assertEqual(tiles_in_rect(1200, 1200, 500, 500, 520, 520, 512), [(0, 0), (1, 0), (0, 1), (1, 1)])
+
+    def test_rect_edges_are_exclusive(self):
+        self.assertEqual(tiles_in_rect(1200, 1200, 0, 0, 512, 512, 512), [(0, 0)])
+
+    def test_rect_is_clamped_to_page(self):
+        self.assertEqual(tiles_in_rect(1200, 600, -100, -100, 5000, 5000, 512), [(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1)])
+        self.assertEqual(tiles_in_rect(1200, 600, 1300, 0, 1400, 100, 512), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from services.page_text_index import PageTextIndex
+
+
+class TestPageTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PageTextIndex()
+        self.index.add_page(0, "Photosynthesis converts light\ninto chemical energy.")
+        self.index.add_page(1, "The Calvin cycle fixes carbon.")
+        self.index.add_page(2, "Light reactions and the Calvin\n   cycle both need light.")
+
+    def test_finds_pages_containing_whole_words(self):
+        self.assertEqual(self.index.pages_for("calvin"), [1, 2])
+        self.assertEqual(self.index.pages_for("LIGHT"), [0, 2])
+        self.assertEqual(self.index.pages_for("mitochondria"), [])
+
+    def test_phrases_match_across_line_breaks(self):
+        self.assertEqual(self.index.pages_for("calvin cycle"), [1, 2])
+        self.assertEqual(self.index.pages_for("light into"), [0])
+        self.assertEqual(self.index.pages_for("cycle fixes light"), [])
+
+    def test_outer_words_may_be_partial(self):
+        self.assertEqual(self.index.pages_for("synth"), [0])
+        self.assertEqual(self.index.pages_for("vin cyc"), [1, 2])
+        self.assertEqual(self.index.pages_for("lvin cycle both"), [2])
+
+    def test_partial_words_are_matched_on_the_right_side(self):
+        self.index.add_page(3, "Synthesis of glucose.")
+
+        self.assertEqual(self.index.pages_for("tosynthesis conv"), [0])  # Word end
+        self.assertEqual(self.index.pages_for("synthesis of"), [3])
+        self.assertEqual(self.index.pages_for("the cal"), [1, 2])  # Word start
+        self.assertEqual(self.index.pages_for("tosynth"), [0])  # Inside a word
+        self.assertEqual(self.index.pages_for("gh"), [0, 2])  # Shorter than a trigram
+
+    def test_occurrences_count_the_hits_on_a_page(self):
+        self.assertEqual(self.index.occurrences(2, "LIGHT"), 2)
+        self.assertEqual(self.index.occurrences(2, "calvin cycle"), 1)
+        self.assertEqual(self.index.occurrences(9, "light"), 0)
+
+    def test_interior_words_must_match_exactly(self):
+        self.assertEqual(self.index.pages_for("the calv cycle"), [])
+
+    def test_pages_added_later_are_found(self):
+        self.assertEqual(self.index.pages_for("chlorophyll"), [])
+        self.index.add_page(3, "Chlorophyll absorbs light.")
+
+        self.assertEqual(self.index.pages_for("chlorophyll"), [3])
+        self.assertEqual(self.index.page_count, 4)
+
+    def test_blank_query_matches_nothing(self):
+        self.assertEqual(self.index.pages_for("   "), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+
+from services.piece_table import LargeTextFile, LineIndex, PieceTable
+
+
+class TestLineIndex(unittest.TestCase):
+    def test_finds_line_offsets_across_blocks(self):
+        LineIndex.BLOCK_BYTES, original_block = 8, LineIndex.BLOCK_BYTES
+        self.addCleanup(setattr, LineIndex, "BLOCK_BYTES", original_block)
+        buffer = b"".join(f"line {number}\n".encode() for number in range(20))
+        index = LineIndex(buffer)
+
+        self.assertEqual(index.line_count, 21)
+        for number in range(20):
+            self.assertEqual(buffer[index.line_offset(number):].split(b"\n")[0], f"line {number}".encode())
+        self.assertEqual(index.line_offset(21), len(buffer))
+
+    def test_text_without_trailing_newline(self):
+        index = LineIndex(b"a\nb")
+
+        self.assertEqual(index.line_count, 2)
+        self.assertEqual(index.line_offset(1), 2)
+
+
+class TestPieceTable(unittest.TestCase):
+    def test_reads_line_ranges_of_the_original(self):
+        table = PieceTable(b"one\ntwo\r\nthree\n")
+
+        self.assertEqual(table.line_count, 4)
+        self.assertEqual(table.lines(0, 4), ["one", "two", "three", ""])
+        self.assertEqual(table.lines(1, 2), ["two"])
+        self.assertFalse(table.modified)
+
+    def test_replace_lines_splits_pieces(self):
+        table = PieceTable(b"a\nb\nc\nd")
+        table.replace_lines(1, 3, ["B", "B2", "C"])
+
+        self.assertEqual(table.lines(0, table.line_count), ["a", "B", "B2", "C", "d"])
+        self.assertEqual(table.lines(2, 4), ["B2", "C"])
+        self.assertTrue(table.modified)
+
+        table.replace_lines(0, 2, [])
+        self.assertEqual(table.lines(0, table.line_count), ["B2", "C", "d"])
+
+    def test_chunks_rebuild_the_edited_text_with_the_file_newline(self):
+        table = PieceTable(b"a\r\nb\r\nc")
+        table.replace_lines(1, 2, ["x", "y"])
+
+        self.assertEqual(b"".join(table.chunks(chunk_bytes=2)), b"a\r\nx\r\ny\r\nc")
+
+    def test_update_lines_keeps_unedited_lines_original(self):
+        original = b"caf\xe9\nplain\nmore \xff\ntail"
+        table = PieceTable(original)
+        window = table.lines(0, 4)
+        self.assertEqual(window[0], "caf\ufffd")
+
+        table.update_lines(0, window, [window[0], "PLAIN", "new", window[2], "tail"])
+
+        self.assertEqual(b"".join(table.chunks()), b"caf\xe9\nPLAIN\nnew\nmore \xff\ntail")
+        unchanged = PieceTable(original)
+        unchanged.update_lines(0, window, list(window))
+        self.assertFalse(unchanged.modified)
+
+    def test_removing_every_line_leaves_one_empty_line(self):
+        table = PieceTable(b"a\nb")
+        table.replace_lines(0, 2, [])
+
+        self.assertEqual(table.lines(0, table.line_count), [""])
+
+
+class TestLargeTextFile(unittest.TestCase):
+    def test_edits_are_saved_and_the_file_is_mapped_again(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "transcript.txt")
+            with open(file_path, "wb") as f:
+                f.write(b"first\nsecond\nthird\n")
+            text_file = LargeTextFile(file_path)
+            text_file.table.replace_lines(1, 2, ["2nd"])
+
+            text_file.save()
+
+            with open(file_path, "rb") as f:
+                self.assertEqual(f.read(), b"first\n2nd\nthird\n")
+            self.assertFalse(text_file.table.modified)
+            self.assertEqual(text_file.table.lines(0, 3), ["first", "2nd", "third"])
+            text_file.close()
+
+    def test_save_leaves_other_files_alone(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "log.txt")
+            with open(file_path, "wb") as f:
+                f.write(b"a\nb")
+            os.chmod(file_path, 0o644)
+            with open(f"{file_path}.tmp", "wb") as f:
+                f.write(b"keep")
+            text_file = LargeTextFile(file_path)
+            text_file.table.replace_lines(0, 1, ["A"])
+
+            text_file.save()
+            text_file.close()
+
+            with open(f"{file_path}.tmp", "rb") as f:
+                self.assertEqual(f.read(), b"keep")
+            self.assertEqual(sorted(os.listdir(temp_dir)), ["log.txt", "log.txt.tmp"])
+            self.assertEqual(os.stat(file_path).st_mode & 0o777, 0o644)
+
+    def test_empty_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "empty.txt")
+            open(file_path, "wb").close()
+            text_file = LargeTextFile(file_path)
+
+            self.assertEqual(text_file.table.lines(0, 1), [""])
+            text_file.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
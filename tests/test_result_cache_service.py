@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from services.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def test_make_key_depends_on_text_model_and_option(self):
+        key = ResultCache.make_key("text", "model", "Short")
+
+        self.assertEqual(key, ResultCache.make_key("text", "model", "Short"))
+        self.assertNotEqual(key, ResultCache.make_key("other", "model", "Short"))
+        self.assertNotEqual(key, ResultCache.make_key("text", "other-model", "Short"))
+        self.assertNotEqual(key, ResultCache.make_key("text", "model", "Long"))
+
+    def test_memory_layer_evicts_least_recently_used(self):
+        cache = ResultCache(max_memory_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+
+    def test_disk_layer_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ResultCache(temp_dir).put("key", "cached summary")
+
+            self.assertEqual(ResultCache(temp_dir).get("key"), "cached summary")
+
+    def test_disk_layer_respects_size_cap(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ResultCache(temp_dir, max_disk_bytes=10)
+            cache.put("old", "123456")
+            old_path = os.path.join(temp_dir, "old.txt")
+            os.utime(old_path, (0, 0))
+            cache.put("new", "abcdef")
+
+            self.assertFalse(os.path.exists(old_path))
+            self.assertTrue(os.path.exists(os.path.join(temp_dir, "new.txt")))
+
+    def test_clear_removes_memory_and_disk_entries(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ResultCache(temp_dir)
+            cache.put("key", "value")
+            cache.clear()
+
+            self.assertIsNone(cache.get("key"))
+            self.assertEqual(os.listdir(temp_dir), [])
@@ -1,6 +1,15 @@
+import re
+import time
 import unittest
 
-from services.search_service import SearchService
+from services import search_service
+from services.search_service import SearchQuery, SearchService, SearchTimeout
+
+try:
+    from PyQt5.QtWidgets import QApplication, QTextEdit
+    PYQT_AVAILABLE = True
+except ImportError:
+    PYQT_AVAILABLE = False
 
 
 class TestSearchService(unittest.TestCase):
@@ -24,3 +33,117 @@ class TestSearchService(unittest.TestCase):
 
         self.assertEqual(updated, original)
         self.assertEqual(count, 0)
+
+    def test_find_all_returns_match_spans(self):
+        self.assertEqual(SearchService.find_all("a.b A.B", "a.b"), [(0, 3), (4, 7)])
+        self.assertEqual(SearchService.find_all("a.b A.B", "a.b", case_sensitive=True), [(0, 3)])
+        self.assertEqual(SearchService.find_all("text", ""), [])
+
+    def test_document_spans_count_astral_characters_twice(self):
+        text = "\U0001F600 note \U0001F600 note"
+        spans = SearchService.find_all(text, "note")
+
+        self.assertEqual(spans, [(2, 6), (9, 13)])
+        self.assertEqual(SearchService.document_spans(text, spans), [(3, 7), (11, 15)])
+
+    def test_regex_replacements_expand_groups(self):
+        search = SearchQuery(r"(\w+)@(\w+)", regex=True)
+        updated, count = SearchService.replace_all("ann@lab, bob@uni", search, r"\2:\1")
+
+        self.assertEqual(updated, "lab:ann, uni:bob")
+        self.assertEqual(count, 2)
+        self.assertEqual(SearchService.replace_all("a\\1", "a", r"\1"), (r"\1\1", 1))  # Literal queries replace literally
+
+    def test_whole_word_matches_need_word_boundaries(self):
+        search = SearchQuery("c++", whole_word=True)
+
+        self.assertEqual(SearchService.find_all("c++ abc++ c++x c++", search), [(0, 3), (15, 18)])
+
+    def test_matches_span_lines_only_in_multiline_mode(self):
+        text = "begin\nend\n  begin end"
+
+        self.assertEqual(SearchService.find_all(text, SearchQuery(r"begin.*end", regex=True)), [(12, 21)])
+        self.assertEqual(SearchService.find_all(text, SearchQuery(r"begin.*end", regex=True, multiline=True)), [(0, 21)])
+        self.assertEqual(SearchService.find_all(text, SearchQuery(r"\s+\w", regex=True)), [(10, 13), (17, 19)])
+
+    def test_scans_in_line_slices(self):
+        SearchService.SCAN_SLICE_CHARS, slice_chars = 4, SearchService.SCAN_SLICE_CHARS
+        self.addCleanup(setattr, SearchService, "SCAN_SLICE_CHARS", slice_chars)
+        text = "one two\nthree two\ntwo"
+
+        self.assertEqual(SearchService.find_all(text, "two"), [(4, 7), (14, 17), (18, 21)])
+
+    def test_scan_past_its_deadline_times_out(self):
+        with self.assertRaises(SearchTimeout):
+            SearchService.find_all("a" * 100, SearchQuery("a", regex=True), deadline=0)
+
+    def test_catastrophic_regex_is_killed_at_its_timeout(self):
+        search = SearchQuery(r"(a+)+$", regex=True)
+        started = time.monotonic()
+
+        with self.assertRaises(SearchTimeout):
+            SearchService.scan("a" * 40 + "!", search, timeout=0.2)
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(SearchService.scan("aa", search), [(0, 2)])  # A new process takes over
+
+    def test_stopped_regex_scan_returns_none(self):
+        search = SearchQuery(r"(a+)+$", regex=True)
+
+        self.assertIsNone(SearchService.scan("a" * 40 + "!", search, should_stop=lambda: True))
+
+    def test_literal_scan_stops_between_slices(self):
+        SearchService.SCAN_SLICE_CHARS, slice_chars = 4, SearchService.SCAN_SLICE_CHARS
+        self.addCleanup(setattr, SearchService, "SCAN_SLICE_CHARS", slice_chars)
+        checks = []
+
+        def should_stop():
+            checks.append(None)
+            return len(checks) > 2
+
+        self.assertIsNone(SearchService.scan("no match\n" * 10, "cell", should_stop=should_stop))
+        self.assertLessEqual(len(checks), 4)  # Stopped at the third slice instead of scanning all ten lines
+
+    def test_regex_replacements_are_expanded_in_the_scan_process(self):
+        search = SearchQuery(r"(\w+)@(\w+)", regex=True)
+
+        self.assertEqual(SearchService.find_replacements("ann@lab \U0001F600 bob@uni", search, r"\2:\1"),
+                         ([(0, 7), (11, 18)], ["lab:ann", "uni:bob"]))
+        self.assertEqual(SearchService.fullmatch_replacement("ann@lab", search, r"\2"), "lab")
+        self.assertIsNone(SearchService.fullmatch_replacement("ann@lab!", search, r"\2"))
+        with self.assertRaises(re.error):
+            SearchService.find_replacements("ann@lab", search, r"\3")
+
+    def test_compiled_patterns_are_cached(self):
+        first = SearchQuery("cell", regex=True).pattern()
+        key = ("cell", re.MULTILINE | re.IGNORECASE)
+        self.assertIn(key, search_service._PATTERN_CACHE)
+
+        self.assertIs(SearchQuery("cell", regex=True).pattern(), first)
+        self.assertIsNot(SearchQuery("cell", regex=True, case_sensitive=True).pattern(), first)
+        for number in range(search_service.MAX_CACHED_PATTERNS):
+            SearchQuery(f"word{number}").pattern()
+        self.assertEqual(len(search_service._PATTERN_CACHE), search_service.MAX_CACHED_PATTERNS)
+        self.assertNotIn(key, search_service._PATTERN_CACHE)
+
+
+@unittest.skipUnless(PYQT_AVAILABLE, "PyQt5 is not installed; editor replace tests are skipped.")
+class TestReplaceAllInEditor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_replaces_in_one_undo_step_and_reports_progress(self):
+        editor = QTextEdit()
+        editor.setPlainText("cat \U0001F600 cat\ncat")
+        progress = []
+        SearchService.PROGRESS_EVERY_REPLACEMENTS, every = 2, SearchService.PROGRESS_EVERY_REPLACEMENTS
+        self.addCleanup(setattr, SearchService, "PROGRESS_EVERY_REPLACEMENTS", every)
+
+        count = SearchService.replace_all_in_editor(editor, "CAT", "dog", progress_callback=lambda *args: progress.append(args))
+
+        self.assertEqual(count, 3)
+        self.assertEqual(editor.toPlainText(), "dog \U0001F600 dog\ndog")
+        self.assertEqual(progress, [(2, 3)])
+        editor.undo()
+        self.assertEqual(editor.toPlainText(), "cat \U0001F600 cat\ncat")
@@ -0,0 +1,26 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+from benchmarks.startup_time import STARTUP_BUDGET_SECONDS, measure_time_to_first_window
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PYQT_AVAILABLE = importlib.util.find_spec("PyQt5") is not None
+AI_STACK_AVAILABLE = importlib.util.find_spec("transformers") is not None
+
+
+class TestStartupBudget(unittest.TestCase):
+    def test_ai_services_do_not_import_transformers_at_import_time(self):
+        probe = "import sys, services.summarizer, services.key_points_extractor; print('transformers' in sys.modules)"
+        completed = subprocess.run([sys.executable, "-c", probe], cwd=REPO_ROOT, check=True, capture_output=True, text=True)
+
+        self.assertEqual(completed.stdout.strip(), "False")
+
+    @unittest.skipUnless(PYQT_AVAILABLE and AI_STACK_AVAILABLE, "PyQt5 and transformers are required for the startup benchmark.")
+    def test_time_to_first_window_within_budget(self):
+        result = measure_time_to_first_window()
+
+        self.assertEqual(result["heavy_modules"], [])
+        self.assertLess(result["seconds"], STARTUP_BUDGET_SECONDS)
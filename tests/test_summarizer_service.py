@@ -1,16 +1,39 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+from services.model_registry import registry
+from services.result_cache import ResultCache
 from services.summarizer import SummarizerService
 
 
+class FakeTokenizer:
+    """Whitespace tokenizer standing in for the model's tokenizer."""
+
+    def __init__(self, model_max_length=1024):
+        self.model_max_length = model_max_length
+
+    def encode(self, text, add_special_tokens=True):
+        return text.split()
+
+    def decode(self, token_ids, skip_special_tokens=False):
+        return " ".join(token_ids)
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def __call__(self, text, **kwargs):
+        return {"input_ids": self.encode(text)}
+
+
 class TestSummarizerService(unittest.TestCase):
     def tearDown(self):
-        SummarizerService._summarizer = None
+        registry.clear()
+        SummarizerService.result_cache = None
 
     @patch("services.summarizer.pipeline")
     def test_summarize_returns_summary(self, mock_pipeline):
         fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer()
         fake_summarizer.return_value = [{"summary_text": "test summary"}]
         mock_pipeline.return_value = fake_summarizer
 
@@ -18,6 +41,156 @@ class TestSummarizerService(unittest.TestCase):
 
         self.assertEqual(summary, "test summary")
         mock_pipeline.assert_called_once_with("summarization", model="sshleifer/distilbart-cnn-6-6")
+        fake_summarizer.assert_called_once()
+
+    @patch("services.summarizer.pipeline")
+    def test_summarize_long_text_maps_chunks_then_reduces(self, mock_pipeline):
+        fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer(model_max_length=12)
+        fake_summarizer.side_effect = lambda texts, **kwargs: [{"summary_text": "part"} for _ in texts]
+        mock_pipeline.return_value = fake_summarizer
+
+        text = " ".join(f"word{i}" for i in range(25))
+        summary = SummarizerService.summarize(text, "Medium")
+
+        self.assertEqual(summary, "part")
+        map_call, reduce_call = fake_summarizer.call_args_list
+        self.assertGreater(len(map_call.args[0]), 1)
+        self.assertEqual(reduce_call.args[0], ["\n".join(["part"] * len(map_call.args[0]))])
+        self.assertTrue(map_call.kwargs["truncation"])
+
+    @patch("services.summarizer.pipeline")
+    def test_summarize_uses_result_cache_for_repeat_requests(self, mock_pipeline):
+        fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer()
+        fake_summarizer.return_value = [{"summary_text": "cached summary"}]
+        mock_pipeline.return_value = fake_summarizer
+        SummarizerService.result_cache = ResultCache()
+
+        first = SummarizerService.summarize("Some text to summarize.", "Short")
+        second = SummarizerService.summarize("Some text to summarize.", "Short")
+        SummarizerService.summarize("Some text to summarize.", "Long")
+
+        self.assertEqual(first, second)
+        self.assertEqual(fake_summarizer.call_count, 2)
+
+    @patch("services.summarizer.pipeline")
+    def test_summarize_many_batches_short_documents_in_input_order(self, mock_pipeline):
+        fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer()
+        fake_summarizer.side_effect = lambda texts, **kwargs: [{"summary_text": f"sum:{t}"} for t in texts]
+        mock_pipeline.return_value = fake_summarizer
+        progress = []
+
+        summaries = SummarizerService.summarize_many(
+            ["a b c", "  ", "a", "a b"], "Short", batch_size=2, progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        self.assertEqual(summaries, ["sum:a b c", "", "sum:a", "sum:a b"])
+        self.assertEqual([call.args[0] for call in fake_summarizer.call_args_list], [["a", "a b"], ["a b c"]])
+        self.assertEqual(fake_summarizer.call_args.kwargs["batch_size"], 2)
+        self.assertEqual(progress, [(1, 4), (3, 4), (4, 4)])
+
+    @patch("services.summarizer.pipeline")
+    def test_summarize_many_skips_cached_documents(self, mock_pipeline):
+        fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer()
+        fake_summarizer.side_effect = lambda texts, **kwargs: [{"summary_text": "fresh"} for _ in texts]
+        mock_pipeline.return_value = fake_summarizer
+        SummarizerService.result_cache = ResultCache()
+        SummarizerService.result_cache.put(ResultCache.make_key("cached text", SummarizerService.MODEL_NAME, "Medium"), "cached")
+
+        summaries = SummarizerService.summarize_many(["cached text", "new text"], "Medium")
+
+        self.assertEqual(summaries, ["cached", "fresh"])
+        fake_summarizer.assert_called_once()
+        self.assertEqual(fake_summarizer.call_args.args[0], ["new text"])
+
+    @patch("services.summarizer.transformers")
+    @patch("services.summarizer.pipeline")
+    def test_stream_summary_emits_pieces_and_caches_result(self, mock_pipeline, mock_transformers):
+        fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer()
+        mock_pipeline.return_value = fake_summarizer
+        mock_transformers.TextIteratorStreamer.return_value.__iter__.return_value = iter(["Hello", "", " world "])
+        SummarizerService.result_cache = ResultCache()
+        pieces = []
+
+        summary = SummarizerService.stream_summary("Some text to summarize.", "Short", on_text=pieces.append)
+
+        self.assertEqual(summary, "Hello world")
+        self.assertEqual(pieces, ["Hello", " world "])
+        generate_kwargs = fake_summarizer.model.generate.call_args.kwargs
+        self.assertIs(generate_kwargs["streamer"], mock_transformers.TextIteratorStreamer.return_value)
+        self.assertEqual(generate_kwargs["num_beams"], 1)
+        self.assertEqual(SummarizerService.stream_summary("Some text to summarize.", "Short"), "Hello world")
+        fake_summarizer.model.generate.assert_called_once()
+
+    @patch("services.summarizer.transformers")
+    @patch("services.summarizer.pipeline")
+    def test_streamed_summaries_are_not_served_to_beam_search_requests(self, mock_pipeline, mock_transformers):
+        fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer()
+        fake_summarizer.return_value = [{"summary_text": "beam summary"}]
+        mock_pipeline.return_value = fake_summarizer
+        mock_transformers.TextIteratorStreamer.return_value.__iter__.return_value = iter(["greedy summary"])
+        SummarizerService.result_cache = ResultCache()
+
+        SummarizerService.stream_summary("Some text to summarize.", "Short")
+
+        self.assertEqual(SummarizerService.summarize("Some text to summarize.", "Short"), "beam summary")
+
+    @patch("services.summarizer.transformers")
+    @patch("services.summarizer.pipeline")
+    def test_stream_summary_stopped_early_is_not_cached(self, mock_pipeline, mock_transformers):
+        fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer()
+        mock_pipeline.return_value = fake_summarizer
+        mock_transformers.TextIteratorStreamer.return_value.__iter__.return_value = iter(["Partial"])
+        SummarizerService.result_cache = ResultCache()
+
+        summary = SummarizerService.stream_summary("Some text to summarize.", "Short", should_stop=lambda: True)
+
+        self.assertEqual(summary, "Partial")
+        self.assertIsNone(SummarizerService.result_cache.get(ResultCache.make_key("Some text to summarize.", SummarizerService.MODEL_NAME, "Short")))
+
+    @patch("services.summarizer.transformers")
+    @patch("services.summarizer.pipeline")
+    def test_stream_summary_raises_generation_errors(self, mock_pipeline, mock_transformers):
+        fake_summarizer = MagicMock()
+        fake_summarizer.tokenizer = FakeTokenizer()
+        fake_summarizer.model.generate.side_effect = RuntimeError("out of memory")
+        mock_pipeline.return_value = fake_summarizer
+        mock_transformers.TextIteratorStreamer.return_value.__iter__.return_value = iter([])
+
+        with self.assertRaises(RuntimeError):
+            SummarizerService.stream_summary("Some text to summarize.", "Short")
+        mock_transformers.TextIteratorStreamer.return_value.end.assert_called_once()
+
+    def test_chunk_text_respects_budget_and_overlap(self):
+        tokenizer = FakeTokenizer()
+        text = " ".join(str(i) for i in range(10))
+
+        chunks = SummarizerService.chunk_text(text, tokenizer, max_tokens=4, overlap=1)
+
+        self.assertEqual(chunks, ["0 1 2 3", "3 4 5 6", "6 7 8 9"])
+
+    def test_chunk_text_returns_short_text_unchanged(self):
+        chunks = SummarizerService.chunk_text("short text", FakeTokenizer(), max_tokens=10)
+
+        self.assertEqual(chunks, ["short text"])
+
+    @patch("services.summarizer.pipeline")
+    def test_fits_single_pass_compares_against_the_token_budget(self, mock_pipeline):
+        mock_pipeline.return_value.tokenizer = FakeTokenizer(model_max_length=5)
+
+        self.assertTrue(SummarizerService.fits_single_pass("one two three"))
+        self.assertFalse(SummarizerService.fits_single_pass("one two three four"))
+
+    def test_get_token_budget_falls_back_for_unbounded_tokenizers(self):
+        tokenizer = FakeTokenizer(model_max_length=int(1e30))
+
+        self.assertEqual(SummarizerService.get_token_budget(tokenizer), 1022)
 
     def test_summarize_empty_text_raises_value_error(self):
         with self.assertRaises(ValueError):
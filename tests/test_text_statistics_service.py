@@ -0,0 +1,52 @@
+import unittest
+
+from services.text_statistics import TextStatistics
+
+
+class TestTextStatistics(unittest.TestCase):
+    def test_counts_match_splitting_the_whole_text(self):
+        text = "Cells divide by mitosis.\n\n  Meiosis  halves\tchromosomes\n"
+        statistics = TextStatistics(text)
+
+        self.assertEqual(statistics.words, len(text.split()))
+        self.assertEqual(statistics.characters, len(text.replace("\n", "")))
+        self.assertEqual(statistics.block_count, 4)
+
+    def test_replacing_blocks_updates_the_totals(self):
+        statistics = TextStatistics("one two\nthree\nfour five six")
+
+        statistics.replace_blocks(1, 1, ["three and", "a new line"])
+        self.assertEqual(statistics.words, 2 + 5 + 3)
+        self.assertEqual(statistics.block_count, 4)
+
+        # Joining the last two blocks
+        statistics.replace_blocks(2, 2, ["a new linefour five six"])
+        self.assertEqual(statistics.words, 2 + 2 + 5)
+        self.assertEqual(statistics.characters, len("one twothree anda new linefour five six"))
+
+    def test_revision_changes_with_every_edit(self):
+        statistics = TextStatistics()
+        revision = statistics.revision
+
+        statistics.replace_blocks(0, 1, ["typed"])
+
+        self.assertGreater(statistics.revision, revision)
+
+    def test_removing_every_block_leaves_an_empty_document(self):
+        statistics = TextStatistics("a\nb")
+
+        statistics.replace_blocks(0, 2, [])
+
+        self.assertEqual((statistics.words, statistics.characters, statistics.block_count), (0, 0, 1))
+
+    def test_rejects_blocks_outside_the_document(self):
+        with self.assertRaises(ValueError):
+            TextStatistics("a").replace_blocks(0, 2, ["b"])
+
+    def test_reading_time_rounds_up(self):
+        self.assertEqual(TextStatistics().reading_minutes(), 0)
+        self.assertEqual(TextStatistics("word " * 201).reading_minutes(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
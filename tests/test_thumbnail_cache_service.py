@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from services.thumbnail_cache import ThumbnailCache
+
+
+class TestThumbnailCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "thumbnails")
+        self.pdf_path = os.path.join(self.temp_dir.name, "notes.pdf")
+        with open(self.pdf_path, "wb") as f:
+            f.write(b"%PDF-1.4 original")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_document_key_changes_with_content_mtime_and_width(self):
+        key = ThumbnailCache.document_key(self.pdf_path, 120)
+
+        self.assertEqual(key, ThumbnailCache.document_key(self.pdf_path, 120))
+        self.assertNotEqual(key, ThumbnailCache.document_key(self.pdf_path, 160))
+        os.utime(self.pdf_path, ns=(0, 0))
+        touched_key = ThumbnailCache.document_key(self.pdf_path, 120)
+        self.assertNotEqual(key, touched_key)
+        with open(self.pdf_path, "wb") as f:
+            f.write(b"%PDF-1.4 edited!")
+        os.utime(self.pdf_path, ns=(0, 0))
+        self.assertNotEqual(touched_key, ThumbnailCache.document_key(self.pdf_path, 120))
+
+    def test_thumbnails_persist_across_instances(self):
+        ThumbnailCache(self.cache_dir).put("doc", 3, b"png bytes")
+        cache = ThumbnailCache(self.cache_dir)
+
+        self.assertEqual(cache.cached_pages("doc"), [3])
+        self.assertEqual(cache.get("doc", 3), b"png bytes")
+        self.assertIsNone(cache.get("doc", 4))
+        self.assertEqual(cache.cached_pages("other"), [])
+
+    def test_least_recently_opened_documents_are_evicted(self):
+        cache = ThumbnailCache(self.cache_dir, max_disk_bytes=10)
+        cache.put("old", 0, b"123456")
+        os.utime(os.path.join(self.cache_dir, "old"), (0, 0))
+        cache.put("new", 0, b"abcdef")
+
+        self.assertEqual(cache.cached_pages("new"), [0])
+        self.assertEqual(cache.cached_pages("old"), [])
+
+    def test_document_being_opened_is_kept_even_over_the_cap(self):
+        cache = ThumbnailCache(self.cache_dir, max_disk_bytes=1)
+        cache.put("doc", 0, b"123456")
+
+        self.assertEqual(cache.cached_pages("doc"), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,52 +1,185 @@
 from PyQt5.QtCore import QObject, pyqtSignal, QRunnable
 from services.summarizer import SummarizerService
+from services.file_service import FileService
 from services.key_points_extractor import KeyPointsService
+from services.incremental_analysis import IncrementalAnalyzer
 
 
 class AIWorkerSignals(QObject):
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    partial = pyqtSignal(str)  # newly generated text while streaming
+
+
+class BatchWorkerSignals(AIWorkerSignals):
+    progress = pyqtSignal(int, int)  # (documents done, total)
+
+
+class AIJobSignals(QObject):
+    """Carries JobScheduler statistics from its threads to the GUI thread."""
+    stats_changed = pyqtSignal(dict)
 
 
 class SummarizationWorker(QRunnable):
-    """Worker thread for running summarization without blocking the GUI."""
+    """Worker thread for running summarization without blocking the GUI.
 
-    def __init__(self, text: str, length_option: str):
+    When an InferenceBackend is given, the model runs in its worker processes.
+    With stream=True, generated text is emitted through signals.partial as it
+    arrives and stop() ends generation early. When the editor's paragraph chunks
+    are given, only chunks changed since the last run are summarized again
+    before the final pass.
+    """
+    error_prefix = "Summarization failed"
+
+    def __init__(self, text: str, length_option: str, backend=None, stream: bool = False, chunks=None):
         super().__init__()
         self.text = text
         self.length_option = length_option
+        self.backend = backend
+        self.stream = stream
+        self.chunks = chunks
         self.signals = AIWorkerSignals()
+        self._stop_requested = False
+
+    def stop(self):
+        self._stop_requested = True
+
+    def is_stop_requested(self) -> bool:
+        return self._stop_requested
+
+    def compute(self) -> str:
+        text = self.text if self.chunks is None else IncrementalAnalyzer.summary_input(self.chunks, self.backend)
+        if self.stream:
+            service = self.backend if self.backend is not None else SummarizerService
+            return service.stream_summary(text, self.length_option, on_text=self.signals.partial.emit, should_stop=self.is_stop_requested)
+        if self.backend is not None:
+            return self.backend.summarize(text, self.length_option)
+        return SummarizerService.summarize(text, self.length_option)
+
+    def run(self):
+        try:
+            self.signals.finished.emit(self.compute())
+        except Exception as e:
+            self.signals.error.emit(f"{self.error_prefix}: {e}")
+
+
+class BatchSummarizationWorker(QRunnable):
+    """Worker that summarizes many documents in batches and writes each summary next to its source.
+
+    Each source is a (label, file_path, text) tuple; when text is None the file is
+    read through FileService. Summaries of sources with a file path are saved as
+    "<file name>.summary.txt" in the same folder, so notes.txt and notes.md
+    don't overwrite each other's summary.
+    """
+    error_prefix = "Batch summarization failed"
+    SUMMARY_SUFFIX = ".summary.txt"
+
+    def __init__(self, sources, length_option: str, batch_size: int, backend=None, file_service: FileService | None = None):
+        super().__init__()
+        self.sources = sources
+        self.length_option = length_option
+        self.batch_size = max(1, batch_size)
+        self.backend = backend
+        self.file_service = file_service or FileService()
+        self.signals = BatchWorkerSignals()
+
+    @classmethod
+    def summary_path_for(cls, file_path: str) -> str:
+        return file_path + cls.SUMMARY_SUFFIX
+
+    def compute(self) -> str:
+        total = len(self.sources)
+        texts, notes = [], {}
+        for index, (label, file_path, text) in enumerate(self.sources):
+            if text is None:
+                try:
+                    text = self.file_service.read_file(file_path)
+                except Exception as e:
+                    notes[index] = f"Could not read file: {e}"
+                    text = ""
+            texts.append(text)
+
+        # Group documents of similar length so each padded batch wastes little compute.
+        order = sorted(range(total), key=lambda i: len(texts[i]))
+        summaries = [""] * total
+        done = 0
+        self.signals.progress.emit(done, total)
+        for start in range(0, total, self.batch_size):
+            group = order[start:start + self.batch_size]
+            group_texts = [texts[i] for i in group]
+            if self.backend is not None:
+                results = self.backend.summarize_many(group_texts, self.length_option, self.batch_size)
+            else:
+                results = SummarizerService.summarize_many(group_texts, self.length_option, self.batch_size)
+            for index, summary in zip(group, results):
+                summaries[index] = summary
+                file_path = self.sources[index][1]
+                if summary and file_path:
+                    try:
+                        self.file_service.save_text_file(self.summary_path_for(file_path), summary)
+                    except OSError as e:
+                        notes[index] = f"Could not save summary: {e}"
+            done += len(group)
+            self.signals.progress.emit(done, total)
+
+        report = []
+        for index, (label, _, _) in enumerate(self.sources):
+            body = summaries[index] or notes.get(index) or "Nothing to summarize."
+            if summaries[index] and index in notes:
+                body += f"\n({notes[index]})"
+            report.append(f"## {label}\n{body}")
+        return "\n\n".join(report)
 
     def run(self):
         try:
-            summary = SummarizerService.summarize(self.text, self.length_option)
-            self.signals.finished.emit(summary)
+            self.signals.finished.emit(self.compute())
         except Exception as e:
-            self.signals.error.emit(f"Summarization failed: {e}")
+            self.signals.error.emit(f"{self.error_prefix}: {e}")
 
 
 class KeyPointsWorker(QRunnable):
-    """Worker thread for extracting key points without blocking the GUI."""
+    """Worker thread for extracting key points without blocking the GUI.
+
+    When the editor's paragraph chunks are given, only chunks changed since the
+    last run are sent to the model and their keyphrases are merged with the rest.
+    """
+    error_prefix = "Key points extraction failed"
 
-    def __init__(self, text: str):
+    def __init__(self, text: str, backend=None, chunks=None):
         super().__init__()
         self.text = text
+        self.backend = backend
+        self.chunks = chunks
         self.signals = AIWorkerSignals()
 
+    def compute(self) -> str:
+        if self.chunks is not None:
+            return IncrementalAnalyzer.key_points(self.chunks, self.backend)
+        if self.backend is not None:
+            return self.backend.extract_key_points(self.text)
+        return KeyPointsService.extract_key_points(self.text)
+
     def run(self):
         try:
-            key_points_text = KeyPointsService.extract_key_points(self.text)
-            self.signals.finished.emit(key_points_text)
+            self.signals.finished.emit(self.compute())
         except Exception as e:
-            self.signals.error.emit(f"Key points extraction failed: {e}")
+            self.signals.error.emit(f"{self.error_prefix}: {e}")
 
 
 class PreloadWorker(QRunnable):
     """Worker to preload AI models in the background."""
 
+    def __init__(self, backend=None):
+        super().__init__()
+        self.backend = backend
+
     def run(self):
         try:
-            SummarizerService.get_summarizer()
-            KeyPointsService.get_extractor()
+            if self.backend is not None:
+                self.backend.preload()
+            else:
+                SummarizerService.get_summarizer()
+                KeyPointsService.get_extractor()
         except Exception:
             pass
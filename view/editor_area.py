@@ -1,6 +1,12 @@
 from PyQt5.QtWidgets import QTextEdit
+from PyQt5.QtGui import QColor, QTextCursor
+from services.incremental_analysis import IncrementalDocument
+from services.text_statistics import TextStatistics
 
 class EditorArea(QTextEdit):
+    MATCH_COLOR = QColor(255, 220, 0, 90)
+    CURRENT_MATCH_COLOR = QColor(255, 140, 0, 140)
+
     def __init__(self, file_path=None, parent=None):
         super().__init__(parent)
         self.file_path = file_path
@@ -8,3 +14,80 @@ class EditorArea(QTextEdit):
             self.setPlaceholderText("Create or open a file to start studying...")
         else:
             self.setPlaceholderText("")
+
+        # Paragraph chunks of the text, updated per edit so AI analysis can skip unchanged chunks.
+        self.analysis = IncrementalDocument()
+        # Per-line word and character counts for the status bar, updated the same way.
+        self.statistics = TextStatistics()
+        # Matches of the find bar's query, set by the main window; only the visible ones are highlighted.
+        self.match_index = None
+        self.document().contentsChange.connect(self.on_contents_change)
+        self.verticalScrollBar().valueChanged.connect(self.update_match_highlights)
+        self.selectionChanged.connect(self.update_match_highlights)
+
+    def on_contents_change(self, position, chars_removed, chars_added):
+        new_length = self.document().characterCount() - 1  # Without the final paragraph separator
+        self.analysis.apply_change(position, chars_removed, chars_added, new_length, self.text_range)
+        self.update_statistics(position, chars_added)
+        if self.match_index is not None:
+            updated = self.match_index.apply_change(position, chars_removed, chars_added, new_length, self.text_range)
+            # A stale index is dropped; the main window indexes the text again in the background.
+            self.set_match_index(self.match_index if updated else None)
+
+    def update_statistics(self, position, chars_added):
+        """Recount the blocks from the one holding position to the one holding the end of the insertion."""
+        document = self.document()
+        first_block = document.findBlock(position)
+        last_block = document.findBlock(position + chars_added)
+        if not last_block.isValid():
+            last_block = document.lastBlock()
+        first, last = first_block.blockNumber(), last_block.blockNumber()
+        # The block count difference tells how many old blocks the edited ones replace.
+        old_count = (last - first + 1) - (document.blockCount() - self.statistics.block_count)
+        blocks = []
+        block = first_block
+        while block.isValid() and block.blockNumber() <= last:
+            blocks.append(block.text())
+            block = block.next()
+        try:
+            self.statistics.replace_blocks(first, old_count, blocks)
+        except ValueError:
+            self.statistics.reset(self.toPlainText().split("\n"))
+
+    def set_match_index(self, match_index):
+        self.match_index = match_index
+        self.update_match_highlights()
+
+    def update_match_highlights(self):
+        """Highlight the matches in the visible lines, the selected one more strongly."""
+        if not self.match_index:
+            self.setExtraSelections([])
+            return
+
+        viewport = self.viewport().rect()
+        first_block = self.cursorForPosition(viewport.topLeft()).block()
+        last_block = self.cursorForPosition(viewport.bottomRight()).block()
+        cursor = self.textCursor()
+        selections = []
+        for number in self.match_index.matches_between(first_block.position(), last_block.position() + last_block.length()):
+            start, end = self.match_index.span(number)
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = QTextCursor(self.document())
+            selection.cursor.setPosition(start)
+            selection.cursor.setPosition(end, QTextCursor.KeepAnchor)
+            is_current = (cursor.selectionStart(), cursor.selectionEnd()) == (start, end)
+            selection.format.setBackground(self.CURRENT_MATCH_COLOR if is_current else self.MATCH_COLOR)
+            selections.append(selection)
+        self.setExtraSelections(selections)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_match_highlights()
+
+    def text_range(self, start, end):
+        """Plain text between two document positions."""
+        cursor = QTextCursor(self.document())
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        # Match toPlainText(): selectedText() keeps Qt's separator and nbsp characters.
+        return cursor.selectedText().replace("\u2029", "\n").replace("\u2028", "\n").replace("\u00a0", " ")
@@ -1,8 +1,10 @@
 import os
-import shutil
+from functools import partial
 from PyQt5.QtWidgets import QFileDialog, QMessageBox, QTabWidget
 from view.pdf_viewer import PdfViewer
 from view.editor_area import EditorArea
+from view.large_file_editor import LargeFileEditor
+from view.file_workers import ConversionWorker, FileLoadWorker
 from services.file_service import FileService
 from view.document_model import DocumentModel
 from PyQt5.QtGui import QFont, QTextOption
@@ -17,6 +19,9 @@ class FileHandler:
         self.sidebar = main_window.sidebar
         self.settings_model = main_window.settings_model
         self.file_service = file_service or FileService()
+        self.pending_conversions = {}  # source path -> ConversionWorker
+        self.pending_loads = {}  # FileLoadWorker -> placeholder editor
+        self.status_bar.file_load_cancel_requested.connect(self.cancel_loads)
 
     def new_file(self, is_initial_tab=False):
         """Create a new file tab.
@@ -59,6 +64,8 @@ class FileHandler:
 
         editor.document().modificationChanged.connect(lambda modified, ed=editor: self.main_window.on_modification_changed(ed, modified))
         editor.cursorPositionChanged.connect(self.main_window.update_status_bar)
+        editor.document().contentsChanged.connect(self.main_window.update_status_bar)  # Edits that leave the cursor in place
+        editor.document().contentsChange.connect(lambda *_, ed=editor: self.main_window.on_editor_contents_changed(ed))
 
         editor.document_model = DocumentModel(file_path=file_path)
 
@@ -71,6 +78,19 @@ class FileHandler:
         self.main_window.update_status_bar()
         return editor
 
+    def create_large_file_tab(self, file_path):
+        """Creates a new tab with a LargeFileEditor, which maps the file instead of loading it."""
+        editor = LargeFileEditor(file_path)
+        editor.setFont(QFont(self.settings_model.editor_font_family, self.settings_model.editor_font_size))
+        editor.document().modificationChanged.connect(lambda modified, ed=editor: self.main_window.on_modification_changed(ed, modified))
+        editor.document_model = DocumentModel(file_path=file_path)
+
+        index = self.tab_widget.addTab(editor, os.path.basename(file_path))
+        self.tab_widget.setTabToolTip(index, file_path)
+        self.tab_widget.setCurrentIndex(index)
+        self.main_window.update_window_title()
+        return editor
+
     def open_file(self, file_path=None):
         if not file_path:
             options = QFileDialog.Options()
@@ -128,20 +148,19 @@ class FileHandler:
                 clicked_button = msg_box.clickedButton()
 
                 if clicked_button == open_in_app_button:
-                    pdf_path = self.file_service.convert_odt_to_pdf(file_path)
-                    if pdf_path:
-                        self.create_new_pdf_tab(pdf_path, is_temporary=True)
-                        self.status_bar.showMessage(f"Successfully converted {os.path.basename(file_path)} to PDF.", 5000)
-                    else:
-                        QMessageBox.critical(self.main_window, "Conversion Error", "Could not convert ODT to PDF. Ensure LibreOffice is installed and try again.")
+                    self.convert_and_open(file_path)
                 elif clicked_button == open_externally_button:
                     QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
                 return
 
-            content = self.file_service.read_file(file_path)
-            self.create_new_tab(file_path, content)
-            self.status_bar.showMessage(f"Successfully loaded {os.path.basename(file_path)}", 5000)
-            self.sidebar.show_directory_in_explorer(file_path)
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"No such file: '{file_path}'")
+            if self.file_service.is_large_text_file(file_path):
+                self.create_large_file_tab(file_path)
+                self.status_bar.showMessage(f"Opened {os.path.basename(file_path)} in large-file mode", 5000)
+                self.sidebar.show_directory_in_explorer(file_path)
+                return
+            self.load_file_async(file_path)
         except FileNotFoundError as e:
             QMessageBox.critical(self.main_window, "File not found", str(e))
             self.status_bar.showMessage("Selected file was not found.", 5000)
@@ -150,6 +169,102 @@ class FileHandler:
             self.status_bar.showMessage("Failed to load file.", 5000)
 
 
+    def load_file_async(self, file_path):
+        """Open a tab for file_path right away and fill it once a worker has read the file."""
+        editor = self.create_new_tab(file_path)
+        editor.setReadOnly(True)
+        editor.setPlaceholderText(f"Loading {os.path.basename(file_path)}...")
+
+        worker = FileLoadWorker(self.file_service, file_path)
+        # Signals are matched by worker, not path: a stopped load of a file that
+        # was reopened must not touch the new tab.
+        worker.signals.progress.connect(partial(self.on_load_progress, worker))
+        worker.signals.finished.connect(partial(self.on_load_finished, worker))
+        worker.signals.error.connect(partial(self.on_load_failed, worker))
+        worker.signals.cancelled.connect(partial(self.on_load_cancelled, worker))
+        self.pending_loads[worker] = editor
+        self.status_bar.show_file_progress(f"Loading {os.path.basename(file_path)}")
+        self.main_window.thread_pool.start(worker)
+
+    def on_load_progress(self, worker, file_path, done, total):
+        if worker in self.pending_loads:
+            self.status_bar.show_file_progress(f"Loading {os.path.basename(file_path)}", done, total)
+
+    def on_load_finished(self, worker, file_path, content):
+        editor = self.pending_loads.pop(worker, None)
+        self.update_load_progress()
+        if editor is None:
+            return  # The tab was closed while loading
+        editor.setText(content)
+        editor.setPlaceholderText("")
+        editor.setReadOnly(False)
+        editor.document().setModified(False)
+        self.main_window.update_status_bar()
+        self.status_bar.showMessage(f"Successfully loaded {os.path.basename(file_path)}", 5000)
+        self.sidebar.show_directory_in_explorer(file_path)
+
+    def on_load_failed(self, worker, file_path, message):
+        if worker not in self.pending_loads:
+            return  # The tab was closed while loading
+        self.remove_placeholder_tab(worker)
+        QMessageBox.critical(self.main_window, "File load error", f"Failed to load {os.path.basename(file_path)}:\n{message}")
+        self.status_bar.showMessage("Failed to load file.", 5000)
+
+    def on_load_cancelled(self, worker, file_path):
+        if worker not in self.pending_loads:
+            return
+        self.remove_placeholder_tab(worker)
+        self.status_bar.showMessage(f"Cancelled loading {os.path.basename(file_path)}.", 3000)
+
+    def cancel_loads(self):
+        for worker in self.pending_loads:
+            worker.stop()
+
+    def is_loading(self, editor) -> bool:
+        """Whether editor is a placeholder tab whose file is still being read."""
+        return any(pending is editor for pending in self.pending_loads.values())
+
+    def remove_placeholder_tab(self, worker):
+        editor = self.pending_loads.pop(worker, None)
+        self.update_load_progress()
+        index = self.tab_widget.indexOf(editor) if editor is not None else -1
+        if index != -1:
+            self.close_tab(index)
+
+    def update_load_progress(self):
+        """Show the progress of a load still running, or hide the indicator."""
+        if self.pending_loads:
+            file_path = next(iter(self.pending_loads)).file_path
+            self.status_bar.show_file_progress(f"Loading {os.path.basename(file_path)}")
+        else:
+            self.status_bar.hide_file_progress()
+
+    def convert_and_open(self, source_path):
+        """Convert a document to PDF in the background and open the result in a tab when it is ready."""
+        if source_path in self.pending_conversions:
+            return
+        worker = ConversionWorker(self.file_service, source_path)
+        worker.signals.finished.connect(self.on_conversion_finished)
+        worker.signals.error.connect(self.on_conversion_failed)
+        self.pending_conversions[source_path] = worker
+        self.status_bar.showMessage(f"Converting {os.path.basename(source_path)} to PDF...")
+        self.main_window.thread_pool.start(worker)
+
+    def on_conversion_finished(self, source_path, pdf_path):
+        if not pdf_path:
+            self.on_conversion_failed(source_path, "")
+            return
+        self.pending_conversions.pop(source_path, None)
+        if not self.is_file_open(pdf_path):
+            self.create_new_pdf_tab(pdf_path, is_temporary=True)
+        self.status_bar.showMessage(f"Successfully converted {os.path.basename(source_path)} to PDF.", 5000)
+
+    def on_conversion_failed(self, source_path, message):
+        self.pending_conversions.pop(source_path, None)
+        self.status_bar.clearMessage()
+        details = f"\n\n{message}" if message else ""
+        QMessageBox.critical(self.main_window, "Conversion Error", f"Could not convert ODT to PDF. Ensure LibreOffice is installed and try again.{details}")
+
     def create_new_pdf_tab(self, file_path, is_temporary=False):
         """Creates a new tab with a PdfViewer."""
         viewer = PdfViewer(file_path=file_path)
@@ -180,14 +295,19 @@ class FileHandler:
         if not editor_widget:
             return True
 
-        # Clean up temporary PDF files from ODT conversions
-        if isinstance(editor_widget, PdfViewer) and editor_widget.is_temporary_file:
-            temp_dir = os.path.dirname(editor_widget.file_path)
-            if os.path.isdir(temp_dir):
-                shutil.rmtree(temp_dir, ignore_errors=True)
+        # A tab closed while its file is loading stops the read.
+        for worker, editor in list(self.pending_loads.items()):
+            if editor is editor_widget:
+                worker.stop()
+                del self.pending_loads[worker]
+                self.update_load_progress()
+
+        # PDFs converted from ODT stay in the conversion cache for the next time the file is opened.
+        if isinstance(editor_widget, PdfViewer):
+            editor_widget.close_document()
 
         # Check for modifications only if it's an editor
-        if isinstance(editor_widget, EditorArea) and editor_widget.document().isModified():
+        if isinstance(editor_widget, (EditorArea, LargeFileEditor)) and editor_widget.document().isModified():
             file_name = self.tab_widget.tabText(index).replace('*', '')
             reply = QMessageBox.question(self.main_window, 'Save Changes?', f"Do you want to save the changes you made to '{file_name}'?", QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel, QMessageBox.Save)
             if reply == QMessageBox.Save:
@@ -196,6 +316,8 @@ class FileHandler:
             elif reply == QMessageBox.Cancel:
                 return False
 
+        if isinstance(editor_widget, LargeFileEditor):
+            editor_widget.close_file()
         self.tab_widget.removeTab(index)
         editor_widget.deleteLater()
         
@@ -209,10 +331,14 @@ class FileHandler:
         if index is None: index = self.tab_widget.currentIndex()
         editor = self.tab_widget.widget(index)
         if not editor: return False
+        if self.refuse_save_while_loading(editor): return False
 
         if editor.file_path:
             try:
-                self.file_service.save_text_file(editor.file_path, editor.toPlainText())
+                if isinstance(editor, LargeFileEditor):
+                    editor.save()  # Streams the piece table instead of building the text
+                else:
+                    self.file_service.save_text_file(editor.file_path, editor.toPlainText())
                 editor.document().setModified(False)
                 if index == self.tab_widget.currentIndex():
                     self.status_bar.showMessage(f"Saved to {os.path.basename(editor.file_path)}", 3000)
@@ -223,10 +349,18 @@ class FileHandler:
         else:
             return self.save_file_as(index=index)
 
+    def refuse_save_while_loading(self, editor) -> bool:
+        """A placeholder tab is still empty; saving it would truncate the file being read."""
+        if not self.is_loading(editor):
+            return False
+        self.status_bar.showMessage(f"Wait for {os.path.basename(editor.file_path)} to finish loading before saving.", 5000)
+        return True
+
     def save_file_as(self, index=None):
         if index is None: index = self.tab_widget.currentIndex()
         editor = self.tab_widget.widget(index)
         if not editor: return False
+        if self.refuse_save_while_loading(editor): return False
 
         current_name = os.path.basename(editor.file_path) if editor.file_path else ""
         file_path, _ = QFileDialog.getSaveFileName(self.main_window, "Save File As", current_name, "Text Files (*.txt);;Markdown Files (*.md);;All Files (*)", options=QFileDialog.Options())
@@ -0,0 +1,73 @@
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from services.file_service import FileService, ReadCancelled
+
+
+class FileWorkerSignals(QObject):
+    finished = pyqtSignal(str, object)  # (source path, result)
+    error = pyqtSignal(str, str)  # (source path, message)
+    progress = pyqtSignal(str, int, int)  # (source path, done, total)
+    cancelled = pyqtSignal(str)
+
+
+class ConversionWorker(QRunnable):
+    """Converts a document to PDF through FileService without blocking the GUI.
+
+    finished carries the path of the PDF, or None when LibreOffice produced no file.
+    """
+
+    def __init__(self, file_service: FileService, source_path: str):
+        super().__init__()
+        self.file_service = file_service
+        self.source_path = source_path
+        self.signals = FileWorkerSignals()
+
+    def run(self):
+        try:
+            pdf_path = self.file_service.convert_odt_to_pdf(self.source_path)
+        except Exception as e:
+            self.signals.error.emit(self.source_path, str(e))
+            return
+        self.signals.finished.emit(self.source_path, pdf_path)
+
+
+class FileLoadWorker(QRunnable):
+    """Reads and parses a file through FileService without blocking the GUI.
+
+    Progress is emitted whenever the rounded percentage changes; stop() makes
+    the read end at its next progress report and emit cancelled instead.
+    """
+
+    def __init__(self, file_service: FileService, file_path: str):
+        super().__init__()
+        self.file_service = file_service
+        self.file_path = file_path
+        self.signals = FileWorkerSignals()
+        self._stopped = threading.Event()
+        self._last_percent = None
+
+    def stop(self):
+        self._stopped.set()
+
+    def on_progress(self, done, total):
+        if self._stopped.is_set():
+            raise ReadCancelled()
+        percent = 100 * done // total if total else 0
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.signals.progress.emit(self.file_path, done, total)
+
+    def run(self):
+        try:
+            content = self.file_service.read_file(self.file_path, progress_callback=self.on_progress)
+        except ReadCancelled:
+            self.signals.cancelled.emit(self.file_path)
+            return
+        except Exception as e:
+            self.signals.error.emit(self.file_path, str(e))
+            return
+        if self._stopped.is_set():
+            self.signals.cancelled.emit(self.file_path)
+        else:
+            self.signals.finished.emit(self.file_path, content)
@@ -0,0 +1,158 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QHBoxLayout, QPlainTextEdit, QScrollBar, QWidget
+from services.piece_table import LargeTextFile
+
+
+class LargeFileEditor(QWidget):
+    """
+    Plain-text editor for files too big to load into an EditorArea.
+
+    The file is memory-mapped and edited through a piece table; only a window
+    of WINDOW_LINES lines around the viewport is materialized in a
+    QPlainTextEdit. The scroll bar beside it spans the whole file, and when
+    the viewport gets within EDGE_LINES of either end of the window, the
+    window's edits are written back to the piece table and a new window is
+    loaded around the viewport. Undo history covers the current window only.
+    """
+    WINDOW_LINES = 2000
+    EDGE_LINES = 200
+    is_large_file = True
+
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.text_file = LargeTextFile(file_path)
+        self.first_line = 0  # File line shown on the window's first line
+        self.window_lines = 0  # File lines the window was loaded from
+        self.loaded_lines = []  # Their text as loaded, to find the lines edited since
+        self.window_dirty = False
+        self._loading = False
+
+        self.view = QPlainTextEdit()
+        self.view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.scroll_bar = QScrollBar(Qt.Vertical)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self.view)
+        layout.addWidget(self.scroll_bar)
+
+        self.view.document().contentsChanged.connect(self.on_window_edited)
+        self.view.verticalScrollBar().valueChanged.connect(self.on_view_scrolled)
+        self.scroll_bar.valueChanged.connect(self.scroll_to_line)
+        self.load_window(0)
+
+    def document(self):
+        return self.view.document()
+
+    def textCursor(self):
+        return self.view.textCursor()
+
+    def setFont(self, font):
+        self.view.setFont(font)
+        self.update_scroll_range()  # The line height, and with it the lines per page, changed
+
+    def line_count(self) -> int:
+        return self.text_file.table.line_count
+
+    def visible_lines(self) -> int:
+        return max(1, self.view.viewport().height() // max(1, self.view.fontMetrics().lineSpacing()))
+
+    def on_window_edited(self):
+        if not self._loading:
+            self.window_dirty = True
+
+    def commit_window(self):
+        """Write the window's edited lines back to the piece table; the others keep their original bytes."""
+        if not self.window_dirty:
+            return
+        lines = self.view.toPlainText().split("\n")
+        self.text_file.table.update_lines(self.first_line, self.loaded_lines, lines)
+        self.loaded_lines = lines
+        self.window_lines = len(lines)
+        self.window_dirty = False
+
+    def load_window(self, first_line):
+        """Show the WINDOW_LINES lines from first_line, keeping the cursor on the same file line."""
+        self.commit_window()
+        cursor = self.view.textCursor()
+        cursor_line = self.first_line + cursor.blockNumber()
+        cursor_column = cursor.positionInBlock()
+        modified = self.document().isModified() or self.text_file.table.modified
+
+        table = self.text_file.table
+        self.first_line = max(0, min(first_line, table.line_count - self.WINDOW_LINES))
+        lines = table.lines(self.first_line, self.first_line + self.WINDOW_LINES)
+        self._loading = True
+        try:
+            self.view.setPlainText("\n".join(lines))
+            self.loaded_lines = lines
+            self.window_lines = len(lines)
+            self.window_dirty = False
+            self.document().setModified(modified)
+
+            block = self.document().findBlockByNumber(min(max(0, cursor_line - self.first_line), self.window_lines - 1))
+            cursor = QTextCursor(block)
+            cursor.setPosition(block.position() + min(cursor_column, block.length() - 1))
+            self.view.setTextCursor(cursor)
+        finally:
+            self._loading = False
+        self.update_scroll_range()
+
+    def update_scroll_range(self):
+        visible = self.visible_lines()
+        self.scroll_bar.blockSignals(True)
+        self.scroll_bar.setRange(0, max(0, self.line_count() - visible))
+        self.scroll_bar.setPageStep(visible)
+        self.scroll_bar.blockSignals(False)
+
+    def scroll_to_line(self, line):
+        """Scroll the viewport to start at a file line, moving the window if it is outside it."""
+        visible = self.visible_lines()
+        window_end = self.first_line + self.document().blockCount()
+        if not self.first_line <= line <= window_end - visible:
+            self.load_window(line - self.WINDOW_LINES // 2)
+        self.show_window_line(line)
+
+    def show_window_line(self, line):
+        self._loading = True  # Scrolling within the window needs no reload
+        try:
+            self.view.verticalScrollBar().setValue(line - self.first_line)
+        finally:
+            self._loading = False
+
+    def on_view_scrolled(self, value):
+        if self._loading:
+            return
+        top_line = self.first_line + value
+        self.scroll_bar.blockSignals(True)
+        self.scroll_bar.setValue(top_line)
+        self.scroll_bar.blockSignals(False)
+
+        near_start = value < self.EDGE_LINES and self.first_line > 0
+        near_end = (value + self.visible_lines() > self.document().blockCount() - self.EDGE_LINES
+                    and self.first_line + self.window_lines < self.line_count())
+        if near_start or near_end:
+            self.load_window(top_line - self.WINDOW_LINES // 2)
+            self.show_window_line(top_line)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scroll_range()
+
+    def save(self, file_path=None):
+        """Write the file through the piece table and reload the window from the saved file."""
+        self.commit_window()
+        if file_path:
+            self.file_path = file_path
+        top_line = self.scroll_bar.value()
+        self.text_file.save(self.file_path)
+        self.document().setModified(False)
+        self.load_window(self.first_line)
+        self.show_window_line(top_line)
+
+    def close_file(self):
+        self.text_file.close()
@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QMainWindow, QFileDialog, QApplication, QAction, QTextEdit, QWidget, QHBoxLayout, QLineEdit, QPushButton, QCheckBox, QVBoxLayout, QTabWidget, QLabel, QMessageBox
-from PyQt5.QtCore import Qt, QThreadPool
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
 from PyQt5.QtGui import QFont, QTextOption, QDesktopServices, QTextDocument, QTextCursor, QKeySequence
 import re
 from PyQt5.QtPrintSupport import QPrinter
@@ -7,22 +7,33 @@ from PyQt5.QtCore import QUrl
 from view.menu_bar import MenuBar
 from view.side_bar import SideBar
 from view.editor_area import EditorArea
+from view.large_file_editor import LargeFileEditor
 from view.settings_manager import SettingsManager
 from view.settings_model import SettingsModel
 from view.status_bar import StatusBar
 from view.ui_controller import UIController
-from view.ai_workers import SummarizationWorker, KeyPointsWorker, PreloadWorker
-from services.search_service import SearchService
+from view.search_workers import MatchScanWorker, ReplaceScanWorker, SelectionReplaceWorker
+from view.ai_workers import SummarizationWorker, KeyPointsWorker, PreloadWorker, BatchSummarizationWorker, AIJobSignals
+from services.job_scheduler import JobScheduler, JobPriority
+from services import model_backends
+from services.model_registry import registry as model_registry
+from services.lazy_imports import transformers
+from services.search_service import SearchQuery, SearchService, SearchTimeout
 from services.lifecycle import LifecycleService
 import os
 
 class MainWindow(QMainWindow):
+    PRELOAD_DELAY_MS = 1000
+    LIVE_KEY_POINTS_DELAY_MS = 1500
+    FIND_INDEX_DELAY_MS = 150
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("StudyMate")
         self.setGeometry(100, 100, 1400, 900)
         self.sidebar_width = 300 # Default/initial width
         self.thread_pool = QThreadPool()
+        self.summary_worker = None
 
         # Menu Bar
         self.menu_bar = MenuBar(self)
@@ -48,6 +59,11 @@ class MainWindow(QMainWindow):
         self.replace_input = QLineEdit(self)
         self.replace_input.setPlaceholderText("Replace with...")
         self.find_case_sensitive_checkbox = QCheckBox("Case Sensitive", self)
+        self.find_regex_checkbox = QCheckBox("Regex", self)
+        self.find_whole_word_checkbox = QCheckBox("Whole Word", self)
+        self.find_multiline_checkbox = QCheckBox("Multiline", self)
+        self.find_multiline_checkbox.setToolTip("Let matches span line breaks; with Regex, \".\" also matches them")
+        self.find_count_label = QLabel(self)  # "n of N" for the editor's match index
         self.find_next_button = QPushButton("Next", self)
         self.find_prev_button = QPushButton("Previous", self)
         self.replace_button = QPushButton("Replace", self)
@@ -61,6 +77,10 @@ class MainWindow(QMainWindow):
         find_v_layout.addWidget(self.replace_input)
         find_layout.addLayout(find_v_layout)
         find_layout.addWidget(self.find_case_sensitive_checkbox)
+        find_layout.addWidget(self.find_regex_checkbox)
+        find_layout.addWidget(self.find_whole_word_checkbox)
+        find_layout.addWidget(self.find_multiline_checkbox)
+        find_layout.addWidget(self.find_count_label)
         find_layout.addWidget(self.find_next_button)
         find_layout.addWidget(self.find_prev_button)
         find_layout.addWidget(self.replace_button)
@@ -93,6 +113,28 @@ class MainWindow(QMainWindow):
         # Controller and handlers (must be initialized after widgets and settings)
         self.ui_controller = UIController(self)
         self.file_handler = self.ui_controller.file_handler
+        self.inference_backend = self.ui_controller.inference_backend
+
+        # AI jobs go through a scheduler that coalesces, supersedes and prioritizes them.
+        self.ai_job_signals = AIJobSignals()
+        self.ai_job_signals.stats_changed.connect(self.status_bar.update_ai_queue_info)
+        self.job_scheduler = JobScheduler(on_stats_changed=self.ai_job_signals.stats_changed.emit)
+
+        # Live key points refresh once typing pauses; only edited paragraphs are re-analyzed.
+        self.live_key_points_timer = QTimer(self)
+        self.live_key_points_timer.setSingleShot(True)
+        self.live_key_points_timer.setInterval(self.LIVE_KEY_POINTS_DELAY_MS)
+        self.live_key_points_timer.timeout.connect(self.refresh_live_key_points)
+
+        # The find query is indexed in the background once typing in the find bar pauses.
+        self.match_scan_worker = None
+        self.replace_scan_worker = None
+        self.find_error = None  # re.error or SearchTimeout of the find query, shown instead of the match count
+        self.pending_find = None  # find_next or find_previous, run once the index being built is ready
+        self.find_index_timer = QTimer(self)
+        self.find_index_timer.setSingleShot(True)
+        self.find_index_timer.setInterval(self.FIND_INDEX_DELAY_MS)
+        self.find_index_timer.timeout.connect(self.rebuild_match_index)
 
         # Connect signals that depend on handlers
         self.tab_widget.tabCloseRequested.connect(self.file_handler.close_tab)
@@ -105,12 +147,16 @@ class MainWindow(QMainWindow):
         self.replace_button.clicked.connect(self.replace_current)
         self.replace_and_find_button.clicked.connect(self.replace_and_find)
         self.replace_all_button.clicked.connect(self.replace_all)
-        close_find_button.clicked.connect(self.find_bar.hide)
+        close_find_button.clicked.connect(self.close_find_bar)
+        self.find_input.textChanged.connect(self.schedule_match_index)
+        for checkbox in (self.find_case_sensitive_checkbox, self.find_regex_checkbox, self.find_whole_word_checkbox, self.find_multiline_checkbox):
+            checkbox.toggled.connect(self.schedule_match_index)
 
         self.connect_signals()
 
-        # Preload AI models in the background
-        self.preload_models()
+        # Preload AI models in the background once the window is up, so importing
+        # transformers never competes with the first paint.
+        QTimer.singleShot(self.PRELOAD_DELAY_MS, self.preload_models)
 
     def current_editor(self) -> EditorArea:
         """Returns the currently active EditorArea widget."""
@@ -124,9 +170,31 @@ class MainWindow(QMainWindow):
         """Handles logic when the active tab changes."""
         self.update_window_title()
         self.update_status_bar()
+        self.schedule_match_index()
+        # Results for a tab that is no longer shown would only overwrite the AI panel.
+        current_id = id(self.tab_widget.currentWidget())
+        self.job_scheduler.cancel(lambda job: job.priority == JobPriority.INTERACTIVE and job.document_id != current_id)
+        if self.sidebar.live_key_points_checkbox.isChecked():
+            self.live_key_points_timer.start()
 
     def preload_models(self):
-        self.thread_pool.start(PreloadWorker())
+        if not transformers.is_available():
+            return  # Nothing to preload; AI requests report the missing package when made
+        worker = PreloadWorker(self.inference_backend)
+        self.job_scheduler.submit("preload", None, None, worker.run, JobPriority.BACKGROUND)
+
+    def schedule_ai_worker(self, kind, editor, request_key, worker):
+        """Queues an AI worker's computation as an interactive job for the given editor."""
+        return self.job_scheduler.submit(
+            kind,
+            id(editor),
+            request_key,
+            worker.compute,
+            JobPriority.INTERACTIVE,
+            on_finished=worker.signals.finished.emit,
+            on_error=lambda message: worker.signals.error.emit(f"{worker.error_prefix}: {message}"),
+            on_cancelled=worker.signals.cancelled.emit,
+        )
 
     def closeEvent(self, event):
         """Handles the window close event."""
@@ -134,6 +202,9 @@ class MainWindow(QMainWindow):
             event.ignore()
             return
 
+        self.job_scheduler.shutdown()
+        self.inference_backend.shutdown()
+        self.ui_controller.document_converter.close()
         event.accept()
 
     def connect_signals(self):
@@ -187,7 +258,16 @@ class MainWindow(QMainWindow):
         # --- Sidebar signals ---
         # AI Tab
         self.sidebar.summarize_button.clicked.connect(self.run_summarization)
+        self.sidebar.stop_summary_button.clicked.connect(self.stop_summarization)
         self.sidebar.key_points_button.clicked.connect(self.run_key_points_extraction)
+        self.sidebar.live_key_points_checkbox.toggled.connect(self.set_live_key_points)
+        self.sidebar.restart_ai_button.clicked.connect(self.restart_ai_engine)
+        self.sidebar.summarize_tabs_button.clicked.connect(self.summarize_open_tabs)
+        self.sidebar.summarize_selection_button.clicked.connect(self.summarize_selected_files)
+        self.sidebar.batch_size_spinbox.valueChanged.connect(self.set_ai_batch_size)
+        self.sidebar.ai_backend_combo.currentIndexChanged.connect(self.set_ai_backend)
+        self.sidebar.model_memory_spinbox.valueChanged.connect(self.set_ai_model_memory)
+        self.sidebar.idle_unload_spinbox.valueChanged.connect(self.set_ai_idle_unload)
         self.sidebar.gemini_button.clicked.connect(lambda: self.open_external_link("https://gemini.google.com/"))
         self.sidebar.chatgpt_button.clicked.connect(lambda: self.open_external_link("https://chat.openai.com/"))
         self.sidebar.copilot_button.clicked.connect(lambda: self.open_external_link("https://copilot.microsoft.com/"))
@@ -221,7 +301,7 @@ class MainWindow(QMainWindow):
     def on_modification_changed(self, editor, modified):
         """Updates the tab title with an asterisk when modified."""
         widget = editor
-        if not isinstance(widget, EditorArea): # Should always be an editor, but good practice to check
+        if not isinstance(widget, (EditorArea, LargeFileEditor)): # Should always be an editor, but good practice to check
             return
 
         index = self.tab_widget.indexOf(widget)
@@ -248,30 +328,104 @@ class MainWindow(QMainWindow):
             self.sidebar.summary_output.setText("Editor is empty. Nothing to summarize.")
             return
 
-        self.sidebar.summarize_button.setEnabled(False)
-        self.sidebar.summary_output.setPlaceholderText("Summarizing... (this may take a moment on first run)")
-        self.status_bar.showMessage("Starting summarization...")
-
         length_option = self.sidebar.summary_length_combo.currentText()
 
-        worker = SummarizationWorker(text_to_summarize, length_option)
+        worker = SummarizationWorker(text_to_summarize, length_option, self.inference_backend, stream=True, chunks=list(editor.analysis.chunks))
+        worker.signals.partial.connect(self.on_summarization_partial)
         worker.signals.finished.connect(self.on_summarization_finished)
         worker.signals.error.connect(self.on_summarization_error)
-        self.thread_pool.start(worker)
+        worker.signals.cancelled.connect(self.on_summarization_cancelled)
+        # A superseded job should stop generating instead of running to the end.
+        worker.signals.cancelled.connect(worker.stop)
+        job = self.schedule_ai_worker("summarize", editor, (hash(text_to_summarize), length_option), worker)
+        if job.func == worker.compute:
+            # Not coalesced into an already running job; stream into a fresh output.
+            self.summary_worker = worker
+            self.sidebar.summary_output.clear()
+        self.sidebar.stop_summary_button.setEnabled(True)
+
+        self.sidebar.summary_output.setPlaceholderText("Summarizing... (this may take a moment on first run)")
+        self.status_bar.showMessage("Starting summarization...")
+
+    def stop_summarization(self):
+        if self.summary_worker is not None:
+            self.summary_worker.stop()
+        self.sidebar.stop_summary_button.setEnabled(False)
+        self.status_bar.showMessage("Stopping summarization...", 3000)
+
+    def on_summarization_partial(self, text):
+        output = self.sidebar.summary_output
+        cursor = output.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        output.setTextCursor(cursor)
+        output.ensureCursorVisible()
 
     def on_summarization_finished(self, summary):
         self.sidebar.summary_output.setText(summary)
-        self.sidebar.summarize_button.setEnabled(True)
+        self.sidebar.stop_summary_button.setEnabled(False)
         self.status_bar.showMessage("Summarization complete.", 5000)
         self.sidebar.summary_output.setPlaceholderText("Summary will appear here...")
 
     def on_summarization_error(self, error_message):
         self.sidebar.summary_output.setText(error_message)
-        self.sidebar.summarize_button.setEnabled(True)
+        self.sidebar.stop_summary_button.setEnabled(False)
         self.status_bar.showMessage("Summarization error.", 5000)
         self.sidebar.summary_output.setPlaceholderText("Summary will appear here...")
 
-    def run_key_points_extraction(self):
+    def on_summarization_cancelled(self):
+        self.sidebar.stop_summary_button.setEnabled(False)
+        self.status_bar.showMessage("Summarization cancelled.", 3000)
+        self.sidebar.summary_output.setPlaceholderText("Summary will appear here...")
+
+    def summarize_open_tabs(self):
+        sources = []
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            if isinstance(widget, EditorArea):
+                sources.append((self.tab_widget.tabText(i).rstrip('*'), widget.file_path, widget.toPlainText()))
+        self.run_batch_summarization(sources)
+
+    def summarize_selected_files(self):
+        paths = self.sidebar.selected_explorer_files()
+        if not paths:
+            self.status_bar.showMessage("Select one or more files in the Explore tab first.", 3000)
+            return
+        self.run_batch_summarization([(os.path.basename(path), path, None) for path in paths])
+
+    def run_batch_summarization(self, sources):
+        """Summarizes several documents as one job, batching them through the model."""
+        if not sources:
+            self.status_bar.showMessage("No documents to summarize.", 3000)
+            return
+
+        length_option = self.sidebar.summary_length_combo.currentText()
+        worker = BatchSummarizationWorker(sources, length_option, self.settings_model.ai_batch_size, self.inference_backend, self.ui_controller.file_service)
+        worker.signals.progress.connect(self.on_batch_summarization_progress)
+        worker.signals.finished.connect(self.on_summarization_finished)
+        worker.signals.error.connect(self.on_summarization_error)
+        worker.signals.cancelled.connect(self.on_summarization_cancelled)
+        request_key = (tuple((path, hash(text)) for _, path, text in sources), length_option)
+        # A batch spans several documents, so switching tabs must not cancel it;
+        # BACKGROUND also keeps single-document requests ahead of it.
+        self.job_scheduler.submit(
+            "batch_summarize",
+            None,
+            request_key,
+            worker.compute,
+            JobPriority.BACKGROUND,
+            on_finished=worker.signals.finished.emit,
+            on_error=lambda message: worker.signals.error.emit(f"{worker.error_prefix}: {message}"),
+            on_cancelled=worker.signals.cancelled.emit,
+        )
+
+        self.sidebar.summary_output.setPlaceholderText(f"Summarizing {len(sources)} documents...")
+        self.status_bar.showMessage(f"Starting batch summarization of {len(sources)} documents...")
+
+    def on_batch_summarization_progress(self, done, total):
+        self.status_bar.showMessage(f"Batch summarization: {done}/{total} documents")
+
+    def run_key_points_extraction(self, live=False):
         editor = self.current_editor()
         if not editor: return
         text_to_analyze = editor.toPlainText()
@@ -279,31 +433,60 @@ class MainWindow(QMainWindow):
             self.sidebar.summary_output.setText("Editor is empty. Nothing to analyze.")
             return
 
-        self.sidebar.key_points_button.setEnabled(False)
-        self.sidebar.summary_output.setText("Extracting key points...")
-        self.status_bar.showMessage("Starting key points extraction...")
-
-
-        worker = KeyPointsWorker(text_to_analyze)
+        worker = KeyPointsWorker(text_to_analyze, self.inference_backend, chunks=list(editor.analysis.chunks))
         worker.signals.finished.connect(self.on_key_points_finished)
         worker.signals.error.connect(self.on_key_points_error)
-        self.thread_pool.start(worker)
+        worker.signals.cancelled.connect(self.on_key_points_cancelled)
+        self.schedule_ai_worker("key_points", editor, hash(text_to_analyze), worker)
+
+        if not live:
+            # Live refreshes keep showing the previous key points until the new ones arrive.
+            self.sidebar.summary_output.setText("Extracting key points...")
+            self.status_bar.showMessage("Starting key points extraction...")
+
+    def set_live_key_points(self, enabled):
+        self.settings_model.update_ai_live_key_points(enabled)
+        self.settings_model.save(self.settings_manager)
+        if enabled:
+            self.refresh_live_key_points()
+        else:
+            self.live_key_points_timer.stop()
+
+    def on_editor_contents_changed(self, editor):
+        if self.sidebar.live_key_points_checkbox.isChecked() and editor is self.current_editor():
+            self.live_key_points_timer.start()
+        # Edits the editor couldn't apply to its match index (or made while it was being built)
+        if editor.match_index is None and editor is self.current_editor() and self.find_input.text():
+            self.schedule_match_index()
+
+    def refresh_live_key_points(self):
+        if self.sidebar.live_key_points_checkbox.isChecked() and self.current_editor() is not None:
+            self.run_key_points_extraction(live=True)
 
     def on_key_points_finished(self, key_points_text):
         self.sidebar.summary_output.setText(key_points_text)
-        self.sidebar.key_points_button.setEnabled(True)
         self.status_bar.showMessage("Key points extraction complete.", 5000)
 
     def on_key_points_error(self, error_message):
         self.sidebar.summary_output.setText(error_message)
-        self.sidebar.key_points_button.setEnabled(True)
         self.status_bar.showMessage("Key points extraction error.", 5000)
 
+    def on_key_points_cancelled(self):
+        self.status_bar.showMessage("Key points extraction cancelled.", 3000)
+
+    def restart_ai_engine(self):
+        """Kills the inference processes; running requests fail and models reload on next use."""
+        self.inference_backend.restart()
+        self.status_bar.showMessage("AI engine restarted.", 5000)
+
     def suggest_study_plan(self):
         # Placeholder for adaptive scheduler logic
         self.sidebar.schedule_output.setPlainText("Feature coming soon!\n\nThis will analyze your notes and suggest a study plan based on topics and your activity.")
 
     def editor_zoom_in(self):
+        if isinstance(self.tab_widget.currentWidget(), LargeFileEditor):
+            self.set_editor_font_size(self.settings_model.editor_font_size + 1)
+            return
         editor = self.current_editor()
         if not editor: return
         editor.zoomIn()
@@ -311,6 +494,9 @@ class MainWindow(QMainWindow):
         self.set_editor_font_size(current_size)
 
     def editor_zoom_out(self):
+        if isinstance(self.tab_widget.currentWidget(), LargeFileEditor):
+            self.set_editor_font_size(max(1, self.settings_model.editor_font_size - 1))
+            return
         editor = self.current_editor()
         if not editor: return
         editor.zoomOut()
@@ -476,6 +662,28 @@ class MainWindow(QMainWindow):
         self.apply_sidebar_width(self.settings_model.sidebar_width)
         self.apply_sidebar_font_size(self.settings_model.sidebar_font_size)
 
+        self.sidebar.batch_size_spinbox.blockSignals(True)
+        self.sidebar.batch_size_spinbox.setValue(self.settings_model.ai_batch_size)
+        self.sidebar.batch_size_spinbox.blockSignals(False)
+
+        backend_index = max(0, self.sidebar.ai_backend_combo.findData(self.settings_model.ai_backend))
+        self.sidebar.ai_backend_combo.blockSignals(True)
+        self.sidebar.ai_backend_combo.setCurrentIndex(backend_index)
+        self.sidebar.ai_backend_combo.blockSignals(False)
+        model_backends.set_current(self.sidebar.ai_backend_combo.itemData(backend_index))
+
+        for spinbox, value in ((self.sidebar.model_memory_spinbox, self.settings_model.ai_model_memory_mb),
+                               (self.sidebar.idle_unload_spinbox, self.settings_model.ai_idle_unload_minutes)):
+            spinbox.blockSignals(True)
+            spinbox.setValue(value)
+            spinbox.blockSignals(False)
+        model_registry.configure(max_bytes=self.settings_model.ai_model_memory_mb * 1024 * 1024,
+                                 idle_timeout=self.settings_model.ai_idle_unload_minutes * 60)
+
+        self.sidebar.live_key_points_checkbox.blockSignals(True)
+        self.sidebar.live_key_points_checkbox.setChecked(self.settings_model.ai_live_key_points)
+        self.sidebar.live_key_points_checkbox.blockSignals(False)
+
         self.sidebar.word_wrap_checkbox.setChecked(self.settings_model.word_wrap)
         self.apply_word_wrap(Qt.Checked if self.settings_model.word_wrap else Qt.Unchecked)
 
@@ -506,7 +714,7 @@ class MainWindow(QMainWindow):
         new_font = QFont(font_family, self.settings_model.editor_font_size)
         for i in range(self.tab_widget.count()):
             widget = self.tab_widget.widget(i)
-            if isinstance(widget, EditorArea):
+            if isinstance(widget, (EditorArea, LargeFileEditor)):
                 widget.setFont(new_font)
 
     def set_editor_font_size(self, size):
@@ -525,6 +733,8 @@ class MainWindow(QMainWindow):
             widget = self.tab_widget.widget(i)
             if isinstance(widget, EditorArea):
                 widget.setFontPointSize(size)
+            elif isinstance(widget, LargeFileEditor):
+                widget.setFont(QFont(self.settings_model.editor_font_family, size))
 
     def change_sidebar_width(self, delta):
         current_width = int(self.sidebar.sidebar_width_label.text())
@@ -571,6 +781,30 @@ class MainWindow(QMainWindow):
             if isinstance(widget, EditorArea):
                 widget.setWordWrapMode(mode)
 
+    def set_ai_batch_size(self, size):
+        self.settings_model.update_ai_batch_size(size)
+        self.settings_model.save(self.settings_manager)
+
+    def set_ai_backend(self, index):
+        backend = self.sidebar.ai_backend_combo.itemData(index)
+        self.settings_model.update_ai_backend(backend)
+        self.settings_model.save(self.settings_manager)
+        # Worker processes reload their models with the new backend on their next request.
+        if model_backends.current() != backend:
+            model_backends.set_current(backend)
+            self.status_bar.showMessage(f"AI backend set to {self.sidebar.ai_backend_combo.currentText()}.", 3000)
+
+    def set_ai_model_memory(self, size_mb):
+        self.settings_model.update_ai_model_memory_mb(size_mb)
+        self.settings_model.save(self.settings_manager)
+        # Worker processes pick the new budget up with their next request.
+        model_registry.configure(max_bytes=size_mb * 1024 * 1024)
+
+    def set_ai_idle_unload(self, minutes):
+        self.settings_model.update_ai_idle_unload_minutes(minutes)
+        self.settings_model.save(self.settings_manager)
+        model_registry.configure(idle_timeout=minutes * 60)
+
     def print_file(self):
         editor = self.current_editor()
         if not editor: return
@@ -602,7 +836,166 @@ class MainWindow(QMainWindow):
 
     # --- Placeholder Methods for Menu Actions ---
     
+    def current_pdf_viewer(self):
+        """Returns the currently active PdfViewer widget, or None."""
+        widget = self.tab_widget.currentWidget()
+        return widget if getattr(widget, "is_pdf_viewer", False) else None
+
+    def find_in_pdf(self, viewer, backward=False):
+        query = self.find_input.text()
+        if not query.strip():
+            self.status_bar.showMessage("Enter search text before finding.", 3000)
+            return
+
+        if viewer.find_text(query, backward):
+            message = f"Match on page {viewer.search_hit[0] + 1}"
+        else:
+            message = f"No matches found for '{query}'"
+        if not viewer.is_text_indexed():
+            message += f" (indexed {viewer.text_index.page_count} of {len(viewer.page_sizes)} pages so far)"
+        self.status_bar.showMessage(message, 3000)
+
+    def close_find_bar(self):
+        self.find_bar.hide()
+        viewer = self.current_pdf_viewer()
+        if viewer:
+            viewer.clear_search()
+        self.find_index_timer.stop()
+        self.stop_match_scan()
+        self.stop_replace_scan()
+        self.find_error = None
+        self.clear_match_indexes()
+        self.update_match_count()
+
+    def schedule_match_index(self):
+        if self.find_bar.isVisible():
+            self.find_index_timer.start()
+
+    def clear_match_indexes(self, keep=None):
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            if isinstance(widget, EditorArea) and widget is not keep and widget.match_index is not None:
+                widget.set_match_index(None)
+
+    def current_search(self):
+        return SearchQuery(
+            self.find_input.text(),
+            case_sensitive=self.find_case_sensitive_checkbox.isChecked(),
+            regex=self.find_regex_checkbox.isChecked(),
+            whole_word=self.find_whole_word_checkbox.isChecked(),
+            multiline=self.find_multiline_checkbox.isChecked(),
+        )
+
+    def current_match_index(self, editor):
+        """The editor's match index if it is for the find bar's current query and options, else None."""
+        index = editor.match_index
+        if index is None or index.search != self.current_search():
+            return None
+        return index
+
+    def stop_match_scan(self):
+        self.pending_find = None
+        if self.match_scan_worker is not None:
+            self.match_scan_worker.stop()
+            self.match_scan_worker = None
+
+    def rebuild_match_index(self):
+        """Index the find query's matches in the current editor on a worker thread."""
+        editor = self.current_editor()
+        self.clear_match_indexes(keep=editor)
+        self.stop_match_scan()
+        self.find_error = None
+        search = self.current_search()
+        if editor is None or not search.text:
+            if editor is not None:
+                editor.set_match_index(None)
+            self.update_match_count()
+            return
+        if self.current_match_index(editor) is not None:
+            self.update_match_count()  # Kept up to date as the text is edited
+            return
+
+        editor.set_match_index(None)
+        try:
+            search.pattern()  # Compiled (and cached) here, so the worker never sees an invalid pattern
+        except re.error as e:
+            self.find_error = e
+            self.update_match_count()
+            return
+        worker = MatchScanWorker(editor, editor.toPlainText(), search, editor.document().revision())
+        worker.signals.finished.connect(lambda index, worker=worker: self.on_match_index_built(worker, index))
+        worker.signals.error.connect(lambda error, worker=worker: self.on_match_scan_failed(worker, error))
+        self.match_scan_worker = worker
+        self.thread_pool.start(worker)
+
+    def on_match_index_built(self, worker, index):
+        if worker is not self.match_scan_worker:
+            return  # Superseded by a newer query or tab
+        self.match_scan_worker = None
+        pending_find, self.pending_find = self.pending_find, None
+        if worker.editor is not self.current_editor():
+            return
+        if worker.editor.document().revision() != worker.revision:
+            self.rebuild_match_index()  # Edited while scanning
+            self.pending_find = pending_find
+            return
+        worker.editor.set_match_index(index)
+        self.update_match_count()
+        if pending_find is not None:
+            pending_find()
+
+    def on_match_scan_failed(self, worker, error):
+        if worker is not self.match_scan_worker:
+            return
+        self.match_scan_worker = None
+        self.pending_find = None
+        self.find_error = error
+        self.update_match_count()
+        self.show_search_error(error)
+
+    def wait_for_match_index(self, find):
+        """Run find once the query is indexed, instead of scanning the document on the GUI thread."""
+        if self.find_error is not None:
+            self.show_search_error(self.find_error)
+            return
+        if self.match_scan_worker is None:
+            self.find_index_timer.stop()
+            self.rebuild_match_index()
+            if self.find_error is not None:
+                self.show_search_error(self.find_error)
+                return
+        self.pending_find = find
+        self.status_bar.showMessage("Searching...", 2000)
+
+    def update_match_count(self):
+        editor = self.current_editor()
+        index = self.current_match_index(editor) if editor and self.find_bar.isVisible() else None
+        if index is None:
+            if isinstance(self.find_error, re.error):
+                self.find_count_label.setText(f"Invalid pattern: {self.find_error}")
+            else:
+                self.find_count_label.setText(str(self.find_error) if self.find_error else "")
+        elif not len(index):
+            self.find_count_label.setText("No matches")
+        else:
+            cursor = editor.textCursor()
+            number = index.match_at(cursor.selectionStart(), cursor.selectionEnd())
+            self.find_count_label.setText(f"{number + 1} of {len(index)}" if number is not None else f"{len(index)} matches")
+
+    def select_match(self, editor, number):
+        start, end = editor.match_index.span(number)
+        cursor = editor.textCursor()
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        editor.setTextCursor(cursor)
+        self.update_match_count()
+
     def find_next(self):
+        viewer = self.current_pdf_viewer()
+        if viewer:
+            self.find_in_pdf(viewer)
+            return
+
         editor = self.current_editor()
         if not editor:
             self.status_bar.showMessage("Find is only available in text editors.", 3000)
@@ -613,11 +1006,27 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Enter search text before finding.", 3000)
             return
 
-        found = SearchService.find_next(editor, query, self.find_case_sensitive_checkbox.isChecked())
+        index = self.current_match_index(editor)
+        if index is not None:
+            number = index.next_match(editor.textCursor().selectionEnd())
+            found = number is not None
+            if found:
+                self.select_match(editor, number)
+        elif self.current_search().is_plain:
+            # Still indexing: QTextDocument.find searches plain text quickly.
+            found = SearchService.find_next(editor, self.current_search())
+        else:
+            self.wait_for_match_index(self.find_next)
+            return
         if not found:
             self.status_bar.showMessage(f"No matches found for '{query}'", 3000)
 
     def find_previous(self):
+        viewer = self.current_pdf_viewer()
+        if viewer:
+            self.find_in_pdf(viewer, backward=True)
+            return
+
         editor = self.current_editor()
         if not editor:
             self.status_bar.showMessage("Find is only available in text editors.", 3000)
@@ -628,7 +1037,17 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Enter search text before moving to the previous match.", 3000)
             return
 
-        found = SearchService.find_previous(editor, query, self.find_case_sensitive_checkbox.isChecked())
+        index = self.current_match_index(editor)
+        if index is not None:
+            number = index.previous_match(editor.textCursor().selectionStart())
+            found = number is not None
+            if found:
+                self.select_match(editor, number)
+        elif self.current_search().is_plain:
+            found = SearchService.find_previous(editor, self.current_search())
+        else:
+            self.wait_for_match_index(self.find_previous)
+            return
         if not found:
             self.status_bar.showMessage(f"No matches found for '{query}'", 3000)
 
@@ -643,6 +1062,7 @@ class MainWindow(QMainWindow):
         # Ensure the find bar is visible when replace_text is called
         if not self.find_bar.isVisible():
             self.find_bar.show()
+        self.schedule_match_index()
 
     def update_window_title(self):
         widget = self.tab_widget.currentWidget()
@@ -654,7 +1074,7 @@ class MainWindow(QMainWindow):
         title = os.path.basename(file_path) if file_path else "Untitled"
 
         # Check if it's an editor and is modified
-        if isinstance(widget, EditorArea) and widget.document().isModified():
+        if isinstance(widget, (EditorArea, LargeFileEditor)) and widget.document().isModified():
             title += "*"
         
         self.setWindowTitle(f"{title} - StudyMate")
@@ -663,6 +1083,7 @@ class MainWindow(QMainWindow):
         editor = self.current_editor()
         if editor:
             self.status_bar.update_editor_info(editor)
+            self.update_match_count()
 
     def reset_editor_zoom(self):
         # A bit of a workaround as there's no direct 'reset zoom'
@@ -700,18 +1121,56 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Enter text to find before replacing.", 3000)
             return
 
-        replaced = SearchService.replace_current(
-            editor,
-            query,
-            replace_text,
-            self.find_case_sensitive_checkbox.isChecked(),
-        )
+        search = self.current_search()
+        if search.regex:
+            self.replace_selected_match(editor, search, replace_text)
+            return
+        try:
+            replaced = SearchService.replace_current(editor, search, replace_text)
+        except (re.error, SearchTimeout) as e:
+            self.show_search_error(e)
+            return
 
+        if not replaced and not search.is_plain:
+            self.find_next()  # Selects the next match from the index; Replace then replaces it
+            return
         self.status_bar.showMessage(
             "Replaced current selection." if replaced else "No matching selection to replace.",
             2000,
         )
 
+    def replace_selected_match(self, editor, search, replace_text):
+        """Replace the selection if it is an indexed match of a regex; the replacement is computed on a worker."""
+        index = self.current_match_index(editor)
+        if index is None:
+            self.wait_for_match_index(self.replace_current)
+            return
+        cursor = editor.textCursor()
+        start, end = cursor.selectionStart(), cursor.selectionEnd()
+        if index.match_at(start, end) is None:
+            self.find_next()  # Selects the next match; Replace then replaces it
+            return
+
+        self.stop_replace_scan()
+        worker = SelectionReplaceWorker(editor, cursor.selectedText().replace("\u2029", "\n"), search, replace_text,
+                                        editor.document().revision(), start, end)
+        worker.signals.finished.connect(lambda replacement, worker=worker: self.on_selection_replacement_found(worker, replacement))
+        worker.signals.error.connect(lambda error, worker=worker: self.on_replace_scan_failed(worker, error))
+        self.replace_scan_worker = worker
+        self.thread_pool.start(worker)
+
+    def on_selection_replacement_found(self, worker, replacement):
+        if worker is not self.replace_scan_worker:
+            return
+        self.replace_scan_worker = None
+        if self.tab_widget.indexOf(worker.editor) == -1 or worker.editor.document().revision() != worker.revision:
+            return  # Closed or edited meanwhile
+        if replacement is None:
+            self.status_bar.showMessage("No matching selection to replace.", 2000)
+            return
+        SearchService.apply_replacements(worker.editor, [(worker.start, worker.end)], [replacement])
+        self.status_bar.showMessage("Replaced current selection.", 2000)
+
     def replace_and_find(self):
         self.replace_current()
         self.find_next()
@@ -727,18 +1186,61 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Enter text to find before replacing.", 3000)
             return
 
-        original_text = editor.toPlainText()
-        new_text, replacements = SearchService.replace_all(
-            original_text,
-            query,
-            replace_text,
-            self.find_case_sensitive_checkbox.isChecked(),
-        )
+        search = self.current_search()
+        try:
+            search.pattern()
+        except re.error as e:
+            self.show_search_error(e)
+            return
+
+        # The matches are found on a worker; the document is edited once they arrive.
+        self.stop_replace_scan()
+        worker = ReplaceScanWorker(editor, editor.toPlainText(), search, replace_text, editor.document().revision())
+        worker.signals.finished.connect(lambda result, worker=worker: self.on_replacements_found(worker, result))
+        worker.signals.error.connect(lambda error, worker=worker: self.on_replace_scan_failed(worker, error))
+        self.replace_scan_worker = worker
+        self.status_bar.showMessage(f"Finding occurrences of '{query}'...")
+        self.thread_pool.start(worker)
+
+    def stop_replace_scan(self):
+        if self.replace_scan_worker is not None:
+            self.replace_scan_worker.stop()
+            self.replace_scan_worker = None
 
-        if replacements == 0:
+    def on_replacements_found(self, worker, result):
+        if worker is not self.replace_scan_worker:
+            return
+        self.replace_scan_worker = None
+        query = worker.search.text
+        if self.tab_widget.indexOf(worker.editor) == -1:
+            return  # Closed while searching
+        if worker.editor.document().revision() != worker.revision:
+            self.status_bar.showMessage("The document changed while searching; Replace All was cancelled.", 5000)
+            return
+
+        spans, replacements = result
+        replaced = SearchService.apply_replacements(worker.editor, spans, replacements, progress_callback=self.show_replace_progress)
+        if replaced == 0:
             self.status_bar.showMessage(f"No occurrences of '{query}' found.", 3000)
             return
 
-        editor.setPlainText(new_text)
-        editor.document().setModified(True)
-        self.status_bar.showMessage(f"Replaced {replacements} occurrences of '{query}'.", 3000)
+        self.status_bar.showMessage(f"Replaced {replaced} occurrences of '{query}'.", 3000)
+
+    def on_replace_scan_failed(self, worker, error):
+        if worker is not self.replace_scan_worker:
+            return
+        self.replace_scan_worker = None
+        self.show_search_error(error)
+
+    def show_search_error(self, error):
+        if isinstance(error, SearchTimeout):
+            self.status_bar.showMessage(f"{error}; try a simpler pattern.", 5000)
+        elif isinstance(error, re.error):
+            self.status_bar.showMessage(f"Invalid pattern or replacement: {error}", 5000)
+        else:
+            self.status_bar.showMessage(str(error), 5000)
+
+    def show_replace_progress(self, done, total):
+        self.status_bar.showMessage(f"Replacing... {done} of {total}")
+        # Only the status bar is repainted; the document is mid-edit until the replacement ends.
+        self.status_bar.repaint()
@@ -0,0 +1,109 @@
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter, QColor
+from PyQt5.QtCore import Qt, QRect, QRectF, QPoint
+from services.page_layout import tiles_in_rect
+
+
+class PdfPageStrip(QWidget):
+    """
+    Paints PDF pages in one column: every page for continuous scrolling, or a
+    single page.
+
+    Sizes come from a PageLayout whose index 0 is document page first_page, so
+    pages that have not been rendered yet are drawn as placeholders of the right
+    size. Rendered images are looked up in the viewer's page cache at paint time; nothing
+    is rasterized here. Pages the viewer renders as tiles show their
+    low-resolution preview, scaled up, under whichever tiles have arrived.
+    Search hits are drawn over the pages as translucent rectangles.
+    """
+    PLACEHOLDER_COLOR = QColor(255, 255, 255)
+    BORDER_COLOR = QColor(190, 190, 190)
+    LABEL_COLOR = QColor(160, 160, 160)
+    HIGHLIGHT_COLOR = QColor(255, 220, 0, 90)
+    CURRENT_HIT_COLOR = QColor(255, 140, 0, 140)
+
+    def __init__(self, layout, page_cache, is_tiled, preview_zoom, tile_size, parent=None):
+        super().__init__(parent)
+        self.page_cache = page_cache
+        self.is_tiled = is_tiled  # is_tiled(page index) -> bool, at the current zoom
+        self.preview_zoom = preview_zoom
+        self.tile_size = tile_size
+        self.search_highlights = {}  # page -> [(x0, y0, x1, y1)] in page points
+        self.current_hit = None  # (page, index)
+        self.set_layout(layout)
+
+    def set_layout(self, layout, first_page=0):
+        self.page_layout = layout
+        self.first_page = first_page
+        self.zoom_key = layout.zoom
+        self.update_size()
+        self.update()
+
+    def set_zoom(self, zoom, zoom_key):
+        self.page_layout.set_zoom(zoom)
+        self.zoom_key = zoom_key
+        self.update_size()
+        self.update()
+
+    def update_size(self):
+        self.setMinimumSize(self.page_layout.max_width + 2 * self.page_layout.gap, self.page_layout.total_height)
+
+    def page_rect(self, local_index) -> QRect:
+        """Rectangle of a page by its index in the layout (page first_page + local_index)."""
+        width = self.page_layout.page_width(local_index)
+        left = max(self.page_layout.gap, (self.width() - width) // 2)
+        return QRect(left, self.page_layout.page_top(local_index), width, self.page_layout.page_height(local_index))
+
+    def set_search_highlights(self, highlights, current_hit):
+        if highlights != self.search_highlights or current_hit != self.current_hit:
+            self.search_highlights = highlights
+            self.current_hit = current_hit
+            self.update()
+
+    def update_key(self, key):
+        """Repaint the area a newly rendered page, preview or tile covers."""
+        local_index = key[0] - self.first_page
+        if not 0 <= local_index < self.page_layout.page_count:
+            return
+        rect = self.page_rect(local_index)
+        if len(key) == 4:
+            rect = QRect(rect.left() + key[2] * self.tile_size, rect.top() + key[3] * self.tile_size, self.tile_size, self.tile_size).intersected(rect)
+        self.update(rect)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        area = event.rect()
+        for local_index in self.page_layout.pages_between(area.top(), area.bottom() + 1):
+            page = self.first_page + local_index
+            rect = self.page_rect(local_index)
+            rendered = None if self.is_tiled(page) else self.page_cache.get((page, self.zoom_key))
+            if rendered is not None:
+                painter.drawImage(rect.topLeft(), rendered.image)
+            else:
+                self.paint_unrendered_page(painter, page, rect, area)
+
+            zoom = self.page_layout.zoom
+            for index, (x0, y0, x1, y1) in enumerate(self.search_highlights.get(page, ())):
+                color = self.CURRENT_HIT_COLOR if self.current_hit == (page, index) else self.HIGHLIGHT_COLOR
+                painter.fillRect(QRectF(rect.left() + x0 * zoom, rect.top() + y0 * zoom, (x1 - x0) * zoom, (y1 - y0) * zoom), color)
+        painter.end()
+
+    def paint_unrendered_page(self, painter, page, rect, area):
+        """Draw a page without a whole-page image: its preview and tiles, or a placeholder."""
+        preview = self.page_cache.get((page, self.preview_zoom)) if self.is_tiled(page) else None
+        if preview is not None:
+            painter.drawImage(rect, preview.image)
+        else:
+            painter.fillRect(rect, self.PLACEHOLDER_COLOR)
+            painter.setPen(self.BORDER_COLOR)
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+            painter.setPen(self.LABEL_COLOR)
+            painter.drawText(rect, Qt.AlignCenter, f"Page {page + 1}")
+
+        if self.is_tiled(page):
+            visible = area.intersected(rect).translated(-rect.topLeft())
+            for column, row in tiles_in_rect(rect.width(), rect.height(), visible.left(), visible.top(), visible.right() + 1, visible.bottom() + 1, self.tile_size):
+                tile = self.page_cache.get((page, self.zoom_key, column, row))
+                if tile is not None:
+                    painter.drawImage(rect.topLeft() + QPoint(column * self.tile_size, row * self.tile_size), tile.image)
@@ -0,0 +1,169 @@
+import itertools
+import threading
+import weakref
+
+import fitz  # PyMuPDF
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage
+from services.buffer_pool import BufferPool
+
+
+class RenderPriority:
+    """Lower values render first."""
+    VISIBLE = 0
+    PREFETCH = 10
+
+
+class PageRenderSignals(QObject):
+    rendered = pyqtSignal(tuple, object)  # (render key, RenderedImage)
+    failed = pyqtSignal(tuple, str)
+
+
+class RenderedImage:
+    """
+    A QImage that reads straight from a fitz.Pixmap's samples.
+
+    The pixmap is kept alive for as long as this object is, and on_release (for
+    example handing the pixmap back to a BufferPool) runs once it is garbage
+    collected. Keep a reference to this object, not just to .image, while the
+    image is in use.
+    """
+
+    def __init__(self, image: QImage, pixmap, on_release=None):
+        self.image = image
+        self.pixmap = pixmap
+        self.size = image.sizeInBytes()
+        if on_release is not None:
+            weakref.finalize(self, on_release)
+
+
+def image_from_pixmap(pixmap):
+    """
+    Wrap a pixmap's samples in a QImage without copying them; returns (image, pixmap).
+
+    Gray, RGB and RGB with alpha map onto QImage formats directly (MuPDF alpha
+    is premultiplied). Other colourspaces, such as CMYK, are converted to RGB
+    first, so the returned pixmap is the one the image reads from and must be
+    kept alive with it.
+    """
+    if (pixmap.n, pixmap.alpha) not in ((1, 0), (3, 0), (4, 1)):
+        pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
+    if pixmap.n == 1:
+        image_format = QImage.Format_Grayscale8
+    elif pixmap.alpha:
+        image_format = QImage.Format_RGBA8888_Premultiplied
+    else:
+        image_format = QImage.Format_RGB888
+    return QImage(pixmap.samples_ptr, pixmap.width, pixmap.height, pixmap.stride, image_format), pixmap
+
+
+class PageRenderer:
+    """
+    Rasterizes pages of one PDF on a dedicated background thread.
+
+    A render key is (page, zoom) for a whole page or (page, zoom, column, row)
+    for one tile_size x tile_size pixel tile of the page at that zoom, rendered
+    through a clip rectangle so only that part of the page is rasterized.
+
+    The thread opens its own fitz.Document, so the GUI thread's document is only
+    used for metadata and no fitz object is shared between threads. Requests are
+    deduplicated by key and served by priority, then in request order; results
+    arrive through signals as RenderedImages, whose QImage can cross threads
+    (QPixmaps must be created on the GUI thread) and is painted directly.
+
+    Pages are drawn into pixmaps taken from a BufferPool and the QImage reads
+    the pixmap's samples in place, so a render allocates nothing once the pool
+    holds buffers of that size; a pixmap goes back to the pool when its image is
+    dropped from the page cache.
+    """
+    TILE_SIZE = 512
+
+    def __init__(self, file_path: str, tile_size: int = TILE_SIZE, alpha: bool = False, pool: BufferPool = None):
+        self.file_path = file_path
+        self.tile_size = tile_size
+        self.alpha = alpha  # Transparent page background instead of white
+        self.pool = pool if pool is not None else BufferPool()
+        self.signals = PageRenderSignals()
+        self._condition = threading.Condition()
+        self._pending = {}  # key -> (priority, sequence)
+        self._sequence = itertools.count()
+        self._thread = None
+        self._closed = False
+
+    def request(self, key: tuple, priority: int = RenderPriority.VISIBLE) -> None:
+        """Queue a page or tile for rendering; re-requesting a queued key can only raise its priority."""
+        with self._condition:
+            if self._closed:
+                return
+            queued = self._pending.get(key)
+            if queued is None or priority < queued[0]:
+                self._pending[key] = (priority, next(self._sequence))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work, name="pdf-page-renderer", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def cancel(self, matching=None) -> None:
+        """Drop queued requests for which matching(key, priority) is true (all by default)."""
+        with self._condition:
+            for key, (priority, _) in list(self._pending.items()):
+                if matching is None or matching(key, priority):
+                    del self._pending[key]
+
+    def close(self) -> None:
+        """Stop the render thread after the page it is working on; queued requests are dropped."""
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+
+    def render(self, document, key: tuple) -> RenderedImage:
+        page = document.load_page(key[0])
+        matrix = fitz.Matrix(key[1], key[1])
+        bbox = page.rect.transform(matrix).irect
+        if len(key) == 4:
+            # Tiles are cut in pixels so neighbouring tiles meet without rounding seams.
+            x0, y0 = bbox.x0 + key[2] * self.tile_size, bbox.y0 + key[3] * self.tile_size
+            bbox = fitz.IRect(x0, y0, min(x0 + self.tile_size, bbox.x1), min(y0 + self.tile_size, bbox.y1))
+
+        shape = (bbox.width, bbox.height, self.alpha)
+        size = bbox.width * bbox.height * (4 if self.alpha else 3)
+        pooled = self.pool.acquire(shape, size, lambda: fitz.Pixmap(fitz.csRGB, bbox, self.alpha))
+        try:
+            pooled.set_origin(bbox.x0, bbox.y0)
+            if self.alpha:
+                pooled.clear_with()
+            else:
+                pooled.clear_with(255)
+            device = fitz.Device(pooled, None)
+            page.run(device, matrix)
+            device.close()
+            image, pixmap = image_from_pixmap(pooled)
+        except Exception:
+            self.pool.release(shape, pooled, size)
+            raise
+        return RenderedImage(image, pixmap, lambda: self.pool.release(shape, pooled, size))
+
+    def _work(self):
+        document = None
+        try:
+            while True:
+                with self._condition:
+                    while not self._pending and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        return
+                    key = min(self._pending, key=self._pending.get)
+                    del self._pending[key]
+
+                try:
+                    if document is None:
+                        document = fitz.open(self.file_path)
+                    image = self.render(document, key)
+                except Exception as e:
+                    self.signals.failed.emit(key, str(e))
+                    continue
+                self.signals.rendered.emit(key, image)
+        finally:
+            if document is not None:
+                document.close()
@@ -0,0 +1,134 @@
+import threading
+
+import fitz  # PyMuPDF
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from services.file_service import FileService, PDF_ENGINE_PYMUPDF
+
+
+class PageTextSignals(QObject):
+    progress = pyqtSignal(int, int)  # (pages indexed, total)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class PageTextIndexer(QRunnable):
+    """
+    Extracts the text of every page of a PDF into a PageTextIndex in the background.
+
+    Pages come from FileService.iter_pdf_pages with the PyMuPDF engine, so a
+    long document is extracted by a pool of worker processes and the viewer's
+    fitz.Document is never touched from this thread. The index can be searched
+    while pages are still being added; stop() ends the extraction after the
+    current page.
+    """
+
+    def __init__(self, file_path: str, index, page_count: int, file_service: FileService | None = None):
+        super().__init__()
+        self.file_path = file_path
+        self.index = index
+        self.page_count = page_count
+        self.file_service = file_service or FileService()
+        self.signals = PageTextSignals()
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        pages = self.file_service.iter_pdf_pages(self.file_path, PDF_ENGINE_PYMUPDF)
+        try:
+            for page_index, text in enumerate(pages):
+                if self._stopped.is_set():
+                    return
+                self.index.add_page(page_index, text)
+                self.signals.progress.emit(page_index + 1, self.page_count)
+        except Exception as e:
+            self.signals.failed.emit(f"Failed to index PDF text: {e}")
+            return
+        finally:
+            pages.close()  # Stops the worker processes if extraction ended early
+        self.signals.finished.emit()
+
+
+class PageHitSignals(QObject):
+    found = pyqtSignal(str, int, list)  # (query, page, hit rectangles (x0, y0, x1, y1) in page points)
+    failed = pyqtSignal(str)
+
+
+class PageHitFinder:
+    """
+    Looks up where a query occurs on PDF pages, on a background thread.
+
+    page.search_for lays out the whole page, which is too slow to run for
+    every visible page on the GUI thread while scrolling. Requested pages are
+    searched one at a time, the most recently requested first, by a job with
+    its own fitz.Document, like PageRenderer's. Pages still waiting for an
+    older query are dropped when another query is requested.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.signals = PageHitSignals()
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._query = None
+        self._queued = []  # Pages waiting for _query, next one first
+        self._running = False
+        self._closed = False
+
+    def request(self, query: str, pages: list[int]) -> None:
+        """Search pages for query; results arrive through signals.found."""
+        with self._lock:
+            if self._closed:
+                return
+            if query != self._query:
+                self._query, self._queued = query, []
+            new_pages = [page for page in pages if page not in self._queued]
+            self._queued[:0] = new_pages
+            start = bool(new_pages) and not self._running
+            self._running = self._running or start
+        if start:
+            self.thread_pool.start(_HitJob(self))
+
+    def close(self) -> None:
+        """Drop the waiting pages; the running job returns after its current page."""
+        with self._lock:
+            self._closed = True
+            self._queued = []
+
+    def _next(self):
+        with self._lock:
+            if not self._queued:
+                self._running = False
+                return None
+            return self._query, self._queued.pop(0)
+
+    def _stopped(self):
+        with self._lock:
+            self._running = False
+
+
+class _HitJob(QRunnable):
+    def __init__(self, finder: PageHitFinder):
+        super().__init__()
+        self.finder = finder
+
+    def run(self):
+        finder = self.finder
+        document = None
+        try:
+            document = fitz.open(finder.file_path)
+            while True:
+                item = finder._next()
+                if item is None:
+                    return
+                query, page = item
+                hits = [tuple(rect) for rect in document.load_page(page).search_for(query)]
+                finder.signals.found.emit(query, page, hits)
+        except Exception as e:
+            finder._stopped()
+            finder.signals.failed.emit(f"Failed to search the PDF: {e}")
+        finally:
+            if document is not None:
+                document.close()
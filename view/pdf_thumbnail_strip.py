@@ -0,0 +1,55 @@
+from PyQt5.QtWidgets import QListWidget, QListWidgetItem, QListView, QAbstractItemView
+from PyQt5.QtGui import QIcon, QPixmap, QColor
+from PyQt5.QtCore import Qt, QSize, pyqtSignal
+
+
+class PdfThumbnailStrip(QListWidget):
+    """
+    Sidebar with one thumbnail per PDF page; clicking one emits page_selected.
+
+    Every page gets a blank placeholder of its aspect ratio up front, so the
+    strip has its final size and can be scrolled before any thumbnail exists;
+    set_thumbnail swaps the real image in as it arrives. Pages of the same
+    shape share one placeholder, so a long document doesn't allocate one per page.
+    """
+    page_selected = pyqtSignal(int)
+    PLACEHOLDER_COLOR = QColor(255, 255, 255)
+
+    def __init__(self, page_sizes, width: int, parent=None):
+        super().__init__(parent)
+        self.thumbnail_width = width
+        # Icon mode puts the page number under the image; one column, no drag and drop.
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.TopToBottom)
+        self.setWrapping(False)
+        self.setMovement(QListView.Static)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setSpacing(4)
+        height = max(round(width * page_height / page_width) for page_width, page_height in page_sizes) if page_sizes else width
+        self.setIconSize(QSize(width, height))
+        self.setFixedWidth(width + 40)
+
+        placeholders = {}  # height -> icon; pages of the same shape share one
+        for index, (page_width, page_height) in enumerate(page_sizes):
+            height = max(1, round(width * page_height / page_width))
+            placeholder = placeholders.get(height)
+            if placeholder is None:
+                pixmap = QPixmap(width, height)
+                pixmap.fill(self.PLACEHOLDER_COLOR)
+                placeholder = placeholders[height] = QIcon(pixmap)
+            item = QListWidgetItem(placeholder, str(index + 1))
+            item.setTextAlignment(Qt.AlignHCenter)
+            self.addItem(item)
+
+        self.itemClicked.connect(lambda item: self.page_selected.emit(self.row(item)))
+
+    def set_thumbnail(self, page_index, image):
+        item = self.item(page_index)
+        if item is not None:
+            item.setIcon(QIcon(QPixmap.fromImage(image)))
+
+    def set_current_page(self, page_index):
+        """Highlight the page shown in the viewer without emitting page_selected."""
+        if page_index != self.currentRow():
+            self.setCurrentRow(page_index)
+            self.scrollToItem(self.currentItem(), QAbstractItemView.EnsureVisible)
@@ -0,0 +1,123 @@
+import threading
+
+import fitz  # PyMuPDF
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice, pyqtSignal
+from PyQt5.QtGui import QImage
+
+
+class ThumbnailSignals(QObject):
+    thumbnail_ready = pyqtSignal(int, QImage)  # (page index, thumbnail)
+    failed = pyqtSignal(str)
+
+
+class ThumbnailLoader:
+    """
+    Produces page thumbnails of one PDF in a background thread pool.
+
+    A first job hashes the file for its ThumbnailCache key and streams every
+    cached thumbnail; the pages still missing are split into batches rendered
+    by pool workers, each with its own fitz.Document like PageRenderer, and
+    written back to the cache. Thumbnails arrive one by one through
+    signals.thumbnail_ready as they finish, in any order.
+    """
+    BATCH_PAGES = 16
+    MAX_THREADS = 2
+
+    def __init__(self, file_path: str, page_count: int, cache, width: int):
+        self.file_path = file_path
+        self.page_count = page_count
+        self.cache = cache
+        self.width = width
+        self.signals = ThumbnailSignals()
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(self.MAX_THREADS)
+        self._cancelled = threading.Event()
+
+    def start(self, first_page: int = 0) -> None:
+        """Begin loading; pages from first_page onwards are rendered before the ones above it."""
+        self.thread_pool.start(_CacheJob(self, first_page))
+
+    def close(self) -> None:
+        """Stop handing out work; running batches finish their current page and return."""
+        self._cancelled.set()
+        self.thread_pool.clear()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class _CacheJob(QRunnable):
+    def __init__(self, loader: ThumbnailLoader, first_page: int):
+        super().__init__()
+        self.loader = loader
+        self.first_page = first_page
+
+    def run(self):
+        loader = self.loader
+        try:
+            document_key = loader.cache.document_key(loader.file_path, loader.width)
+            cached = set(loader.cache.cached_pages(document_key))
+        except OSError as e:
+            loader.signals.failed.emit(f"Thumbnail cache unavailable: {e}")
+            document_key, cached = None, set()
+
+        for page in sorted(cached):
+            if loader.cancelled:
+                return
+            data = loader.cache.get(document_key, page)
+            image = QImage.fromData(data, "PNG") if data else QImage()
+            if image.isNull():
+                cached.discard(page)
+            else:
+                loader.signals.thumbnail_ready.emit(page, image)
+
+        pages = list(range(self.first_page, loader.page_count)) + list(range(self.first_page))
+        missing = [page for page in pages if page not in cached]
+        for start in range(0, len(missing), loader.BATCH_PAGES):
+            if loader.cancelled:
+                return
+            loader.thread_pool.start(_RenderJob(loader, document_key, missing[start:start + loader.BATCH_PAGES]))
+
+
+class _RenderJob(QRunnable):
+    def __init__(self, loader: ThumbnailLoader, document_key, pages: list[int]):
+        super().__init__()
+        self.loader = loader
+        self.document_key = document_key
+        self.pages = pages
+
+    def run(self):
+        loader = self.loader
+        try:
+            document = fitz.open(loader.file_path)
+        except Exception as e:
+            loader.signals.failed.emit(f"Failed to render thumbnails: {e}")
+            return
+        try:
+            for page_index in self.pages:
+                if loader.cancelled:
+                    return
+                image = self.render(document.load_page(page_index))
+                loader.signals.thumbnail_ready.emit(page_index, image)
+                if self.document_key is not None:
+                    loader.cache.put(self.document_key, page_index, self.encode(image))
+        except Exception as e:
+            loader.signals.failed.emit(f"Failed to render thumbnails: {e}")
+        finally:
+            document.close()
+
+    def render(self, page) -> QImage:
+        zoom = self.loader.width / page.rect.width
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        # Thumbnails are small and long-lived, so a plain copy beats pooling here.
+        return QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888).copy()
+
+    @staticmethod
+    def encode(image: QImage) -> bytes:
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        buffer.close()
+        return bytes(data)
@@ -1,13 +1,60 @@
+import os
+from collections import OrderedDict
+
 import fitz  # PyMuPDF
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QScrollArea, QSpinBox
-from PyQt5.QtGui import QPixmap, QImage
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QHBoxLayout, QScrollArea, QSpinBox, QCheckBox
+from PyQt5.QtCore import Qt, QThreadPool
+from services.app_paths import app_data_dir
+from services.page_cache import PageCache
+from services.page_layout import PageLayout, tiles_in_rect
+from services.page_text_index import PageTextIndex
+from view.pdf_page_strip import PdfPageStrip
+from services.thumbnail_cache import ThumbnailCache
+from view.pdf_render_worker import PageRenderer, RenderPriority
+from view.pdf_text_worker import PageHitFinder, PageTextIndexer
+from view.pdf_thumbnail_strip import PdfThumbnailStrip
+from view.pdf_thumbnail_worker import ThumbnailLoader
 
 class PdfViewer(QWidget):
     """
     A widget for displaying PDF files.
     It renders pages as images and provides navigation and zoom controls.
+
+    Pages are rendered on a background thread and kept in a size-capped cache
+    keyed by (page, zoom); the pages around the current one are prefetched so
+    paging forward or back usually shows an already rendered image.
+
+    In continuous mode all pages are laid out in one scrollable column from
+    their sizes alone. Only pages within RENDER_MARGIN_SCREENS viewport heights
+    of the visible area are rendered, and cached pages further away than
+    KEEP_MARGIN_SCREENS are dropped, so memory does not grow with page count.
+
+    A page whose image would exceed MAX_PAGE_PIXELS at the current zoom is not
+    rendered whole: a preview at PREVIEW_ZOOM is shown first and then refined
+    by rendering only the tiles in and near the viewport at full resolution.
+
+    A thumbnail sidebar gives an overview of the document; thumbnails are
+    rendered in a background pool and kept in an on-disk cache, so reopening a
+    document fills the sidebar without rasterizing its pages again.
+
+    Page text is extracted once in the background into a PageTextIndex, so
+    find_text only asks PyMuPDF for hit rectangles on pages the index says
+    contain the query. Extraction starts with the first search in the tab, as
+    a long document is extracted by a pool of worker processes. Hit
+    rectangles are looked up by a PageHitFinder thread and cached per (page,
+    query); a hit is scrolled to and highlighted once its page's arrive.
     """
+    CACHE_MAX_BYTES = 256 * 1024 * 1024
+    PREFETCH_PAGES = 2  # Pages rendered ahead of and behind the current one
+    RENDER_MARGIN_SCREENS = 0.5
+    KEEP_MARGIN_SCREENS = 2
+    MAX_PAGE_PIXELS = 4_000_000
+    PREVIEW_ZOOM = 0.5
+    MIN_ZOOM = 0.1
+    MAX_ZOOM = 16.0
+    THUMBNAIL_WIDTH = 120
+    MAX_CACHED_HIT_PAGES = 512
+
     def __init__(self, file_path, parent=None):
         super().__init__(parent)
         self.file_path = file_path
@@ -15,6 +62,16 @@ class PdfViewer(QWidget):
         self.is_temporary_file = False # Flag for converted files
         self.zoom_factor = 1.0
         self.current_page = 0
+        self.continuous = False
+        self.document = None
+        self.renderer = None
+        self.thumbnail_loader = None
+        self.text_indexer = None
+        self.hit_finder = None
+        self.search_query = ""
+        self.search_hit = None  # (page, index into that page's hit rectangles)
+        self.search_rects = OrderedDict()  # (page, query) -> hit rectangles, least recently used first
+        self.scroll_to_hit_pending = False
 
         try:
             self.document = fitz.open(self.file_path)
@@ -22,8 +79,23 @@ class PdfViewer(QWidget):
             self.setup_error_ui(f"Failed to load PDF: {e}")
             return
 
+        self.page_cache = PageCache(self.CACHE_MAX_BYTES)
+        self.page_sizes = [(page.rect.width, page.rect.height) for page in self.document]
+        self.page_layout = PageLayout(self.page_sizes)
+        self.renderer = PageRenderer(self.file_path)
+        self.renderer.signals.rendered.connect(self.on_page_rendered)
+        self.renderer.signals.failed.connect(self.on_page_render_failed)
+
         self.setup_ui()
-        self.render_page()
+        self.continuous_checkbox.setChecked(True)  # Shows the first page
+
+        self.thumbnail_loader = ThumbnailLoader(self.file_path, len(self.page_sizes), self.thumbnail_cache(), self.THUMBNAIL_WIDTH)
+        self.thumbnail_loader.signals.thumbnail_ready.connect(self.thumbnail_strip.set_thumbnail)
+        self.thumbnail_loader.start()
+
+        self.text_index = PageTextIndex()  # Filled once the tab is first searched, see start_text_indexing
+        self.hit_finder = PageHitFinder(self.file_path)
+        self.hit_finder.signals.found.connect(self.on_hits_found)
 
     def setup_error_ui(self, message):
         layout = QVBoxLayout(self)
@@ -33,13 +105,18 @@ class PdfViewer(QWidget):
         layout.addWidget(error_label)
 
     def setup_ui(self):
-        # --- Image Display ---
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
+        # --- Page Display ---
+        self.page_strip = PdfPageStrip(self.page_layout, self.page_cache, self.is_tiled, self.PREVIEW_ZOOM, self.renderer.tile_size)
 
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setWidget(self.image_label)
+        self.scroll_area.setAlignment(Qt.AlignCenter)
+        self.scroll_area.setWidget(self.page_strip)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(self.on_scrolled)
+
+        self.thumbnail_strip = PdfThumbnailStrip(self.page_sizes, self.THUMBNAIL_WIDTH)
+        self.thumbnail_strip.page_selected.connect(lambda page: self.jump_to_page(page + 1))
 
         # --- Navigation Controls ---
         self.nav_bar = QWidget()
@@ -57,6 +134,10 @@ class PdfViewer(QWidget):
         self.zoom_reset_button = QPushButton("Reset Zoom")
         self.fit_width_button = QPushButton("Fit Width")
         self.zoom_label = QLabel()
+        self.continuous_checkbox = QCheckBox("Continuous")
+        self.continuous_checkbox.setToolTip("Scroll through all pages instead of showing one page at a time.")
+        self.thumbnails_checkbox = QCheckBox("Thumbnails")
+        self.thumbnails_checkbox.setChecked(True)
 
         nav_layout.addWidget(self.prev_button)
         nav_layout.addWidget(self.next_button)
@@ -64,6 +145,9 @@ class PdfViewer(QWidget):
         nav_layout.addWidget(QLabel("Page:"))
         nav_layout.addWidget(self.page_input)
         nav_layout.addWidget(self.page_label)
+        nav_layout.addSpacing(10)
+        nav_layout.addWidget(self.continuous_checkbox)
+        nav_layout.addWidget(self.thumbnails_checkbox)
         nav_layout.addStretch()
         nav_layout.addWidget(self.zoom_label)
         nav_layout.addSpacing(10)
@@ -80,23 +164,111 @@ class PdfViewer(QWidget):
         self.zoom_out_button.clicked.connect(self.zoom_out)
         self.zoom_reset_button.clicked.connect(self.reset_zoom)
         self.fit_width_button.clicked.connect(self.fit_to_width)
+        self.continuous_checkbox.toggled.connect(self.set_continuous)
+        self.thumbnails_checkbox.toggled.connect(self.thumbnail_strip.setVisible)
 
         # --- Main Layout ---
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
         main_layout.addWidget(self.nav_bar)
-        main_layout.addWidget(self.scroll_area)
+        body_layout = QHBoxLayout()
+        body_layout.setSpacing(0)
+        body_layout.addWidget(self.thumbnail_strip)
+        body_layout.addWidget(self.scroll_area)
+        main_layout.addLayout(body_layout)
+
+    @staticmethod
+    def thumbnail_cache():
+        return ThumbnailCache(os.path.join(app_data_dir(), "pdf_thumbnails"))
+
+    def zoom_key(self):
+        # Rounded so that zooming in and back out hits the same cache entries.
+        return round(self.zoom_factor, 4)
+
+    def is_tiled(self, page_index):
+        """Whether the page is too large at the current zoom to be rendered in one piece."""
+        width, height = self.page_sizes[page_index]
+        return width * height * self.zoom_factor * self.zoom_factor > self.MAX_PAGE_PIXELS
+
+    def set_continuous(self, enabled):
+        self.continuous = enabled
+        self.renderer.cancel()
+        self.render_page()
 
     def render_page(self):
-        page = self.document.load_page(self.current_page)
-        mat = fitz.Matrix(self.zoom_factor, self.zoom_factor)
-        pix = page.get_pixmap(matrix=mat)
-        image = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(image)
-        self.image_label.setPixmap(pixmap)
-
-        # Update UI elements
+        """Show the current page: scroll to it in continuous mode, otherwise lay out just that page."""
+        page = self.current_page
+        if self.continuous:
+            if self.page_strip.page_layout is not self.page_layout:
+                self.page_strip.set_layout(self.page_layout)
+        else:
+            self.page_strip.set_layout(PageLayout([self.page_sizes[page]], gap=self.page_layout.gap), first_page=page)
+        self.page_strip.set_zoom(self.zoom_factor, self.zoom_key())
+        # Resize right away so the scroll range fits the new layout before scrolling.
+        self.page_strip.resize(max(self.scroll_area.viewport().width(), self.page_strip.minimumWidth()),
+                               max(self.scroll_area.viewport().height(), self.page_strip.minimumHeight()))
+
+        # Scrolling reports the page in the middle of the view; keep the requested one.
+        local_index = page - self.page_strip.first_page
+        self.scroll_area.verticalScrollBar().setValue(self.page_strip.page_layout.page_top(local_index) - self.page_layout.gap)
+        self.current_page = page
+        self.update_visible_pages()
+        self.update_controls()
+
+    def on_scrolled(self, value):
+        if self.renderer is None:
+            return
+        if self.continuous:
+            viewport_height = self.scroll_area.viewport().height()
+            self.current_page = self.page_layout.page_at(self.scroll_area.verticalScrollBar().value() + viewport_height / 2)
+            self.update_controls()
+        self.update_visible_pages()
+
+    def render_keys(self, local_index, left, top, right, bottom):
+        """Render keys needed to show the part of a laid-out page inside the given strip rectangle."""
+        page = self.page_strip.first_page + local_index
+        zoom = self.zoom_key()
+        if not self.is_tiled(page):
+            return [(page, zoom)]
+        rect = self.page_strip.page_rect(local_index)
+        tiles = tiles_in_rect(rect.width(), rect.height(), left - rect.left(), top - rect.top(), right - rect.left(), bottom - rect.top(), self.renderer.tile_size)
+        return [(page, self.PREVIEW_ZOOM)] + [(page, zoom, column, row) for column, row in tiles]
+
+    def update_visible_pages(self):
+        """Render what is in and near the viewport and forget what is far away from it."""
+        layout = self.page_strip.page_layout
+        left = self.scroll_area.horizontalScrollBar().value()
+        top = self.scroll_area.verticalScrollBar().value()
+        width = max(1, self.scroll_area.viewport().width())
+        height = max(1, self.scroll_area.viewport().height())
+        margin = height * self.RENDER_MARGIN_SCREENS
+        keep_margin = height * self.KEEP_MARGIN_SCREENS
+
+        wanted = []  # (key, priority), most important first
+        for local_index in layout.pages_between(top, top + height):
+            wanted += [(key, RenderPriority.VISIBLE) for key in self.render_keys(local_index, left, top, left + width, top + height)]
+        for local_index in layout.pages_between(top - margin, top + height + margin):
+            wanted += [(key, RenderPriority.PREFETCH) for key in self.render_keys(local_index, left - margin, top - margin, left + width + margin, top + height + margin)]
+        if not self.continuous:
+            for distance in range(1, self.PREFETCH_PAGES + 1):
+                for page in (self.current_page + distance, self.current_page - distance):
+                    if 0 <= page < len(self.page_sizes):
+                        key = (page, self.PREVIEW_ZOOM) if self.is_tiled(page) else (page, self.zoom_key())
+                        wanted.append((key, RenderPriority.PREFETCH))
+
+        keep = {key for key, _ in wanted}
+        for local_index in layout.pages_between(top - keep_margin, top + height + keep_margin):
+            keep.update(self.render_keys(local_index, left - keep_margin, top - keep_margin, left + width + keep_margin, top + height + keep_margin))
+
+        self.renderer.cancel(lambda key, priority: key not in keep)
+        for key, priority in wanted:
+            if key not in self.page_cache:
+                self.renderer.request(key, priority)
+        self.page_cache.discard(lambda key: key not in keep)
+        self.update_search_highlights()
+
+    def update_controls(self):
         self.page_input.blockSignals(True)
         self.page_input.setValue(self.current_page + 1)
         self.page_input.blockSignals(False)
@@ -104,6 +276,16 @@ class PdfViewer(QWidget):
         self.prev_button.setEnabled(self.current_page > 0)
         self.next_button.setEnabled(self.current_page < self.document.page_count - 1)
         self.zoom_label.setText(f"Zoom: {self.zoom_factor:.0%}")
+        self.thumbnail_strip.set_current_page(self.current_page)
+
+    def on_page_rendered(self, key, rendered):
+        self.page_cache.put(key, rendered, rendered.size)
+        if len(key) == 4 or key[1] in (self.zoom_key(), self.PREVIEW_ZOOM):
+            self.page_strip.update_key(key)
+
+    def on_page_render_failed(self, key, message):
+        if self.document is not None:
+            self.zoom_label.setText(f"Failed to render page {key[0] + 1}: {message}")
 
     def jump_to_page(self, page_num):
         self.current_page = page_num - 1
@@ -119,28 +301,163 @@ class PdfViewer(QWidget):
             self.current_page += 1
             self.render_page()
 
-    def zoom_in(self):
-        self.zoom_factor *= 1.2
+    def set_zoom(self, zoom):
+        # Tiling keeps memory bounded, but past MAX_ZOOM a single glyph fills the screen.
+        self.zoom_factor = min(self.MAX_ZOOM, max(self.MIN_ZOOM, zoom))
         self.render_page()
 
+    def zoom_in(self):
+        self.set_zoom(self.zoom_factor * 1.2)
+
     def zoom_out(self):
-        self.zoom_factor /= 1.2
-        self.render_page()
+        self.set_zoom(self.zoom_factor / 1.2)
 
     def reset_zoom(self):
-        self.zoom_factor = 1.0
-        self.render_page()
+        self.set_zoom(1.0)
 
     def fit_to_width(self):
-        page = self.document.load_page(self.current_page)
-        page_width = page.rect.width
-        scroll_area_width = self.scroll_area.width() - 2 * self.scroll_area.frameWidth()
+        page_width = self.page_sizes[self.current_page][0]
+        scroll_area_width = self.scroll_area.width() - 2 * self.scroll_area.frameWidth() - 2 * self.page_layout.gap
         # Subtract scrollbar width if visible
         if self.scroll_area.verticalScrollBar().isVisible():
             scroll_area_width -= self.scroll_area.verticalScrollBar().width()
-        self.zoom_factor = scroll_area_width / page_width
-        self.render_page()
+        self.set_zoom(scroll_area_width / page_width)
+
+    # --- Search ---
+
+    def start_text_indexing(self):
+        """Extract the page text into text_index in the background, unless that was already started."""
+        if self.text_indexer is None:
+            self.text_indexer = PageTextIndexer(self.file_path, self.text_index, len(self.page_sizes))
+            QThreadPool.globalInstance().start(self.text_indexer)
+
+    def is_text_indexed(self):
+        return self.text_index.page_count == len(self.page_sizes)
+
+    def find_text(self, query, backward=False):
+        """Go to and highlight the next (or previous) occurrence of query; returns whether there is one."""
+        self.start_text_indexing()
+        query = query.strip()
+        if query != self.search_query:
+            self.search_query = query
+            self.search_hit = None
+        pages = self.text_index.pages_for(query)
+        if not pages:
+            return self.show_search_hit(None)
+
+        if self.search_hit is None:
+            # Start from the page being viewed: its first hit going forward, its last going back.
+            page = self.current_page
+            hit = self.text_index.occurrences(page, query) if backward and page in pages else -1
+        else:
+            page, hit = self.search_hit
+        step = -1 if backward else 1
+        count = self.text_index.occurrences(page, query) if page in pages else 0
+        remaining = [index for index in range(count) if (index - hit) * step > 0]
+        if remaining:
+            return self.show_search_hit((page, remaining[-1 if backward else 0]))
+
+        if backward:
+            sequence = [p for p in reversed(pages) if p < page] + [p for p in reversed(pages) if p >= page]
+        else:
+            sequence = [p for p in pages if p > page] + [p for p in pages if p <= page]
+        for candidate in sequence:
+            count = self.text_index.occurrences(candidate, query)
+            if count:
+                return self.show_search_hit((candidate, count - 1 if backward else 0))
+        return self.show_search_hit(None)
+
+    def page_hits(self, page):
+        """
+        Rectangles (x0, y0, x1, y1), in page points, of search_query on a page.
+
+        None while they are not cached; they are then requested from the hit
+        finder and on_hits_found repaints once they arrive.
+        """
+        key = (page, self.search_query)
+        hits = self.search_rects.get(key)
+        if hits is None:
+            self.hit_finder.request(self.search_query, [page])
+        else:
+            self.search_rects.move_to_end(key)
+        return hits
+
+    def on_hits_found(self, query, page, hits):
+        if self.hit_finder is None:
+            return  # Closed meanwhile
+        self.search_rects[(page, query)] = hits
+        while len(self.search_rects) > self.MAX_CACHED_HIT_PAGES:
+            self.search_rects.popitem(last=False)
+        if query != self.search_query:
+            return
+        if self.scroll_to_hit_pending and self.search_hit is not None and self.search_hit[0] == page:
+            self.scroll_to_search_hit()
+        self.update_search_highlights()
+
+    def show_search_hit(self, hit):
+        self.search_hit = hit
+        self.scroll_to_hit_pending = hit is not None
+        if hit is not None:
+            self.current_page = hit[0]
+            self.render_page()
+            self.scroll_to_search_hit()
+        self.update_search_highlights()
+        return hit is not None
+
+    def scroll_to_search_hit(self):
+        page, index = self.search_hit
+        hits = self.page_hits(page)
+        if hits is None:
+            return  # Scrolled to from on_hits_found
+        self.scroll_to_hit_pending = False
+        if not hits:
+            return  # PyMuPDF found no rectangle for the indexed text; the page is shown
+        page_rect = self.page_strip.page_rect(page - self.page_strip.first_page)
+        x0, y0, x1, y1 = (value * self.zoom_factor for value in hits[min(index, len(hits) - 1)])
+        margin = 50
+        self.scroll_area.ensureVisible(round(page_rect.left() + (x0 + x1) / 2), round(page_rect.top() + (y0 + y1) / 2),
+                                       round((x1 - x0) / 2) + margin, round((y1 - y0) / 2) + margin)
+
+    def clear_search(self):
+        self.search_query = ""
+        self.show_search_hit(None)
+
+    def update_search_highlights(self):
+        """Highlight the hits on the pages in view."""
+        highlights = {}
+        if self.search_query:
+            pages = set(self.text_index.pages_for(self.search_query))
+            top = self.scroll_area.verticalScrollBar().value()
+            for local_index in self.page_strip.page_layout.pages_between(top, top + self.scroll_area.viewport().height()):
+                page = self.page_strip.first_page + local_index
+                hits = self.page_hits(page) if page in pages else None
+                if hits is not None:
+                    highlights[page] = hits
+        self.page_strip.set_search_highlights(highlights, self.search_hit)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.renderer is not None:
+            self.update_visible_pages()
+
+    def close_document(self):
+        """Stop background rendering and release the PDF; called when the tab is closed."""
+        if self.renderer is not None:
+            self.renderer.close()
+            self.renderer = None
+        if self.thumbnail_loader is not None:
+            self.thumbnail_loader.close()
+            self.thumbnail_loader = None
+        if self.text_indexer is not None:
+            self.text_indexer.stop()
+            self.text_indexer = None
+        if self.hit_finder is not None:
+            self.hit_finder.close()
+            self.hit_finder = None
+        if self.document is not None:
+            self.document.close()
+            self.document = None
 
     def closeEvent(self, event):
-        self.document.close()
-        super().closeEvent(event)
\ No newline at end of file
+        self.close_document()
+        super().closeEvent(event)
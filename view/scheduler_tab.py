@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QPushButton, QListWidget, QListWidgetItem, QHBoxLayout, QMessageBox
-from PyQt5.QtCore import Qt, QStandardPaths
+from PyQt5.QtCore import Qt
 from view.task_widget import TaskWidget
+from services.app_paths import app_data_dir
 import uuid
 import os
 import json
@@ -84,14 +85,7 @@ class SchedulerTab(QWidget):
 
     # ---------------- Persistence ----------------
     def _tasks_file_path(self):
-        base_dir = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
-        # Fallback to home if path is empty
-        if not base_dir:
-            base_dir = os.path.join(os.path.expanduser("~"), ".studymate")
-        # Ensure app subdir exists
-        app_dir = os.path.join(base_dir, "StudyMate") if "StudyMate" not in base_dir else base_dir
-        os.makedirs(app_dir, exist_ok=True)
-        return os.path.join(app_dir, "scheduler_tasks.json")
+        return os.path.join(app_data_dir(), "scheduler_tasks.json")
 
     def save_tasks(self):
         try:
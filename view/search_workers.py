@@ -0,0 +1,80 @@
+import re
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from services.match_index import MatchIndex
+from services.search_service import SearchService, SearchTimeout
+
+
+class MatchScanSignals(QObject):
+    finished = pyqtSignal(object)  # MatchIndex, (spans, replacements) for a ReplaceScanWorker, the replacement or None for a SelectionReplaceWorker
+    error = pyqtSignal(object)  # The SearchTimeout, re.error or RuntimeError that ended the scan
+
+
+class MatchScanWorker(QRunnable):
+    """Builds a MatchIndex of a text snapshot without blocking the GUI.
+
+    revision is the QTextDocument revision the snapshot was taken at; an index
+    finished after the document changed again is stale and should be rebuilt.
+    stop() abandons the scan, e.g. when the query changes; nothing is emitted then.
+    """
+    emits_none = False  # Whether a None result is emitted rather than taken for a stopped scan
+
+    def __init__(self, editor, text: str, search, revision: int):
+        super().__init__()
+        self.editor = editor
+        self.text = text
+        self.search = search
+        self.revision = revision
+        self.signals = MatchScanSignals()
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+
+    def scan(self):
+        return MatchIndex.build(self.text, self.search, should_stop=self._stopped.is_set)
+
+    def run(self):
+        try:
+            result = self.scan()
+        except (SearchTimeout, re.error, RuntimeError) as e:
+            if not self._stopped.is_set():
+                self.signals.error.emit(e)
+            return
+        finally:
+            self.text = None
+        if result is not None or self.emits_none:
+            self.signals.finished.emit(result)
+
+
+class ReplaceScanWorker(MatchScanWorker):
+    """Finds the matches Replace All will replace and their replacement texts, see SearchService.find_replacements."""
+
+    def __init__(self, editor, text: str, search, replace_text: str, revision: int):
+        super().__init__(editor, text, search, revision)
+        self.replace_text = replace_text
+
+    def scan(self):
+        return SearchService.find_replacements(self.text, self.search, self.replace_text, should_stop=self._stopped.is_set)
+
+
+class SelectionReplaceWorker(MatchScanWorker):
+    """
+    Matches a selection against a regex and computes its replacement, see SearchService.fullmatch_replacement.
+
+    The regex runs in a scan process, which may first have to be started; that
+    wait happens here rather than on the GUI thread. start and end are the
+    document span of the selection. Emits the replacement, or None if the
+    selection doesn't match.
+    """
+    emits_none = True
+
+    def __init__(self, editor, text: str, search, replace_text: str, revision: int, start: int, end: int):
+        super().__init__(editor, text, search, revision)
+        self.replace_text = replace_text
+        self.start = start
+        self.end = end
+
+    def scan(self):
+        return SearchService.fullmatch_replacement(self.text, self.search, self.replace_text, timeout=SearchService.SCAN_TIMEOUT_SECONDS)
@@ -68,3 +68,37 @@ class SettingsManager:
 
     def set_word_wrap(self, enabled: bool):
         self.setValue("wordWrap", enabled)
+
+    # AI settings
+    def get_ai_batch_size(self):
+        return self.value("aiBatchSize", 4, type=int)
+
+    def set_ai_batch_size(self, size: int):
+        self.setValue("aiBatchSize", size)
+
+    def get_ai_backend(self):
+        return self.value("aiBackend", "pytorch", type=str)
+
+    def set_ai_backend(self, backend: str):
+        self.setValue("aiBackend", backend)
+
+    def get_ai_model_memory_mb(self):
+        return self.value("aiModelMemoryMb", 2048, type=int)
+
+    def set_ai_model_memory_mb(self, size_mb: int):
+        self.setValue("aiModelMemoryMb", size_mb)
+
+    def get_ai_idle_unload_minutes(self):
+        return self.value("aiIdleUnloadMinutes", 10, type=int)
+
+    def set_ai_idle_unload_minutes(self, minutes: int):
+        self.setValue("aiIdleUnloadMinutes", minutes)
+
+    def get_ai_live_key_points(self):
+        value = self.value("aiLiveKeyPoints", False, type=bool)
+        if isinstance(value, str):
+            return value.lower() in ("true", "1", "yes")
+        return bool(value)
+
+    def set_ai_live_key_points(self, enabled: bool):
+        self.setValue("aiLiveKeyPoints", enabled)
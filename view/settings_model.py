@@ -10,6 +10,11 @@ class SettingsModel:
     sidebar_width: int = 300
     sidebar_font_size: int = 10
     word_wrap: bool = True
+    ai_batch_size: int = 4
+    ai_backend: str = "pytorch"
+    ai_model_memory_mb: int = 2048
+    ai_idle_unload_minutes: int = 10
+    ai_live_key_points: bool = False
 
     @classmethod
     def load(cls, manager: SettingsManager) -> "SettingsModel":
@@ -20,6 +25,11 @@ class SettingsModel:
             sidebar_width=manager.get_sidebar_width(),
             sidebar_font_size=manager.get_sidebar_font_size(),
             word_wrap=manager.get_word_wrap(),
+            ai_batch_size=manager.get_ai_batch_size(),
+            ai_backend=manager.get_ai_backend(),
+            ai_model_memory_mb=manager.get_ai_model_memory_mb(),
+            ai_idle_unload_minutes=manager.get_ai_idle_unload_minutes(),
+            ai_live_key_points=manager.get_ai_live_key_points(),
         )
 
     def save(self, manager: SettingsManager) -> None:
@@ -29,6 +39,11 @@ class SettingsModel:
         manager.set_sidebar_width(self.sidebar_width)
         manager.set_sidebar_font_size(self.sidebar_font_size)
         manager.set_word_wrap(self.word_wrap)
+        manager.set_ai_batch_size(self.ai_batch_size)
+        manager.set_ai_backend(self.ai_backend)
+        manager.set_ai_model_memory_mb(self.ai_model_memory_mb)
+        manager.set_ai_idle_unload_minutes(self.ai_idle_unload_minutes)
+        manager.set_ai_live_key_points(self.ai_live_key_points)
         manager.sync()
 
     def update_theme(self, theme_name: str) -> None:
@@ -48,3 +63,18 @@ class SettingsModel:
 
     def update_word_wrap(self, enabled: bool) -> None:
         self.word_wrap = enabled
+
+    def update_ai_batch_size(self, size: int) -> None:
+        self.ai_batch_size = size
+
+    def update_ai_backend(self, backend: str) -> None:
+        self.ai_backend = backend
+
+    def update_ai_model_memory_mb(self, size_mb: int) -> None:
+        self.ai_model_memory_mb = size_mb
+
+    def update_ai_idle_unload_minutes(self, minutes: int) -> None:
+        self.ai_idle_unload_minutes = minutes
+
+    def update_ai_live_key_points(self, enabled: bool) -> None:
+        self.ai_live_key_points = enabled
@@ -2,6 +2,7 @@ from PyQt5.QtWidgets import QDockWidget, QTabWidget, QWidget, QVBoxLayout, QLabe
 from PyQt5.QtGui import QIcon
 from PyQt5.QtCore import Qt, QDir, pyqtSignal
 from view.scheduler_tab import SchedulerTab
+from services import model_backends
 import os
 
 class SideBar(QDockWidget):
@@ -106,6 +107,7 @@ class SideBar(QDockWidget):
         self.explore_view.hideColumn(3)  # Date Modified
         self.explore_view.setIndentation(15)
         self.explore_view.setSortingEnabled(True)
+        self.explore_view.setSelectionMode(QTreeView.ExtendedSelection)
         tree_layout.addWidget(self.explore_view)
 
         self.explore_stack.addWidget(welcome_widget)
@@ -224,13 +226,64 @@ class SideBar(QDockWidget):
         self.summary_length_combo.addItems(["Short", "Medium", "Long"])
         self.summary_length_combo.setCurrentText("Medium")
         form_layout.addRow("Summary Length:", self.summary_length_combo)
+
+        self.batch_size_spinbox = QSpinBox()
+        self.batch_size_spinbox.setRange(1, 32)
+        self.batch_size_spinbox.setToolTip("Documents summarized together per model call in batch mode.")
+        form_layout.addRow("Batch Size:", self.batch_size_spinbox)
+
+        self.ai_backend_combo = QComboBox()
+        for backend, label in model_backends.BACKEND_LABELS.items():
+            self.ai_backend_combo.addItem(label, backend)
+        self.ai_backend_combo.setToolTip("How the models run on the CPU. Quantized and ONNX models are faster but may word summaries slightly differently.")
+        form_layout.addRow("Inference Backend:", self.ai_backend_combo)
+
+        self.model_memory_spinbox = QSpinBox()
+        self.model_memory_spinbox.setRange(256, 32768)
+        self.model_memory_spinbox.setSingleStep(256)
+        self.model_memory_spinbox.setSuffix(" MB")
+        self.model_memory_spinbox.setToolTip("Memory budget for loaded models in each AI worker process. Least recently used models are unloaded beyond it.")
+        form_layout.addRow("Model Memory:", self.model_memory_spinbox)
+
+        self.idle_unload_spinbox = QSpinBox()
+        self.idle_unload_spinbox.setRange(0, 240)
+        self.idle_unload_spinbox.setSuffix(" min")
+        self.idle_unload_spinbox.setSpecialValueText("Never")
+        self.idle_unload_spinbox.setToolTip("Unload models that have not been used for this long.")
+        form_layout.addRow("Unload Idle Models:", self.idle_unload_spinbox)
         layout.addLayout(form_layout)
 
+        summarize_layout = QHBoxLayout()
         self.summarize_button = QPushButton("Summarize")
-        layout.addWidget(self.summarize_button)
-
+        self.stop_summary_button = QPushButton("Stop")
+        self.stop_summary_button.setToolTip("Stop generating and keep the summary so far.")
+        self.stop_summary_button.setEnabled(False)
+        summarize_layout.addWidget(self.summarize_button, 1)
+        summarize_layout.addWidget(self.stop_summary_button)
+        layout.addLayout(summarize_layout)
+
+        key_points_layout = QHBoxLayout()
         self.key_points_button = QPushButton("Get Key Points")
-        layout.addWidget(self.key_points_button)
+        self.live_key_points_checkbox = QCheckBox("Live")
+        self.live_key_points_checkbox.setToolTip("Refresh key points while typing; only edited paragraphs are analyzed again.")
+        key_points_layout.addWidget(self.key_points_button, 1)
+        key_points_layout.addWidget(self.live_key_points_checkbox)
+        layout.addLayout(key_points_layout)
+
+        # --- Batch Summarization ---
+        batch_group = QGroupBox("Batch Summarize")
+        batch_layout = QHBoxLayout(batch_group)
+        self.summarize_tabs_button = QPushButton("Open Tabs")
+        self.summarize_tabs_button.setToolTip("Summarize every open text tab and save each summary next to its file.")
+        self.summarize_selection_button = QPushButton("Selected Files")
+        self.summarize_selection_button.setToolTip("Summarize the files selected in the Explore tab and save each summary next to its file.")
+        batch_layout.addWidget(self.summarize_tabs_button)
+        batch_layout.addWidget(self.summarize_selection_button)
+        layout.addWidget(batch_group)
+
+        self.restart_ai_button = QPushButton("Restart AI Engine")
+        self.restart_ai_button.setToolTip("Stop a stuck model. Open tabs are not affected.")
+        layout.addWidget(self.restart_ai_button)
 
         # --- External AI Tools ---
         external_ai_group = QGroupBox("Launch External AI")
@@ -249,3 +302,12 @@ class SideBar(QDockWidget):
         self.summary_output.setPlaceholderText("Summary will appear here...")
         layout.addWidget(self.summary_output)
         self.ai_tab.setLayout(layout)
+
+    def selected_explorer_files(self):
+        """Returns the paths of the files (not folders) selected in the file explorer."""
+        paths = []
+        for index in self.explore_view.selectionModel().selectedRows():
+            path = self.file_model.filePath(index)
+            if os.path.isfile(path):
+                paths.append(path)
+        return paths
@@ -1,10 +1,40 @@
-from PyQt5.QtWidgets import QStatusBar, QLabel
+from PyQt5.QtWidgets import QStatusBar, QLabel, QProgressBar, QPushButton
+from PyQt5.QtCore import QTimer, pyqtSignal
 
 class StatusBar(QStatusBar):
+    file_load_cancel_requested = pyqtSignal()
+    STATISTICS_REFRESH_MS = 250
+
     def __init__(self):
         super().__init__()
         self.editor_info_label = QLabel()
-        
+        self.ai_queue_label = QLabel()
+
+        # Document statistics are refreshed at most every STATISTICS_REFRESH_MS while typing;
+        # the cursor position is shown right away.
+        self.statistics_editor = None
+        self.statistics_revision = None
+        self.position_text = ""
+        self.statistics_text = ""
+        self.statistics_timer = QTimer(self)
+        self.statistics_timer.setSingleShot(True)
+        self.statistics_timer.setInterval(self.STATISTICS_REFRESH_MS)
+        self.statistics_timer.timeout.connect(self.refresh_statistics)
+
+        # File loading progress, shown only while a file is being read in the background
+        self.file_progress_label = QLabel()
+        self.file_progress_bar = QProgressBar()
+        self.file_progress_bar.setMaximumWidth(160)
+        self.file_progress_bar.setTextVisible(False)
+        self.file_cancel_button = QPushButton("Cancel")
+        self.file_cancel_button.setFlat(True)
+        self.file_cancel_button.clicked.connect(self.file_load_cancel_requested.emit)
+        self.hide_file_progress()
+
+        self.addPermanentWidget(self.file_progress_label)
+        self.addPermanentWidget(self.file_progress_bar)
+        self.addPermanentWidget(self.file_cancel_button)
+        self.addPermanentWidget(self.ai_queue_label)
         self.addPermanentWidget(self.editor_info_label)
         self.showMessage("Ready")
         self.update_editor_info(None)
@@ -12,11 +42,54 @@ class StatusBar(QStatusBar):
     def update_editor_info(self, editor):
         """Updates labels for word count, line/col number, etc."""
         if not editor:
+            self.statistics_timer.stop()
+            self.statistics_editor = None
             self.editor_info_label.setText("")
             return
 
         cursor = editor.textCursor()
-        line_num = cursor.blockNumber() + 1
-        col_num = cursor.columnNumber() + 1
-        word_count = len(editor.toPlainText().split())
-        self.editor_info_label.setText(f"  Ln {line_num}, Col {col_num}   |   Words: {word_count}  ")
+        self.position_text = f"Ln {cursor.blockNumber() + 1}, Col {cursor.columnNumber() + 1}"
+        if editor is not self.statistics_editor:
+            self.statistics_editor = editor
+            self.refresh_statistics()  # A newly shown tab gets its counts at once
+            return
+        if editor.statistics.revision != self.statistics_revision and not self.statistics_timer.isActive():
+            self.statistics_timer.start()
+        self.show_editor_info()
+
+    def refresh_statistics(self):
+        editor = self.statistics_editor
+        if editor is None:
+            return
+        statistics = editor.statistics
+        self.statistics_revision = statistics.revision
+        self.statistics_text = (f"Words: {statistics.words}   |   Chars: {statistics.characters}"
+                                f"   |   {statistics.reading_minutes()} min read")
+        self.show_editor_info()
+
+    def show_editor_info(self):
+        self.editor_info_label.setText(f"  {self.position_text}   |   {self.statistics_text}  ")
+
+    def show_file_progress(self, label, done=0, total=0):
+        """Show loading progress; a total of 0 shows a busy indicator."""
+        self.file_progress_label.setText(f"  {label}")
+        self.file_progress_bar.setRange(0, total)
+        self.file_progress_bar.setValue(min(done, total))
+        for widget in (self.file_progress_label, self.file_progress_bar, self.file_cancel_button):
+            widget.show()
+
+    def hide_file_progress(self):
+        for widget in (self.file_progress_label, self.file_progress_bar, self.file_cancel_button):
+            widget.hide()
+
+    def update_ai_queue_info(self, stats):
+        """Shows AI job queue depth and recent latency; hidden while the queue is idle."""
+        running, queued = stats.get("running", 0), stats.get("queued", 0)
+        if not running and not queued:
+            self.ai_queue_label.setText("")
+            return
+
+        text = f"  AI: {running} running, {queued} queued"
+        if stats.get("average_latency") is not None:
+            text += f"   |   avg {stats['average_latency']:.1f}s"
+        self.ai_queue_label.setText(text + "  ")
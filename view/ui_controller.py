@@ -1,5 +1,12 @@
+import os
 from view.file_handler import FileHandler
 from services.file_service import FileService
+from services.app_paths import app_data_dir
+from services.result_cache import ResultCache
+from services.document_converter import DocumentConverter
+from services.inference_backend import InferenceBackend
+from services.summarizer import SummarizerService
+from services.key_points_extractor import KeyPointsService
 
 
 class UIController:
@@ -7,5 +14,15 @@ class UIController:
 
     def __init__(self, main_window):
         self.main_window = main_window
-        self.file_service = FileService()
+        # ODT files are converted by one warm LibreOffice instance into a cache that survives restarts.
+        self.document_converter = DocumentConverter(os.path.join(app_data_dir(), "converted_pdfs"))
+        self.file_service = FileService(self.document_converter)
         self.file_handler = FileHandler(main_window, self.file_service)
+
+        # Summaries and key points are cached by content next to the scheduler data.
+        self.result_cache = ResultCache(os.path.join(app_data_dir(), "ai_cache"))
+        SummarizerService.result_cache = self.result_cache
+        KeyPointsService.result_cache = self.result_cache
+
+        # Inference runs in separate processes so a crashed or stuck model can't take the editor down.
+        self.inference_backend = InferenceBackend(result_cache=self.result_cache)